@@ -0,0 +1,151 @@
+"""Publish/subscribe fan-out for chat messages.
+
+Every worker process subscribes to the same channel, and a message
+published by any of them is handed to the subscribers of all of them,
+which then deliver it to their own WebSocket clients. The in-memory
+backend only reaches the current process and suits a single worker; the
+PostgreSQL backend uses LISTEN/NOTIFY on the application database, so
+multiple workers and nodes need no extra service.
+"""
+import asyncio
+import json
+import os
+from typing import Awaitable, Callable, List, Optional, Set
+from sqlalchemy import text
+from dotenv import load_dotenv
+from app.database import DATABASE_URL, engine
+
+load_dotenv()
+
+# memory (single process) or postgres (LISTEN/NOTIFY across workers)
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "memory")
+BROADCAST_CHANNEL = os.getenv("BROADCAST_CHANNEL", "chat_messages")
+# NOTIFY payloads must stay below 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7900
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class PayloadTooLarge(Exception):
+    """Raised when a message does not fit into a single notification."""
+
+
+class Broadcast:
+    """Base class: keeps subscribers and dispatches received messages."""
+
+    def __init__(self):
+        self._handlers: List[Handler] = []
+
+    def subscribe(self, handler: Handler):
+        self._handlers.append(handler)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, message: dict):
+        raise NotImplementedError
+
+    async def _dispatch(self, message: dict):
+        for handler in self._handlers:
+            try:
+                await handler(message)
+            except Exception as e:
+                print(f"Error handling broadcast message: {e}")
+
+
+class MemoryBroadcast(Broadcast):
+    """Delivers messages to subscribers in this process only."""
+
+    async def publish(self, message: dict):
+        await self._dispatch(message)
+
+
+class PostgresBroadcast(Broadcast):
+    """Fans messages out through PostgreSQL LISTEN/NOTIFY.
+
+    Notifications are sent through the application's connection pool and
+    received on one dedicated asyncpg connection per process, which is
+    re-established with backoff if it drops. Messages published while a
+    listener is reconnecting are not replayed; clients recover them from
+    the chat history endpoint.
+    """
+
+    def __init__(self, dsn: str, channel: str = BROADCAST_CHANNEL, publish_engine=engine):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self.engine = publish_engine
+        self._connection = None
+        self._stopping = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    async def start(self):
+        import asyncpg  # noqa: F401 - only needed with this backend
+
+        self._stopping = False
+        await self._listen()
+
+    async def stop(self):
+        self._stopping = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def publish(self, message: dict):
+        payload = json.dumps(message)
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            raise PayloadTooLarge(f"Broadcast payload exceeds {MAX_NOTIFY_PAYLOAD} bytes")
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload}
+            )
+
+    async def _listen(self):
+        import asyncpg
+
+        self._connection = await asyncpg.connect(self.dsn)
+        await self._connection.add_listener(self.channel, self._on_notify)
+        self._connection.add_termination_listener(self._on_terminate)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        # Tasks start in the order notifications arrive
+        task = asyncio.create_task(self._dispatch(json.loads(payload)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _on_terminate(self, connection):
+        if not self._stopping:
+            print("Broadcast listener connection lost, reconnecting")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 1.0
+        while not self._stopping:
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                print(f"Error reconnecting broadcast listener: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+
+def create_broadcast(backend: str = BROADCAST_BACKEND, channel: str = BROADCAST_CHANNEL) -> Broadcast:
+    if backend == "memory":
+        return MemoryBroadcast()
+    if backend == "postgres":
+        # asyncpg takes plain libpq-style URLs
+        dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+        dsn = dsn.replace("postgresql+psycopg2://", "postgresql://", 1)
+        return PostgresBroadcast(dsn, channel)
+    raise ValueError(f"Unknown BROADCAST_BACKEND: {backend}")
+
+
+broadcast = create_broadcast()
@@ -0,0 +1,205 @@
+"""In-process response cache for hot read endpoints.
+
+Serialised JSON bodies are kept in a bounded LRU with a per-entry TTL and
+byte accounting. Every key starts with a *tag* naming the data it was
+built from (``resume:1``, ``evaluations:1``, ``chat:1``); writers
+invalidate tags, which drops every key under them.
+
+Invalidations apply to this process at once and, with the PostgreSQL
+backend (the same setting as BROADCAST_BACKEND by default), are published
+so other workers drop their copies too. With the memory backend, or while
+a listener is reconnecting, other workers only catch up when their
+entries expire after CACHE_TTL.
+"""
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+from fastapi import Response
+from dotenv import load_dotenv
+from app.broadcast import BROADCAST_BACKEND, Broadcast, create_broadcast
+
+load_dotenv()
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Upper bound on the bytes of cached bodies, per worker process
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Seconds an entry is served before it is rebuilt, invalidated or not
+CACHE_TTL = float(os.getenv("CACHE_TTL", "60"))
+# memory (this process only) or postgres (LISTEN/NOTIFY across workers)
+CACHE_INVALIDATION_BACKEND = os.getenv("CACHE_INVALIDATION_BACKEND", BROADCAST_BACKEND)
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+
+# Rough per-entry bookkeeping cost (key, OrderedDict node, tag index)
+ENTRY_OVERHEAD = 200
+# Invalidated tags whose version is remembered; older ones share a floor
+MAX_TAG_VERSIONS = 4096
+
+Key = Tuple[Hashable, ...]
+
+
+class LRUCache:
+    """Bounded LRU cache with a TTL, byte accounting and tag invalidation.
+
+    Readers that miss take ``version(tag)`` before loading from the
+    database and hand it to ``set``; if the tag was invalidated in the
+    meantime the (possibly stale) value is not stored.
+
+    Versions come from one counter that only grows. Only the last
+    MAX_TAG_VERSIONS invalidated tags keep their own; every other tag
+    reports the highest version forgotten so far, so forgetting a tag can
+    make an in-flight load skip storing its value but never lets a stale
+    one in.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl: float = CACHE_TTL,
+        enabled: bool = CACHE_ENABLED,
+        channel: Optional[Broadcast] = None
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.channel = channel
+        # Identifies our own invalidations when the channel echoes them back
+        self.origin = uuid.uuid4().hex
+        self._entries: "OrderedDict[Key, Tuple[Any, int, float]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Key]] = {}
+        self._versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._clock = 0
+        self._version_floor = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if channel is not None:
+            channel.subscribe(self._on_invalidate)
+
+    async def start(self):
+        if self.channel is not None:
+            await self.channel.start()
+
+    async def stop(self):
+        if self.channel is not None:
+            await self.channel.stop()
+
+    def get(self, key: Key) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry[2] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def version(self, tag: Hashable) -> int:
+        return self._versions.get(tag, self._version_floor)
+
+    def set(self, key: Key, value: Any, size: int, version: int):
+        """Store ``value`` (``size`` bytes) unless ``key[0]`` changed since ``version``."""
+        tag = key[0]
+        size += ENTRY_OVERHEAD
+        if not self.enabled or size > self.max_bytes or self.version(tag) != version:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, time.monotonic() + self.ttl)
+        self._tags.setdefault(tag, set()).add(key)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_local(self, *tags: Hashable):
+        for tag in tags:
+            self._clock += 1
+            self._versions[tag] = self._clock
+            self._versions.move_to_end(tag)
+            for key in self._tags.pop(tag, ()):
+                self._remove(key, untag=False)
+            self.invalidations += 1
+        while len(self._versions) > MAX_TAG_VERSIONS:
+            _, version = self._versions.popitem(last=False)
+            self._version_floor = max(self._version_floor, version)
+
+    async def invalidate(self, *tags: Hashable):
+        """Drop everything under ``tags`` here, then in the other workers."""
+        self.invalidate_local(*tags)
+        if self.channel is not None and tags:
+            try:
+                await self.channel.publish({"origin": self.origin, "tags": list(tags)})
+            except Exception as e:
+                print(f"Error publishing cache invalidation: {e}")
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+        self._versions.clear()
+        # Loads that started before the clear must not store their values
+        self._version_floor = self._clock
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "tag_versions": len(self._versions),
+        }
+
+    def _remove(self, key: Key, untag: bool = True):
+        value, size, expires_at = self._entries.pop(key)
+        self.bytes -= size
+        if untag:
+            keys = self._tags.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[key[0]]
+
+    async def _on_invalidate(self, message: dict):
+        if message.get("origin") != self.origin:
+            self.invalidate_local(*message.get("tags", ()))
+
+
+def json_response(body: bytes) -> Response:
+    """Send a cached, already serialised JSON body as is."""
+    return Response(content=body, media_type="application/json")
+
+
+def resume_tag(resume_id: int) -> str:
+    return f"resume:{resume_id}"
+
+
+def evaluations_tag(resume_id: int) -> str:
+    return f"evaluations:{resume_id}"
+
+
+def chat_tag(resume_id: int) -> str:
+    return f"chat:{resume_id}"
+
+
+def create_cache() -> LRUCache:
+    channel = None
+    # The in-memory backend would only echo our own invalidations back
+    if CACHE_INVALIDATION_BACKEND != "memory":
+        channel = create_broadcast(CACHE_INVALIDATION_BACKEND, CACHE_INVALIDATION_CHANNEL)
+    return LRUCache(channel=channel)
+
+
+response_cache = create_cache()
@@ -0,0 +1,188 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+from sqlalchemy import insert, select, func, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from dotenv import load_dotenv
+from app.cache import chat_tag, response_cache
+from app.database import SessionLocal
+from app.models import ChatMessage
+
+load_dotenv()
+
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+# A batch is written once this many messages are buffered...
+CHAT_FLUSH_SIZE = int(os.getenv("CHAT_FLUSH_SIZE", "100"))
+# ...or this many seconds after the previous flush, whichever comes first
+CHAT_FLUSH_INTERVAL = float(os.getenv("CHAT_FLUSH_INTERVAL", "0.05"))
+# Most messages held unwritten; beyond it senders flush, and new messages
+# are refused while the database cannot take them
+CHAT_MAX_BUFFERED = int(os.getenv("CHAT_MAX_BUFFERED", "10000"))
+# Message ids reserved from the PostgreSQL sequence per round trip
+CHAT_ID_BLOCK = int(os.getenv("CHAT_ID_BLOCK", "100"))
+
+
+class ChatBufferFull(Exception):
+    """Raised when a message cannot be buffered because writes are not keeping up."""
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed write may succeed later, rather than its rows being refused."""
+    if not isinstance(error, DBAPIError):
+        return True
+    return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+
+
+class ChatWriter:
+    """Write-behind buffer for chat messages.
+
+    ``add`` assigns the message its id and timestamp and returns at once,
+    so it can be broadcast before it is stored. Buffered messages are
+    written in multi-row ``INSERT ... RETURNING`` batches by a background
+    task, and flushed on shutdown.
+
+    Delivery guarantees: a message that was broadcast is persisted unless
+    the process dies before the next flush (at most CHAT_FLUSH_INTERVAL
+    later, or longer while the database is unreachable, during which
+    batches are retried). When the database refuses a batch, its rows are
+    written one by one and those it still refuses (their resume was
+    deleted in the meantime, or the text cannot be stored) are dropped
+    and logged. While CHAT_MAX_BUFFERED messages are waiting, ``add``
+    raises ChatBufferFull. The history endpoint may lag the live stream
+    by up to one flush interval.
+
+    Ids are reserved in blocks from the ``chat_messages`` sequence on
+    PostgreSQL. SQLite has no sequences; ids continue from ``MAX(id)``,
+    which is only safe with a single worker process.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        enabled: bool = CHAT_WRITE_BEHIND,
+        flush_size: int = CHAT_FLUSH_SIZE,
+        flush_interval: float = CHAT_FLUSH_INTERVAL,
+        max_buffered: int = CHAT_MAX_BUFFERED
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._buffer: List[dict] = []
+        self._ids: Iterator[int] = iter(())
+        self._id_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def add(self, resume_id: int, username: str, message: str) -> ChatMessage:
+        """Buffer a message and return it, not yet persisted.
+
+        Raises ChatBufferFull when the buffer is full and cannot be flushed.
+        """
+        row = {
+            "id": await self._next_id(),
+            "resume_id": resume_id,
+            "username": username,
+            "message": message,
+            "created_at": datetime.now(timezone.utc),
+        }
+        if len(self._buffer) >= self.max_buffered:
+            await self.flush()
+            if len(self._buffer) >= self.max_buffered:
+                raise ChatBufferFull(f"{len(self._buffer)} chat messages are waiting to be written")
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_size:
+            self._wakeup.set()
+        return ChatMessage(**row)
+
+    async def flush(self):
+        """Write everything buffered so far."""
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.flush_size]
+                try:
+                    await self._insert(batch)
+                    done = len(batch)
+                except Exception as e:
+                    if _is_transient(e):
+                        # Leave the batch buffered; the next flush retries it
+                        print(f"Error writing chat messages: {e}")
+                        return
+                    # Some row in the batch was refused; store the rest one by one
+                    done = await self._insert_each(batch)
+                del self._buffer[:done]
+                await response_cache.invalidate(*{chat_tag(row["resume_id"]) for row in batch[:done]})
+                if done < len(batch):
+                    return
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _insert(self, batch: List[dict]):
+        async with self.session_factory() as db:
+            # insertmanyvalues turns this into multi-row INSERT ... RETURNING
+            await db.execute(insert(ChatMessage).returning(ChatMessage.id), batch)
+            await db.commit()
+
+    async def _insert_each(self, batch: List[dict]) -> int:
+        """Store rows one at a time, dropping those the database refuses.
+
+        Returns how many leading rows were handled; it stops early, leaving
+        the rest buffered, when the database becomes unreachable.
+        """
+        for done, row in enumerate(batch):
+            try:
+                await self._insert([row])
+            except Exception as e:
+                if _is_transient(e):
+                    print(f"Error writing chat messages: {e}")
+                    return done
+                print(f"Dropping chat message {row['id']} for resume {row['resume_id']}: {e}")
+        return len(batch)
+
+    async def _next_id(self) -> int:
+        async with self._id_lock:
+            next_id = next(self._ids, None)
+            if next_id is None:
+                self._ids = iter(await self._reserve_ids())
+                next_id = next(self._ids)
+            return next_id
+
+    async def _reserve_ids(self) -> List[int]:
+        async with self.session_factory() as db:
+            if db.bind.dialect.name == "postgresql":
+                result = await db.execute(
+                    text(
+                        "SELECT nextval(pg_get_serial_sequence('chat_messages', 'id')) "
+                        "FROM generate_series(1, :n)"
+                    ),
+                    {"n": CHAT_ID_BLOCK}
+                )
+                return list(result.scalars())
+            # Buffered ids are beyond anything stored, so continue after them
+            start = self._buffer[-1]["id"] if self._buffer else (
+                await db.execute(select(func.coalesce(func.max(ChatMessage.id), 0)))
+            ).scalar_one()
+        return list(range(start + 1, start + 1 + CHAT_ID_BLOCK))
+
+
+chat_writer = ChatWriter()
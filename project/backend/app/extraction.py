@@ -0,0 +1,193 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Tuple
+from dotenv import load_dotenv
+from app.extractors import Extractor, get_extractor, lookup
+from app.metrics import EXTRACTION_DURATION, EXTRACTION_FAILURES, EXTRACTION_PAGES
+
+load_dotenv()
+
+# PDF parsing is CPU-bound, so it runs in worker processes instead of on the
+# event loop. These settings bound how much of the machine it may take.
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+EXTRACTION_MAX_PENDING = int(os.getenv("EXTRACTION_MAX_PENDING", "16"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+_lock = threading.Lock()
+
+
+class ExtractionQueueFull(Exception):
+    """Raised when the extraction pool already has too many files queued."""
+
+
+class ExtractedText(NamedTuple):
+    content: str
+    # Text of every PDF page in order; None for plain-text files
+    pages: Optional[List[str]] = None
+
+
+def join_pages(pages: List[str]) -> str:
+    return "\n".join(pages).strip()
+
+
+def _extract_pages(
+    file_type: str,
+    engine: str,
+    file_path: str,
+    first: int = 1,
+    last: Optional[int] = None
+) -> Tuple[int, List[str]]:
+    """Run an engine's ``extract_pages``. Runs inside a worker process.
+
+    Pages outside the range are never parsed, so a preview of page 1 costs
+    about the same for any document length.
+    """
+    return lookup(file_type, engine).extract_pages(file_path, first, last)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS)
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the worker processes. Called on application shutdown."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_broken_executor(broken: ProcessPoolExecutor):
+    global _executor
+    with _lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _terminate_executor(stuck: ProcessPoolExecutor):
+    """Kill a pool whose worker is stuck on a file; the next call starts a fresh one.
+
+    Timing out only stops the wait, so the worker would otherwise keep
+    parsing, and hold its slot, until it finished or the app restarted.
+    Files other requests had in the same pool fail with BrokenProcessPool.
+    """
+    processes = list((stuck._processes or {}).values())
+    _reset_broken_executor(stuck)
+    for process in processes:
+        process.terminate()
+
+
+def _release_slot(_future=None):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+async def extract_pages(
+    file_path: str,
+    extractor: Extractor,
+    first: int = 1,
+    last: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Tuple[int, List[str]]:
+    """Extract the text of a page range with the given engine.
+
+    Returns the document's page count and the texts of pages first..last
+    (all remaining pages if ``last`` is None). CPU-bound engines run in
+    the process pool, others in a thread. Raises ExtractionQueueFull
+    when EXTRACTION_MAX_PENDING files are already queued or running, and
+    asyncio.TimeoutError when the file takes longer than the timeout. A
+    timed-out file's worker pool is terminated, so a runaway document
+    cannot keep a worker or a queue slot.
+    """
+    labels = (extractor.file_type, extractor.name)
+    started = time.perf_counter()
+    try:
+        page_count, pages = await _run_extractor(file_path, extractor, first, last, timeout)
+    except ExtractionQueueFull:
+        EXTRACTION_FAILURES.labels(*labels, "queue_full").inc()
+        raise
+    except asyncio.TimeoutError:
+        EXTRACTION_FAILURES.labels(*labels, "timeout").inc()
+        raise
+    except Exception:
+        EXTRACTION_FAILURES.labels(*labels, "error").inc()
+        raise
+    EXTRACTION_DURATION.labels(*labels).observe(time.perf_counter() - started)
+    EXTRACTION_PAGES.labels(*labels).observe(len(pages))
+    return page_count, pages
+
+
+async def _run_extractor(
+    file_path: str,
+    extractor: Extractor,
+    first: int,
+    last: Optional[int],
+    timeout: Optional[float]
+) -> Tuple[int, List[str]]:
+    if not extractor.cpu_bound:
+        return await asyncio.to_thread(extractor.extract_pages, file_path, first, last)
+
+    global _pending
+    with _lock:
+        if _pending >= EXTRACTION_MAX_PENDING:
+            raise ExtractionQueueFull("Text extraction queue is full")
+        _pending += 1
+
+    executor = get_executor()
+    try:
+        future = executor.submit(_extract_pages, extractor.file_type, extractor.name, file_path, first, last)
+    except BrokenProcessPool:
+        _release_slot()
+        _reset_broken_executor(executor)
+        raise
+    except BaseException:
+        _release_slot()
+        raise
+    future.add_done_callback(_release_slot)
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            EXTRACTION_TIMEOUT if timeout is None else timeout
+        )
+    except asyncio.TimeoutError:
+        _terminate_executor(executor)
+        raise
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OOM killer); start a fresh pool
+        # for the next request.
+        _reset_broken_executor(executor)
+        raise
+
+
+async def extract_document(file_path: str, file_type: str) -> ExtractedText:
+    """Extract the text of a PDF or TXT file, keeping PDF pages apart.
+
+    Unlike the upload handlers, errors are raised rather than swallowed so
+    callers can decide whether a failure is fatal.
+    """
+    extractor = get_extractor(file_type)
+    if extractor is None:
+        return ExtractedText("")
+    _, pages = await extract_pages(file_path, extractor)
+    if not extractor.paged:
+        return ExtractedText(pages[0] if pages else "")
+    return ExtractedText(join_pages(pages), pages)
+
+
+async def extract_text(file_path: str, file_type: str) -> str:
+    """Extract text content from a PDF or TXT file (errors are raised)."""
+    return (await extract_document(file_path, file_type)).content
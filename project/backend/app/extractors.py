@@ -0,0 +1,169 @@
+"""Text extraction engines, registered per file type.
+
+Each file type has one or more engines; EXTRACTION_ENGINES picks the one a
+deployment uses (``pdf=pypdf2,txt=plain`` by default). PyPDF2 is always
+installed; the ``pypdf`` and ``pdfminer`` engines need the optional
+``pypdf`` / ``pdfminer.six`` packages (``uv sync --extra extractors``).
+Run ``python -m benchmarks.extractors`` to compare engines on a corpus
+before switching.
+
+Engines are looked up by name inside the extraction worker processes, so
+custom engines must be registered at import time (e.g. in this module).
+"""
+import importlib.util
+import os
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# file_type=engine pairs; file types left out use their default engine
+EXTRACTION_ENGINES = os.getenv("EXTRACTION_ENGINES", "pdf=pypdf2,txt=plain")
+
+
+class Extractor:
+    """Turns files of one type into text, page by page.
+
+    ``paged`` engines (PDF) keep page texts apart and can parse a page
+    range on its own; other files are a single page. ``cpu_bound`` engines
+    run in the extraction process pool, the rest in a thread.
+    """
+    name: str = ""
+    file_type: str = ""
+    paged: bool = True
+    cpu_bound: bool = True
+    # Module that must be importable for the engine to work
+    requires: Optional[str] = None
+
+    def available(self) -> bool:
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def extract_pages(self, file_path: str, first: int = 1, last: Optional[int] = None) -> Tuple[int, List[str]]:
+        """Return the page count and the text of pages first..last (1-based).
+
+        ``last`` None means the last page; it is clamped to the page count.
+        """
+        raise NotImplementedError
+
+
+class PlainTextExtractor(Extractor):
+    name = "plain"
+    file_type = "txt"
+    paged = False
+    cpu_bound = False
+
+    def extract_pages(self, file_path: str, first: int = 1, last: Optional[int] = None) -> Tuple[int, List[str]]:
+        if first > 1:
+            return 1, []
+        with open(file_path, "r", encoding="utf-8") as f:
+            return 1, [f.read()]
+
+
+class PyPDF2Extractor(Extractor):
+    name = "pypdf2"
+    file_type = "pdf"
+    requires = "PyPDF2"
+
+    def extract_pages(self, file_path: str, first: int = 1, last: Optional[int] = None) -> Tuple[int, List[str]]:
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+        last = page_count if last is None else min(last, page_count)
+        return page_count, [reader.pages[i].extract_text() for i in range(first - 1, last)]
+
+
+class PypdfExtractor(Extractor):
+    """pypdf, the maintained successor of PyPDF2."""
+    name = "pypdf"
+    file_type = "pdf"
+    requires = "pypdf"
+
+    def extract_pages(self, file_path: str, first: int = 1, last: Optional[int] = None) -> Tuple[int, List[str]]:
+        from pypdf import PdfReader
+
+        reader = PdfReader(file_path)
+        page_count = len(reader.pages)
+        last = page_count if last is None else min(last, page_count)
+        return page_count, [reader.pages[i].extract_text() for i in range(first - 1, last)]
+
+
+class PdfminerExtractor(Extractor):
+    """pdfminer.six: layout analysis, slower but keeps reading order."""
+    name = "pdfminer"
+    file_type = "pdf"
+    requires = "pdfminer"
+
+    def extract_pages(self, file_path: str, first: int = 1, last: Optional[int] = None) -> Tuple[int, List[str]]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdftypes import resolve1
+
+        with open(file_path, "rb") as f:
+            page_count = resolve1(PDFDocument(PDFParser(f)).catalog["Pages"])["Count"]
+        last = page_count if last is None else min(last, page_count)
+        if first > last:
+            return page_count, []
+        texts = [
+            "".join(element.get_text() for element in page if isinstance(element, LTTextContainer)).strip()
+            for page in extract_pages(file_path, page_numbers=range(first - 1, last))
+        ]
+        return page_count, texts
+
+
+_registry: Dict[str, Dict[str, Extractor]] = {}
+_defaults: Dict[str, str] = {}
+
+
+def register(extractor: Extractor, default: bool = False):
+    _registry.setdefault(extractor.file_type, {})[extractor.name] = extractor
+    if default or extractor.file_type not in _defaults:
+        _defaults[extractor.file_type] = extractor.name
+
+
+def engines(file_type: str) -> List[Extractor]:
+    """Every registered engine for a file type, installed or not."""
+    return list(_registry.get(file_type, {}).values())
+
+
+def lookup(file_type: str, name: str) -> Extractor:
+    """Return an engine by name, failing if it is unknown or not installed."""
+    extractor = _registry.get(file_type, {}).get(name)
+    if extractor is None:
+        raise ValueError(f"Unknown {file_type} extraction engine: {name}")
+    if not extractor.available():
+        raise ValueError(f"Extraction engine {name} needs the {extractor.requires} package")
+    return extractor
+
+
+def parse_engines(value: str) -> Dict[str, str]:
+    """Parse ``pdf=pypdf,txt=plain`` into {file_type: engine}."""
+    selected = {}
+    for pair in value.split(","):
+        if not pair.strip():
+            continue
+        file_type, _, name = pair.partition("=")
+        if not name.strip():
+            raise ValueError(f"Invalid EXTRACTION_ENGINES entry: {pair.strip()}")
+        selected[file_type.strip().lower()] = name.strip()
+    return selected
+
+
+register(PlainTextExtractor())
+register(PyPDF2Extractor(), default=True)
+register(PypdfExtractor())
+register(PdfminerExtractor())
+
+# Resolved once, so a misconfigured engine fails at startup
+_selected = {
+    file_type: lookup(file_type, name).name
+    for file_type, name in {**_defaults, **parse_engines(EXTRACTION_ENGINES)}.items()
+}
+
+
+def get_extractor(file_type: str) -> Optional[Extractor]:
+    """The configured engine for a file type, or None for unsupported types."""
+    name = _selected.get(file_type.lower())
+    return _registry[file_type.lower()][name] if name else None
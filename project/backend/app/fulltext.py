@@ -0,0 +1,127 @@
+"""Full-text search over resume filenames and extracted content.
+
+PostgreSQL gets a generated ``search_vector`` tsvector column on
+``resumes`` with a GIN index. SQLite, used by the tests and for local
+runs, gets an FTS5 virtual table kept in sync by triggers. Migration
+0005 creates both; the DDL below also runs whenever the metadata
+creates the ``resumes`` table (as the tests do), and ``search_resumes``
+hides the difference behind one API.
+"""
+import re
+from typing import List, NamedTuple, Optional
+from sqlalchemy import DDL, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Resume
+
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+
+_POSTGRES_DDL = [
+    # Filename matches rank above body matches
+    """
+    ALTER TABLE resumes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(original_filename, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_resumes_search_vector ON resumes USING GIN (search_vector)",
+]
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        original_filename, content,
+        content='resumes', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ai AFTER INSERT ON resumes BEGIN
+        INSERT INTO resumes_fts(rowid, original_filename, content)
+        VALUES (new.id, new.original_filename, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ad AFTER DELETE ON resumes BEGIN
+        INSERT INTO resumes_fts(resumes_fts, rowid, original_filename, content)
+        VALUES ('delete', old.id, old.original_filename, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_au AFTER UPDATE ON resumes BEGIN
+        INSERT INTO resumes_fts(resumes_fts, rowid, original_filename, content)
+        VALUES ('delete', old.id, old.original_filename, old.content);
+        INSERT INTO resumes_fts(rowid, original_filename, content)
+        VALUES (new.id, new.original_filename, new.content);
+    END
+    """,
+]
+
+for _statement in _POSTGRES_DDL:
+    event.listen(Resume.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in _SQLITE_DDL:
+    event.listen(Resume.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# The FTS5 table is not part of the metadata, so drop_all would leave it behind
+event.listen(
+    Resume.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS resumes_fts").execute_if(dialect="sqlite")
+)
+
+
+class SearchHit(NamedTuple):
+    resume_id: int
+    rank: float
+    snippet: Optional[str]
+
+
+_POSTGRES_SEARCH = text("""
+    SELECT hits.id, hits.rank,
+           ts_headline('english', coalesce(r.content, ''), hits.query, :headline_options) AS snippet
+    FROM (
+        SELECT resumes.id, ts_rank_cd(resumes.search_vector, query) AS rank, query
+        FROM resumes, websearch_to_tsquery('english', :q) AS query
+        WHERE resumes.search_vector @@ query
+        ORDER BY rank DESC, resumes.id DESC
+        LIMIT :limit OFFSET :offset
+    ) AS hits
+    JOIN resumes r ON r.id = hits.id
+    ORDER BY hits.rank DESC, hits.id DESC
+""")
+
+# bm25() is lower-is-better, so it is negated to match ts_rank_cd
+_SQLITE_SEARCH = text("""
+    SELECT resumes_fts.rowid AS id,
+           -bm25(resumes_fts, 2.0, 1.0) AS rank,
+           snippet(resumes_fts, 1, :start, :stop, '…', 20) AS snippet
+    FROM resumes_fts
+    WHERE resumes_fts MATCH :q
+    ORDER BY rank DESC, resumes_fts.rowid DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+
+def _fts5_query(q: str) -> str:
+    """Quote each word so user input can never be parsed as FTS5 syntax."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+async def search_resumes(db: AsyncSession, q: str, limit: int, offset: int) -> List[SearchHit]:
+    """Ranked resumes matching ``q``, best first, with highlighted snippets."""
+    if db.bind.dialect.name == "postgresql":
+        headline_options = (
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, "
+            "MaxFragments=2, MaxWords=20, MinWords=5"
+        )
+        result = await db.execute(_POSTGRES_SEARCH, {
+            "q": q, "limit": limit, "offset": offset, "headline_options": headline_options
+        })
+    else:
+        match = _fts5_query(q)
+        if not match:
+            return []
+        result = await db.execute(_SQLITE_SEARCH, {
+            "q": match, "limit": limit, "offset": offset,
+            "start": SNIPPET_START, "stop": SNIPPET_STOP
+        })
+    return [SearchHit(row.id, float(row.rank), row.snippet) for row in result]
@@ -0,0 +1,149 @@
+"""Conditional GETs: ETags, If-None-Match and 304 Not Modified.
+
+Two layers, both usable by any router:
+
+* ``ETagMiddleware`` gives every JSON ``GET`` response a strong ETag
+  hashed from its body and answers a matching ``If-None-Match`` with an
+  empty 304. The handler still runs, but unchanged payloads are not sent
+  again.
+* ``conditional(version)`` is a dependency for endpoints whose state can
+  be summarised by a cheap query (a row's version columns, a count). The
+  ETag is derived from that version *before* the handler runs, so a
+  matching request is answered without loading or serialising anything.
+
+Responses carry ``Cache-Control: no-cache``: browsers keep them but
+revalidate on every use, which is what the polling frontend needs.
+"""
+import hashlib
+import json
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+from fastapi import Depends, HTTPException, Request, Response
+
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over JSON-serialisable parts (or raw bytes)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else json.dumps(part, default=str).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Whether a GET may be answered with 304 (RFC 9110 section 13.2.2).
+
+    If-Modified-Since only counts when the request has no If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole-second resolution
+    return int(last_modified) <= since
+
+
+def not_modified(etag: str) -> HTTPException:
+    # FastAPI sends bodiless status codes such as 304 without a body
+    return HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def conditional(version: Callable):
+    """Dependency: answer 304 from ``version`` without running the handler.
+
+    ``version`` is itself a dependency (taking path parameters, ``db``...)
+    that returns anything JSON-serialisable that changes whenever the
+    response would, or None to skip conditional handling (for example when
+    the resource does not exist and the handler should produce its 404).
+    The path and query string are part of the ETag, so one version
+    function can serve every variant of an endpoint.
+    """
+    async def dependency(request: Request, response: Response, state: Any = Depends(version)):
+        if state is None:
+            return
+        etag = make_etag(request.url.path, sorted(request.query_params.multi_items()), state)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    return Depends(dependency)
+
+
+class ETagMiddleware:
+    """Add body-hash ETags to JSON GET responses and turn matches into 304s.
+
+    Responses that already have an ETag (from ``conditional``), are not
+    200, or are not JSON (file downloads, NDJSON/CSV streams) pass through
+    untouched; only JSON bodies are buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # HEAD responses have no body to hash
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        start = None
+        body = []
+
+        async def send_with_etag(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = {name.lower() for name, _ in message.get("headers", [])}
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if (
+                    message["status"] == 200
+                    and b"etag" not in headers
+                    and content_type.startswith(b"application/json")
+                ):
+                    start = message
+                    return
+                await send(message)
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            etag = make_etag(b"".join(body))
+            extra = [(b"etag", etag.encode()), (b"cache-control", CACHE_CONTROL.encode())]
+            if etag_matches(if_none_match, etag):
+                kept = [
+                    (name, value) for name, value in start.get("headers", [])
+                    if name.lower() not in (b"content-length", b"content-type")
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": kept + extra})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": list(start.get("headers", [])) + extra})
+            await send({"type": "http.response.body", "body": b"".join(body)})
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,221 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import and_, or_, select, update
+from dotenv import load_dotenv
+from app.cache import response_cache, resume_tag
+from app.database import SessionLocal
+from app.extraction import extract_document, ExtractionQueueFull
+from app.models import IngestionJob, Resume
+from app.pages import store_pages
+from app.search import index_resume
+
+load_dotenv()
+
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+# How long a job waits before retrying when the extraction pool is saturated
+INGESTION_RETRY_DELAY = float(os.getenv("INGESTION_RETRY_DELAY", "2"))
+# Seconds a claimed job may stay 'processing' before another worker takes it
+# over (its worker is presumed dead); keep it well above EXTRACTION_TIMEOUT
+INGESTION_LEASE = float(os.getenv("INGESTION_LEASE", "300"))
+
+
+class IngestionWorker:
+    """Extracts text for uploaded resumes in the background.
+
+    Jobs live in the ``ingestion_jobs`` table, so the in-memory queue only
+    carries job ids. Several processes may hold the same id (every worker
+    re-queues unfinished jobs on start); a job only runs in the one that
+    claims it, atomically, in the database. A claim is a lease: when a
+    job stays 'processing' for longer than ``lease`` seconds its worker
+    is presumed dead, and the periodic sweep hands it to another one.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        concurrency: int = INGESTION_WORKERS,
+        lease: float = INGESTION_LEASE
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.lease = lease
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # Ids waiting in the queue, so that sweeps do not queue them twice
+        self._queued: Set[int] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    def enqueue(self, job_id: int):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self.queue.put_nowait(job_id)
+
+    def _claimable(self, now: datetime):
+        """Jobs waiting to run, or whose lease ran out."""
+        expired = now - timedelta(seconds=self.lease)
+        return or_(
+            IngestionJob.status == "queued",
+            and_(
+                IngestionJob.status == "processing",
+                or_(IngestionJob.updated_at.is_(None), IngestionJob.updated_at < expired)
+            )
+        )
+
+    async def requeue_unfinished(self):
+        """Queue every job that this process could claim now."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob.id)
+                .where(self._claimable(datetime.now(timezone.utc)))
+                .order_by(IngestionJob.id.asc())
+            )
+            unfinished = result.scalars().all()
+        for job_id in unfinished:
+            self.enqueue(job_id)
+
+    async def start(self):
+        await self.requeue_unfinished()
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.concurrency)
+        ]
+        if self.concurrency:
+            self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.lease)
+            try:
+                await self.requeue_unfinished()
+            except Exception as e:
+                print(f"Error sweeping ingestion jobs: {e}")
+
+    async def _run(self):
+        while True:
+            job_id = await self.queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self.process(job_id)
+            except ExtractionQueueFull:
+                # Synchronous uploads share the extraction pool; back off
+                # and try again rather than failing the job.
+                await asyncio.sleep(INGESTION_RETRY_DELAY)
+                self.enqueue(job_id)
+            except Exception as e:
+                print(f"Error processing ingestion job {job_id}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def claim(self, db, job_id: int) -> bool:
+        """Mark a job 'processing' for this worker, unless it is taken or finished."""
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job_id, self._claimable(now))
+            .values(status="processing", updated_at=now)
+            .returning(IngestionJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await db.commit()
+        return claimed
+
+    async def process(self, job_id: int):
+        """Run a single ingestion job to completion."""
+        async with self.session_factory() as db:
+            # Finished, deleted with its resume, or running in another worker
+            if not await self.claim(db, job_id):
+                return
+
+            job = await db.get(IngestionJob, job_id)
+            resume = await db.get(Resume, job.resume_id)
+            # The file this job extracts; replacing it supersedes the job
+            source = (resume.file_path, resume.content_hash)
+            file_type = resume.file_type
+            resume.extraction_status = "processing"
+            await db.commit()
+            await response_cache.invalidate(resume_tag(resume.id))
+
+            try:
+                extracted = await extract_document(source[0], file_type)
+            except ExtractionQueueFull:
+                if await self.finish(db, job, resume, source, "queued", extraction_status="pending"):
+                    raise
+                return
+            except Exception as e:
+                await self.finish(
+                    db, job, resume, source, "failed",
+                    error=str(e) or e.__class__.__name__,
+                    extraction_status="failed",
+                    content=""
+                )
+                return
+
+            await self.finish(
+                db, job, resume, source, "completed",
+                pages=extracted.pages,
+                extraction_status="completed",
+                content=extracted.content
+            )
+
+    async def finish(
+        self,
+        db,
+        job: IngestionJob,
+        resume: Resume,
+        source: Tuple[str, Optional[str]],
+        status: str,
+        error: Optional[str] = None,
+        pages: Optional[List[str]] = None,
+        **values
+    ) -> bool:
+        """Record a job's outcome unless the resume's file was replaced meanwhile.
+
+        Both writes are conditional, so a replacement that commits while the
+        old file is parsed wins: the resume keeps the new file's state and
+        the job ends ``superseded``. Returns whether the outcome was recorded.
+        """
+        file_path, content_hash = source
+        result = await db.execute(
+            update(Resume)
+            .where(
+                Resume.id == resume.id,
+                Resume.file_path == file_path,
+                Resume.content_hash.is_not_distinct_from(content_hash)
+            )
+            .values(**values)
+            .execution_options(synchronize_session="fetch")
+        )
+        current = result.rowcount == 1
+        if current and pages:
+            await store_pages(db, resume.id, pages)
+        await db.execute(
+            update(IngestionJob)
+            .where(IngestionJob.id == job.id, IngestionJob.status == "processing")
+            .values(status=status if current else "superseded", error=error)
+            .execution_options(synchronize_session="fetch")
+        )
+        await db.commit()
+        await response_cache.invalidate(resume_tag(resume.id))
+        if current:
+            index_resume(resume)
+        return current
+
+
+async def supersede_jobs(db, resume_id: int):
+    """Retire a resume's unfinished jobs because its file is being replaced (caller commits)."""
+    await db.execute(
+        update(IngestionJob)
+        .where(IngestionJob.resume_id == resume_id, IngestionJob.status.in_(("queued", "processing")))
+        .values(status="superseded")
+        .execution_options(synchronize_session=False)
+    )
+
+
+ingestion_worker = IngestionWorker()
@@ -1,7 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import resumes, chat, evaluations
-from app.database import engine, Base
+from app.broadcast import broadcast
+from app.cache import response_cache
+from app.chat_writer import chat_writer
+from app.database import engine
+from app.extraction import shutdown_executor
+from app.http_cache import ETagMiddleware
+from app import metrics, querylog
+from app.ingestion import ingestion_worker
+from app import search
 import os
 
 app = FastAPI(
@@ -22,6 +30,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETags and 304s for every JSON GET that does not compute its own
+app.add_middleware(ETagMiddleware)
+
+# Query count and database time headers, when QUERY_DEBUG is on
+app.add_middleware(querylog.QueryCountMiddleware)
+querylog.instrument_engine(engine)
+
+# Outermost, so request latency includes every other middleware
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+
 # Include routers
 app.include_router(resumes.router, prefix="/api/resumes", tags=["resumes"])
 app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
@@ -38,10 +57,44 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache size and hit/miss counters of this worker process."""
+    return response_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics of every worker (see app/metrics.py)."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on application startup."""
-    # Only create tables if not in test mode
+    """Start background ingestion and the other workers on startup.
+
+    The schema is not touched here: run ``alembic upgrade head`` first.
+    """
     if os.getenv("ENVIRONMENT") != "test":
-        Base.metadata.create_all(bind=engine)
+        if search.service.SEARCH_INDEX_ENABLED:
+            await search.warm_start()
+        await ingestion_worker.start()
+        await broadcast.start()
+        await response_cache.start()
+        if chat_writer.enabled:
+            await chat_writer.start()
+
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work and close database connections."""
+    await broadcast.stop()
+    await response_cache.stop()
+    # Flush buffered chat messages while the database is still reachable
+    await chat_writer.stop()
+    await ingestion_worker.stop()
+    shutdown_executor()
+    metrics.mark_process_dead()
+    if os.getenv("ENVIRONMENT") != "test" and search.service.SEARCH_INDEX_ENABLED:
+        search.save_snapshot()
+    await engine.dispose()
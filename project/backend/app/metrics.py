@@ -0,0 +1,184 @@
+"""Prometheus metrics, served by ``GET /metrics``.
+
+Covers HTTP latency per route template, SQL statement timing and pool
+usage (through engine events), text extraction, upload sizes and chat
+WebSockets. With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to
+an empty directory shared by the workers (cleared before every start);
+each worker then writes its samples there and any worker can answer a
+scrape with the totals. Without it, metrics cover the answering process
+only.
+"""
+import os
+import time
+from dotenv import load_dotenv
+
+# prometheus_client picks its storage when it is imported, so the
+# multiprocess directory must be known (and exist) before that
+load_dotenv()
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine  # noqa: E402
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK"}
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (up to max_overflow)",
+    multiprocess_mode="livesum",
+)
+EXTRACTION_DURATION = Histogram(
+    "extraction_duration_seconds",
+    "Time to extract text, including the wait for a pool worker",
+    ["file_type", "engine"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+EXTRACTION_PAGES = Histogram(
+    "extraction_pages",
+    "Pages parsed per extraction",
+    ["file_type", "engine"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200, 500),
+)
+EXTRACTION_FAILURES = Counter(
+    "extraction_failures_total",
+    "Extractions that did not produce text",
+    ["file_type", "engine", "reason"],
+)
+UPLOAD_SIZE = Histogram(
+    "upload_size_bytes",
+    "Size of uploaded resume files",
+    buckets=(1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 2.5e7, 1e8),
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Open chat WebSockets per resume",
+    ["resume_id"],
+    multiprocess_mode="livesum",
+)
+CHAT_FANOUT_LATENCY = Histogram(
+    "chat_fanout_duration_seconds",
+    "Time to queue one chat message to this worker's sockets",
+    buckets=FAST_BUCKETS,
+)
+CHAT_DELIVERIES = Counter(
+    "chat_deliveries_total",
+    "Chat messages queued to sockets",
+)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Time every statement and track pool usage of an engine."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        DB_QUERY_LATENCY.labels(_operation(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            started = starts.pop()
+            DB_QUERY_LATENCY.labels(_operation(context.statement or "")).observe(time.perf_counter() - started)
+
+    def pool_changed(pool):
+        # NullPool (tests, SQLite) has no overflow to report
+        if hasattr(pool, "overflow"):
+            DB_POOL_OVERFLOW.set(max(0, pool.overflow()))
+
+    @event.listens_for(sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+        pool_changed(sync_engine.pool)
+
+    @event.listens_for(sync_engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        pool_changed(sync_engine.pool)
+
+
+class MetricsMiddleware:
+    """Record the latency of every HTTP request under its route template.
+
+    Paths that match no route are grouped as ``unmatched`` so that
+    arbitrary URLs cannot blow up the label set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], route, str(status)).observe(time.perf_counter() - started)
+
+
+def render() -> bytes:
+    """Current metrics in the text exposition format (every worker's, if shared)."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
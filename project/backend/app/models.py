@@ -1,30 +1,57 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+# SQLite stores CURRENT_TIMESTAMP without fractional seconds; binding
+# parameters the same way keeps (created_at, id) keyset comparisons exact.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
+
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Keyset pagination order for the resume list
+        Index("ix_resumes_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
     original_filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # 'pdf' or 'txt'
     file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file bytes
     content = Column(Text)  # Extracted text content
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 'pending', 'processing', 'completed' or 'failed'
+    extraction_status = Column(String, nullable=False, default="completed", server_default="completed")
+    created_at = Column(Timestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     evaluations = relationship("Evaluation", back_populates="resume", cascade="all, delete-orphan")
     chat_messages = relationship("ChatMessage", back_populates="resume", cascade="all, delete-orphan")
+    ingestion_jobs = relationship("IngestionJob", back_populates="resume", cascade="all, delete-orphan")
+    rating = relationship("ResumeRating", back_populates="resume", uselist=False, cascade="all, delete-orphan")
+    pages = relationship(
+        "ResumePage",
+        back_populates="resume",
+        cascade="all, delete-orphan",
+        order_by="ResumePage.page_number"
+    )
 
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (
+        # Foreign key lookups and each resume's evaluations, newest first
+        Index("ix_evaluations_resume_id_created_at", "resume_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
     rating = Column(Float, nullable=False)  # Rating from 1.0 to 5.0
     comment = Column(Text)
     evaluator_name = Column(String, nullable=False)
@@ -35,12 +62,67 @@ class Evaluation(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # History pages are keyed on (created_at, id) within a resume
+        Index("ix_chat_messages_resume_created_id", "resume_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
     username = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     resume = relationship("Resume", back_populates="chat_messages")
 
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    # 'queued', 'processing', 'completed', 'failed', or 'superseded' when the file was replaced first
+    status = Column(String, nullable=False, default="queued")
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    resume = relationship("Resume", back_populates="ingestion_jobs")
+
+
+class ResumeRating(Base):
+    """Running rating aggregates for one resume, kept in step with evaluations."""
+    __tablename__ = "resume_ratings"
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    average = Column(Float, index=True)  # Sort key for the resume list
+    min_rating = Column(Float)
+    max_rating = Column(Float)
+    # Ratings per star, each rounded to the nearest whole star
+    bucket_1 = Column(Integer, nullable=False, default=0)
+    bucket_2 = Column(Integer, nullable=False, default=0)
+    bucket_3 = Column(Integer, nullable=False, default=0)
+    bucket_4 = Column(Integer, nullable=False, default=0)
+    bucket_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    resume = relationship("Resume", back_populates="rating")
+
+    @property
+    def histogram(self) -> dict:
+        return {star: getattr(self, f"bucket_{star}") for star in range(1, 6)}
+
+
+class ResumePage(Base):
+    """Text of one PDF page, filled in when the page is first extracted."""
+    __tablename__ = "resume_pages"
+
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    page_number = Column(Integer, primary_key=True)  # 1-based
+    # NULL until the page is extracted; every page of a touched PDF has a row
+    text = Column(Text)
+
+    resume = relationship("Resume", back_populates="pages")
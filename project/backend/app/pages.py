@@ -0,0 +1,126 @@
+"""Page-level text of PDF resumes.
+
+``resume_pages`` holds one row per page of every PDF whose pages have been
+looked at. Full extractions (uploads, ingestion jobs) store all pages at
+once. Otherwise the first range request parses just the pages it needs,
+records the page count as NULL-text placeholder rows and caches the texts
+it parsed, so a page-1 preview never parses the rest of the document.
+Files of unpaged types (TXT) are served as a single page.
+"""
+import os
+from typing import Dict, List, Tuple
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+from app.database import upsert_insert
+from app.extraction import extract_pages, extract_text
+from app.extractors import get_extractor
+from app.models import Resume, ResumePage
+
+load_dotenv()
+
+# Most pages one GET /resumes/{id}/pages request may return
+RESUME_PAGES_MAX_RANGE = int(os.getenv("RESUME_PAGES_MAX_RANGE", "20"))
+
+
+class PageOutOfRange(ValueError):
+    """Raised when the first requested page is past the end of the document."""
+
+
+async def store_pages(db: AsyncSession, resume_id: int, pages: List[str]):
+    """Replace a resume's pages with a complete extraction (caller commits)."""
+    await clear_pages(db, resume_id)
+    if pages:
+        await db.execute(
+            insert(ResumePage),
+            [
+                {"resume_id": resume_id, "page_number": number, "text": text}
+                for number, text in enumerate(pages, start=1)
+            ]
+        )
+
+
+async def clear_pages(db: AsyncSession, resume_id: int):
+    """Forget stored pages, e.g. when the file is replaced (caller commits)."""
+    await db.execute(delete(ResumePage).where(ResumePage.resume_id == resume_id))
+
+
+async def _save_extracted(
+    db: AsyncSession,
+    resume: Resume,
+    page_count: int,
+    extracted: Dict[int, str],
+    placeholders: bool
+):
+    dialect_insert = upsert_insert(db.bind.dialect.name)
+    if placeholders and page_count:
+        await db.execute(
+            dialect_insert(ResumePage).values([
+                {"resume_id": resume.id, "page_number": number, "text": None}
+                for number in range(1, page_count + 1)
+            ]).on_conflict_do_nothing()
+        )
+    if extracted:
+        stmt = dialect_insert(ResumePage).values([
+            {"resume_id": resume.id, "page_number": number, "text": text}
+            for number, text in extracted.items()
+        ])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[ResumePage.resume_id, ResumePage.page_number],
+            set_={"text": stmt.excluded.text}
+        ))
+
+    # The file may have been replaced while we were parsing the old one
+    current_path = await db.scalar(select(Resume.file_path).where(Resume.id == resume.id))
+    if current_path != resume.file_path:
+        await db.rollback()
+        return
+    await db.commit()
+
+
+async def get_pages(db: AsyncSession, resume: Resume, first: int, last: int) -> Tuple[int, List[Tuple[int, str]]]:
+    """Return the page count and ``(page_number, text)`` for pages first..last.
+
+    ``last`` is clamped to the page count. Pages that have not been
+    extracted yet are parsed in one pass over the smallest span covering
+    them and stored, committing the session. Raises PageOutOfRange when
+    ``first`` is past the last page; extraction errors are raised as is.
+    """
+    extractor = get_extractor(resume.file_type)
+    if extractor is None or not extractor.paged:
+        if first > 1:
+            raise PageOutOfRange(f"Page {first} is past the end of the document (1 page)")
+        text = resume.content
+        if text is None:
+            text = await extract_text(resume.file_path, resume.file_type)
+        return 1, [(1, text)]
+
+    page_count = await db.scalar(
+        select(func.max(ResumePage.page_number)).where(ResumePage.resume_id == resume.id)
+    )
+    texts: Dict[int, str] = {}
+    if page_count is not None:
+        if first > page_count:
+            raise PageOutOfRange(f"Page {first} is past the end of the document ({page_count} pages)")
+        last = min(last, page_count)
+        rows = await db.execute(
+            select(ResumePage.page_number, ResumePage.text).where(
+                ResumePage.resume_id == resume.id,
+                ResumePage.page_number.between(first, last),
+                ResumePage.text.is_not(None)
+            )
+        )
+        texts = dict(rows.tuples().all())
+
+    missing = [number for number in range(first, last + 1) if number not in texts]
+    if missing:
+        placeholders = page_count is None
+        page_count, parsed = await extract_pages(resume.file_path, extractor, missing[0], missing[-1])
+        extracted = dict(enumerate(parsed, start=missing[0]))
+        await _save_extracted(db, resume, page_count, extracted, placeholders)
+        if first > page_count:
+            raise PageOutOfRange(f"Page {first} is past the end of the document ({page_count} pages)")
+        texts.update(extracted)
+        last = min(last, page_count)
+
+    return page_count, [(number, texts[number]) for number in range(first, last + 1)]
@@ -0,0 +1,82 @@
+import base64
+import json
+import os
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# How long a list total may be served from memory before it is recounted
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+# Above this many rows PostgreSQL's planner statistics replace COUNT(*)
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe token."""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+class CachedCount:
+    """Row count of a table, cached in process memory for a short TTL.
+
+    Writers in this process keep the cached value exact with ``adjust``;
+    writes from other workers show up once the TTL expires. On PostgreSQL,
+    tables larger than COUNT_ESTIMATE_THRESHOLD are counted from
+    ``pg_class.reltuples`` instead of a full scan.
+    """
+
+    def __init__(self, model, ttl: float = COUNT_CACHE_TTL):
+        self.model = model
+        self.ttl = ttl
+        self._value: Optional[int] = None
+        self._expires_at = 0.0
+
+    async def get(self, db: AsyncSession) -> int:
+        if self._value is not None and time.monotonic() < self._expires_at:
+            return self._value
+        value = await self._estimate(db)
+        if value is None:
+            value = (await db.execute(
+                select(func.count()).select_from(self.model)
+            )).scalar_one()
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    async def _estimate(self, db: AsyncSession) -> Optional[int]:
+        if db.bind.dialect.name != "postgresql":
+            return None
+        estimate = (await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": self.model.__tablename__}
+        )).scalar()
+        # reltuples is -1 until the table has been analyzed
+        if estimate is None or estimate < COUNT_ESTIMATE_THRESHOLD:
+            return None
+        return int(estimate)
+
+    def adjust(self, delta: int):
+        if self._value is not None:
+            self._value += delta
+
+    def invalidate(self):
+        self._value = None
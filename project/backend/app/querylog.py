@@ -0,0 +1,114 @@
+"""Per-request SQL query counting.
+
+``record_queries()`` binds a ``QueryStats`` to the current context; the
+engine events installed by ``instrument_engine`` add every statement run
+in that context to it, and to any recorder it is nested in. Recording
+follows asyncio tasks, so concurrent requests never see each other's
+queries.
+
+With QUERY_DEBUG on, ``QueryCountMiddleware`` records each HTTP request
+and reports ``X-Query-Count`` and ``X-Query-Time`` (milliseconds) headers.
+Tests use the same recorder to hold endpoints to a query budget.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+load_dotenv()
+
+# Report per-request query count and database time in response headers
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() in ("1", "true", "yes")
+
+
+class QueryStats:
+    """Statements run while a recorder was active, and their total time."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None, keep_statements: bool = False):
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def add(self, statement: str, seconds: float):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            if stats.statements is not None:
+                stats.statements.append(statement)
+            stats = stats.parent
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def record_queries(keep_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the statements run in this context until the block exits."""
+    stats = QueryStats(_current.get(), keep_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Feed an engine's statements to the active recorder, if any."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("querylog_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        starts = conn.info.get("querylog_start")
+        if stats is not None and starts:
+            stats.add(statement, time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute; drop its
+        # start so the next statement on this pooled connection is not
+        # timed from it
+        stats = _current.get()
+        starts = context.connection.info.get("querylog_start") if context.connection is not None else None
+        if starts:
+            started = starts.pop()
+            if stats is not None:
+                stats.add(context.statement or "", time.perf_counter() - started)
+
+
+class QueryCountMiddleware:
+    """Add the request's query count and database time as response headers.
+
+    Streaming responses report the queries run before their first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_DEBUG:
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as stats:
+            async def send_with_counts(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"x-query-time", f"{stats.seconds * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
@@ -0,0 +1,102 @@
+"""Per-resume rating aggregates.
+
+``resume_ratings`` holds one row per rated resume with the count, sum,
+mean, min, max and a 1-5 star histogram of its evaluations. The row is
+upserted in the same transaction that inserts an evaluation, with
+increments computed by the database, so concurrent evaluations never lose
+updates and readers never need to scan ``evaluations``.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import case, func, insert, select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import upsert_insert
+from app.models import Evaluation, ResumeRating
+from app.schemas import RatingSummary
+
+STARS = range(1, 6)
+
+
+def rating_star(rating: float) -> int:
+    """Histogram bucket of a rating: the nearest whole star, halves rounding up."""
+    return min(5, max(1, int(rating + 0.5)))
+
+
+def rating_summary(resume_id: int, rating: Optional[ResumeRating]) -> RatingSummary:
+    """The aggregates of a resume, all zero if it has no ``resume_ratings`` row yet."""
+    if rating:
+        return RatingSummary.model_validate(rating)
+    return RatingSummary(resume_id=resume_id, count=0, total=0.0, histogram={star: 0 for star in STARS})
+
+
+async def record_rating(db: AsyncSession, resume_id: int, rating: float):
+    """Fold one new rating into the resume's aggregates (caller commits)."""
+    await record_ratings(db, [(resume_id, rating)])
+
+
+async def record_ratings(db: AsyncSession, ratings: Iterable[Tuple[int, float]]):
+    """Fold many new ratings into their resumes' aggregates with one upsert (caller commits)."""
+    grouped: Dict[int, dict] = {}
+    for resume_id, rating in ratings:
+        row = grouped.get(resume_id)
+        if row is None:
+            row = grouped[resume_id] = {
+                "resume_id": resume_id,
+                "count": 0,
+                "total": 0.0,
+                "min_rating": rating,
+                "max_rating": rating,
+                **{f"bucket_{s}": 0 for s in STARS}
+            }
+        row["count"] += 1
+        row["total"] += rating
+        row["min_rating"] = min(row["min_rating"], rating)
+        row["max_rating"] = max(row["max_rating"], rating)
+        row[f"bucket_{rating_star(rating)}"] += 1
+    if not grouped:
+        return
+    for row in grouped.values():
+        row["average"] = row["total"] / row["count"]
+
+    dialect_name = db.bind.dialect.name
+    # SQLite spells LEAST/GREATEST as the two-argument min()/max()
+    least, greatest = (func.least, func.greatest) if dialect_name == "postgresql" else (func.min, func.max)
+    stmt = upsert_insert(dialect_name)(ResumeRating).values(list(grouped.values()))
+    current = ResumeRating.__table__.c
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[current.resume_id],
+        set_={
+            "count": current.count + new.count,
+            "total": current.total + new.total,
+            "average": (current.total + new.total) / (current.count + new.count),
+            "min_rating": least(current.min_rating, new.min_rating),
+            "max_rating": greatest(current.max_rating, new.max_rating),
+            **{f"bucket_{s}": current[f"bucket_{s}"] + new[f"bucket_{s}"] for s in STARS},
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_ratings(db: AsyncSession):
+    """Recompute every aggregate from the evaluations table (caller commits)."""
+    await db.execute(delete(ResumeRating))
+    star = case(
+        *((Evaluation.rating < s + 0.5, s) for s in range(1, 5)),
+        else_=5
+    )
+    aggregates = select(
+        Evaluation.resume_id,
+        func.count(),
+        func.sum(Evaluation.rating),
+        func.avg(Evaluation.rating),
+        func.min(Evaluation.rating),
+        func.max(Evaluation.rating),
+        *(func.sum(case((star == s, 1), else_=0)) for s in STARS)
+    ).group_by(Evaluation.resume_id)
+    await db.execute(insert(ResumeRating).from_select(
+        ["resume_id", "count", "total", "average", "min_rating", "max_rating",
+         *(f"bucket_{s}" for s in STARS)],
+        aggregates
+    ))
+
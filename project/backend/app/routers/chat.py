@@ -1,114 +1,364 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
-from typing import List, Dict
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+from sqlalchemy import insert, select, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Optional
+import asyncio
 import json
-from app.database import get_db, SessionLocal
+import os
+import time
+from pydantic import TypeAdapter
+from app.broadcast import Broadcast, PayloadTooLarge, broadcast
+from app.cache import chat_tag, json_response, response_cache
+from app.chat_writer import ChatBufferFull, chat_writer
+from app.database import get_db, row_exists, SessionLocal
+from app.metrics import CHAT_DELIVERIES, CHAT_FANOUT_LATENCY, WEBSOCKET_CONNECTIONS
 from app.models import ChatMessage, Resume
 from app.schemas import ChatMessageResponse
+from dotenv import load_dotenv
+
+load_dotenv()
 
 router = APIRouter()
 
-# Store active WebSocket connections per resume
-active_connections: Dict[int, List[WebSocket]] = {}
+# Messages buffered per client before it is considered too slow and dropped
+CHAT_SEND_QUEUE_SIZE = int(os.getenv("CHAT_SEND_QUEUE_SIZE", "64"))
+# Longest a single send may block before the client is dropped
+CHAT_SEND_TIMEOUT = float(os.getenv("CHAT_SEND_TIMEOUT", "5"))
+
+# Messages per history page, by default and at most
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "100"))
+CHAT_HISTORY_MAX_LIMIT = int(os.getenv("CHAT_HISTORY_MAX_LIMIT", "500"))
+
+ChatMessageList = TypeAdapter(List[ChatMessageResponse])
+
+# Close code for clients that cannot keep up ("try again later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+def message_payload(message: ChatMessage) -> dict:
+    return {
+        "id": message.id,
+        "resume_id": message.resume_id,
+        "username": message.username,
+        "message": message.message,
+        "created_at": message.created_at.isoformat()
+    }
+
+
+class ClientConnection:
+    """A WebSocket client with its own bounded outbound queue.
+
+    A dedicated sender task drains the queue, so a slow client only ever
+    delays itself. The client is dropped when its queue overflows or a
+    send exceeds CHAT_SEND_TIMEOUT.
+    """
+
+    def __init__(self, websocket: WebSocket, resume_id: int, manager: "ConnectionManager"):
+        self.websocket = websocket
+        self.resume_id = resume_id
+        self.manager = manager
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=CHAT_SEND_QUEUE_SIZE)
+        self.sender: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.sender = asyncio.create_task(self._send_loop())
+
+    def send(self, text: str) -> bool:
+        """Queue an already serialized message; False if the queue is full."""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _send_loop(self):
+        while True:
+            text = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(text), CHAT_SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.manager.drop(self, "Send timed out")
+                return
+            except Exception as e:
+                print(f"Error sending message: {e}")
+                self.manager.drop(self, None)
+                return
+
+    async def close(self, reason: Optional[str]):
+        try:
+            if reason:
+                await asyncio.wait_for(
+                    self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE, reason=reason),
+                    CHAT_SEND_TIMEOUT
+                )
+        except Exception:
+            pass  # The connection is already gone
 
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+    """Tracks this process's WebSocket clients per resume.
+
+    Messages go out through the broadcast backend, so that clients
+    connected to other workers receive them too; ``deliver`` is the
+    subscriber that hands them to the local sockets. Each message is
+    serialized once and queued to every client without waiting on any of
+    them.
+    """
+
+    def __init__(self, backend: Broadcast = broadcast):
+        self.active_connections: Dict[int, Dict[WebSocket, ClientConnection]] = {}
+        self.backend = backend
+        self._closing: set = set()
+        backend.subscribe(self.deliver)
 
-    async def connect(self, websocket: WebSocket, resume_id: int):
+    async def connect(self, websocket: WebSocket, resume_id: int) -> ClientConnection:
         await websocket.accept()
-        if resume_id not in self.active_connections:
-            self.active_connections[resume_id] = []
-        self.active_connections[resume_id].append(websocket)
+        client = ClientConnection(websocket, resume_id, self)
+        self.active_connections.setdefault(resume_id, {})[websocket] = client
+        WEBSOCKET_CONNECTIONS.labels(str(resume_id)).inc()
+        client.start()
+        return client
 
     def disconnect(self, websocket: WebSocket, resume_id: int):
-        if resume_id in self.active_connections:
-            self.active_connections[resume_id].remove(websocket)
-            if not self.active_connections[resume_id]:
-                del self.active_connections[resume_id]
+        clients = self.active_connections.get(resume_id)
+        if not clients or websocket not in clients:
+            return
+        client = clients.pop(websocket)
+        WEBSOCKET_CONNECTIONS.labels(str(resume_id)).dec()
+        if not clients:
+            del self.active_connections[resume_id]
+        if client.sender and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+
+    def drop(self, client: ClientConnection, reason: Optional[str]):
+        """Disconnect a client that failed or fell behind."""
+        self.disconnect(client.websocket, client.resume_id)
+        task = asyncio.create_task(client.close(reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
 
     async def broadcast(self, message: dict, resume_id: int):
-        if resume_id in self.active_connections:
-            for connection in self.active_connections[resume_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error sending message: {e}")
+        try:
+            await self.backend.publish({"resume_id": resume_id, "message": message})
+        except PayloadTooLarge:
+            # Receivers load the stored message themselves
+            if chat_writer.enabled:
+                await chat_writer.flush()
+            await self.backend.publish({"resume_id": resume_id, "message_id": message["id"]})
+
+    async def deliver(self, envelope: dict):
+        resume_id = envelope["resume_id"]
+        if resume_id not in self.active_connections:
+            return
+        message = envelope.get("message")
+        if message is None:
+            async with SessionLocal() as db:
+                db_message = await db.get(ChatMessage, envelope["message_id"])
+            if not db_message:
+                return
+            message = message_payload(db_message)
+
+        started = time.perf_counter()
+        text = json.dumps(message)
+        clients = list(self.active_connections.get(resume_id, {}).values())
+        for client in clients:
+            if not client.send(text):
+                self.drop(client, "Client too slow")
+        CHAT_FANOUT_LATENCY.observe(time.perf_counter() - started)
+        CHAT_DELIVERIES.inc(len(clients))
 
 
 manager = ConnectionManager()
 
 
+class UnknownMessage(ValueError):
+    """Raised when a history cursor names a message that is not in the thread."""
+
+
+async def fetch_messages(
+    db: AsyncSession,
+    resume_id: int,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = CHAT_HISTORY_LIMIT
+) -> Optional[List[ChatMessage]]:
+    """A page of a resume's messages, oldest first, or None if there is no such resume.
+
+    Messages are ordered by (created_at, id). ``after_id`` returns the
+    first ``limit`` messages after that one; otherwise the latest ``limit``
+    messages are returned, ending just before ``before_id`` if given.
+    """
+    anchor_id = after_id if after_id is not None else before_id
+    conditions = [ChatMessage.resume_id == Resume.id]
+    if anchor_id is not None:
+        anchor = await db.get(ChatMessage, anchor_id)
+        if not anchor or anchor.resume_id != resume_id:
+            raise UnknownMessage(f"Unknown message id: {anchor_id}")
+        # Compare against the stored value rather than a round-tripped one
+        anchor_created_at = select(ChatMessage.created_at).where(
+            ChatMessage.id == anchor_id
+        ).scalar_subquery()
+        if after_id is not None:
+            conditions.append(or_(
+                ChatMessage.created_at > anchor_created_at,
+                and_(ChatMessage.created_at == anchor_created_at, ChatMessage.id > after_id)
+            ))
+        else:
+            conditions.append(or_(
+                ChatMessage.created_at < anchor_created_at,
+                and_(ChatMessage.created_at == anchor_created_at, ChatMessage.id < before_id)
+            ))
+
+    # Joined from the resume: a missing resume gives no rows, an empty page
+    # a single NULL row, so no separate existence check is needed
+    query = select(Resume.id, ChatMessage).outerjoin(
+        ChatMessage, and_(*conditions)
+    ).where(Resume.id == resume_id)
+    if after_id is not None:
+        query = query.order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+        rows = (await db.execute(query.limit(limit))).all()
+    else:
+        query = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+        rows = list(reversed((await db.execute(query.limit(limit))).all()))
+    if not rows:
+        return None
+    return [row.ChatMessage for row in rows if row.ChatMessage is not None]
+
+
 @router.get("/resume/{resume_id}", response_model=List[ChatMessageResponse])
 async def get_chat_messages(
     resume_id: int,
-    db: Session = Depends(get_db)
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(CHAT_HISTORY_LIMIT, ge=1, le=CHAT_HISTORY_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all chat messages for a specific resume."""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
+    """Get chat messages for a specific resume, oldest first.
+
+    Without cursors the latest ``limit`` messages are returned. Page
+    backwards with ``before_id`` set to the oldest message received, or
+    fetch newer messages with ``after_id`` set to the newest one.
+    """
+    if before_id is not None and after_id is not None:
+        raise HTTPException(status_code=400, detail="Use either before_id or after_id")
+
+    key = (chat_tag(resume_id), before_id, after_id, limit)
+    body = response_cache.get(key)
+    if body is None:
+        version = response_cache.version(key[0])
+        try:
+            messages = await fetch_messages(db, resume_id, before_id, after_id, limit)
+        except UnknownMessage as e:
+            # A missing resume is reported before a bad cursor
+            if not await row_exists(db, Resume.id, resume_id):
+                raise HTTPException(status_code=404, detail="Resume not found")
+            raise HTTPException(status_code=400, detail=str(e))
+        if messages is None:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        body = ChatMessageList.dump_json(ChatMessageList.validate_python(messages, from_attributes=True))
+        response_cache.set(key, body, len(body), version)
+    return json_response(body)
+
 
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.resume_id == resume_id
-    ).order_by(ChatMessage.created_at.asc()).all()
+async def sync_messages(client: ClientConnection, resume_id: int, last_id: Optional[int]):
+    """Send a reconnecting client the messages it missed, in one frame.
 
-    return messages
+    With ``last_id`` the frame holds the messages after it, oldest first,
+    and ``has_more`` means newer ones follow (sync again from the last).
+    Without it the frame holds the latest messages and ``has_more`` means
+    older ones precede them. A client whose queue cannot take the frame
+    is dropped, as for live messages, so it reconnects and syncs again.
+    """
+    if chat_writer.enabled:
+        # The client may have seen messages that are not stored yet
+        await chat_writer.flush()
+    async with SessionLocal() as db:
+        try:
+            messages = await fetch_messages(
+                db, resume_id, after_id=last_id, limit=CHAT_HISTORY_MAX_LIMIT + 1
+            ) or []
+        except UnknownMessage as e:
+            frame = {"error": str(e)}
+        else:
+            has_more = len(messages) > CHAT_HISTORY_MAX_LIMIT
+            # The extra row tells whether there is more; it sits at the far end
+            # from last_id, or before the latest page when there is none
+            if has_more:
+                messages = messages[:CHAT_HISTORY_MAX_LIMIT] if last_id is not None else messages[1:]
+            frame = {
+                "type": "sync",
+                "messages": [message_payload(m) for m in messages],
+                "has_more": has_more
+            }
+    if not client.send(json.dumps(frame)):
+        client.manager.drop(client, "Client too slow")
 
 
 @router.websocket("/ws/{resume_id}")
 async def websocket_endpoint(websocket: WebSocket, resume_id: int):
-    """WebSocket endpoint for real-time chat."""
+    """WebSocket endpoint for real-time chat.
+
+    A reconnecting client sends ``{"type": "sync", "last_id": N}`` and gets
+    one ``{"type": "sync", "messages": [...], "has_more": bool}`` frame with
+    the messages after N (the latest ones if N is null). Live messages may
+    arrive before the sync frame, so clients de-duplicate by id.
+    """
     # Verify resume exists
-    db = SessionLocal()
-    try:
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
-        if not resume:
-            await websocket.close(code=1008, reason="Resume not found")
-            return
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        found = await row_exists(db, Resume.id, resume_id)
+    if not found:
+        await websocket.close(code=1008, reason="Resume not found")
+        return
 
-    await manager.connect(websocket, resume_id)
+    client = await manager.connect(websocket, resume_id)
 
     try:
-        while True:
+        # A client dropped for falling behind has already been closed
+        while websocket.application_state == WebSocketState.CONNECTED:
             data = await websocket.receive_text()
             message_data = json.loads(data)
 
+            # Reconnect handshake: {"type": "sync", "last_id": <last seen id or null>}
+            if message_data.get("type") == "sync":
+                await sync_messages(client, resume_id, message_data.get("last_id"))
+                continue
+
             # Validate message data
             if "username" not in message_data or "message" not in message_data:
-                await websocket.send_json({
+                client.send(json.dumps({
                     "error": "Username and message are required"
-                })
+                }))
                 continue
 
-            # Save message to database
-            db = SessionLocal()
-            try:
-                db_message = ChatMessage(
-                    resume_id=resume_id,
-                    username=message_data["username"],
-                    message=message_data["message"]
-                )
-                db.add(db_message)
-                db.commit()
-                db.refresh(db_message)
-
-                # Broadcast to all connected clients
-                response = {
-                    "id": db_message.id,
-                    "resume_id": db_message.resume_id,
-                    "username": db_message.username,
-                    "message": db_message.message,
-                    "created_at": db_message.created_at.isoformat()
-                }
-                await manager.broadcast(response, resume_id)
-            finally:
-                db.close()
+            # Save message to database, or hand it to the write-behind buffer
+            if chat_writer.enabled:
+                try:
+                    db_message = await chat_writer.add(
+                        resume_id, message_data["username"], message_data["message"]
+                    )
+                except ChatBufferFull:
+                    client.send(json.dumps({
+                        "error": "Chat is busy, message not sent; try again shortly"
+                    }))
+                    continue
+            else:
+                async with SessionLocal() as db:
+                    db_message = await db.scalar(
+                        insert(ChatMessage).values(
+                            resume_id=resume_id,
+                            username=message_data["username"],
+                            message=message_data["message"]
+                        ).returning(ChatMessage)
+                    )
+                    await db.commit()
+                await response_cache.invalidate(chat_tag(resume_id))
+
+            # Broadcast to all connected clients, in every worker
+            await manager.broadcast(message_payload(db_message), resume_id)
 
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket, resume_id)
 
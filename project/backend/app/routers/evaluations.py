@@ -1,22 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import Evaluation, Resume
-from app.schemas import EvaluationCreate, EvaluationResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Set, Tuple
+import csv
+import io
+import json
+import os
+from app.cache import evaluations_tag, json_response, response_cache
+from app.database import get_db, row_exists
+from app.http_cache import conditional
+from app.models import Evaluation, Resume, ResumeRating
+from app.ratings import rating_summary, record_rating, record_ratings
+from app.schemas import (
+    EvaluationBulkError,
+    EvaluationBulkResult,
+    EvaluationCreate,
+    EvaluationResponse,
+    RatingSummary
+)
+from dotenv import load_dotenv
+
+load_dotenv()
 
 router = APIRouter()
 
+# Bulk imports are validated and inserted this many rows at a time
+EVALUATION_BULK_CHUNK_SIZE = int(os.getenv("EVALUATION_BULK_CHUNK_SIZE", "1000"))
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+EvaluationList = TypeAdapter(List[EvaluationResponse])
+EXPORT_COLUMNS = ["id", "resume_id", "rating", "comment", "evaluator_name", "created_at"]
+
 
 @router.post("/", response_model=EvaluationResponse, status_code=201)
 async def create_evaluation(
     evaluation: EvaluationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new evaluation for a resume."""
-    # Check if resume exists
-    resume = db.query(Resume).filter(Resume.id == evaluation.resume_id).first()
-    if not resume:
+    if not await row_exists(db, Resume.id, evaluation.resume_id):
         raise HTTPException(status_code=404, detail="Resume not found")
 
     db_evaluation = Evaluation(
@@ -26,38 +50,234 @@ async def create_evaluation(
         evaluator_name=evaluation.evaluator_name
     )
     db.add(db_evaluation)
-    db.commit()
-    db.refresh(db_evaluation)
+    # Aggregates change in the same transaction as the evaluation itself
+    await record_rating(db, evaluation.resume_id, evaluation.rating)
+    await db.commit()
+    await db.refresh(db_evaluation)
+    await response_cache.invalidate(evaluations_tag(evaluation.resume_id))
 
     return db_evaluation
 
 
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _ndjson_rows(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Yield (line number, decoded value) per non-blank line as the body streams in."""
+    buffer = b""
+    line_number = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def _json_rows(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of evaluations")
+    for index, row in enumerate(rows, start=1):
+        yield index, row
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, EvaluationCreate]],
+    errors: List[EvaluationBulkError],
+    touched: Set[int]
+) -> int:
+    """Insert the rows of one chunk whose resume exists; report the rest."""
+    resume_ids = {evaluation.resume_id for _, evaluation in chunk}
+    existing = set((await db.execute(select(Resume.id).where(Resume.id.in_(resume_ids)))).scalars())
+    valid = []
+    for row, evaluation in chunk:
+        if evaluation.resume_id in existing:
+            valid.append(evaluation)
+        else:
+            errors.append(EvaluationBulkError(row=row, error=f"Resume {evaluation.resume_id} not found"))
+    if valid:
+        # A single executemany; insertmanyvalues batches it into multi-row INSERTs
+        await db.execute(insert(Evaluation), [evaluation.model_dump() for evaluation in valid])
+        await record_ratings(db, [(evaluation.resume_id, evaluation.rating) for evaluation in valid])
+        touched.update(evaluation.resume_id for evaluation in valid)
+    return len(valid)
+
+
+@router.post("/bulk", response_model=EvaluationBulkResult)
+async def bulk_create_evaluations(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Import many evaluations from a JSON array or an NDJSON stream.
+
+    Valid rows are stored in one transaction; invalid ones are skipped and
+    reported by position.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    ndjson = content_type in NDJSON_TYPES
+    rows = _ndjson_rows(request) if ndjson else _json_rows(request)
+
+    inserted = 0
+    touched: Set[int] = set()
+    errors: List[EvaluationBulkError] = []
+    chunk: List[Tuple[int, EvaluationCreate]] = []
+    try:
+        async for row, value in rows:
+            try:
+                evaluation = (
+                    EvaluationCreate.model_validate_json(value) if ndjson
+                    else EvaluationCreate.model_validate(value)
+                )
+            except ValidationError as e:
+                errors.append(EvaluationBulkError(row=row, error=_validation_message(e)))
+                continue
+            chunk.append((row, evaluation))
+            if len(chunk) >= EVALUATION_BULK_CHUNK_SIZE:
+                inserted += await _insert_chunk(db, chunk, errors, touched)
+                chunk = []
+        if chunk:
+            inserted += await _insert_chunk(db, chunk, errors, touched)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A resume was deleted during the import; nothing was stored")
+    await response_cache.invalidate(*(evaluations_tag(resume_id) for resume_id in touched))
+
+    errors.sort(key=lambda error: error.row)
+    return EvaluationBulkResult(inserted=inserted, errors=errors)
+
+
+@router.get("/export")
+async def export_evaluations(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    resume_id: Optional[int] = Query(None, description="Only export evaluations of this resume"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream evaluations as NDJSON or CSV, in id order."""
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+
+    stmt = select(*(Evaluation.__table__.c[name] for name in EXPORT_COLUMNS)).order_by(Evaluation.id)
+    if resume_id is not None:
+        stmt = stmt.where(Evaluation.resume_id == resume_id)
+    # Rows are fetched from a server-side cursor, never all at once
+    stmt = stmt.execution_options(yield_per=EVALUATION_BULK_CHUNK_SIZE)
+
+    async def ndjson_lines():
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield "".join(
+                json.dumps({
+                    **row._asdict(),
+                    "created_at": row.created_at.isoformat() if row.created_at else None
+                }) + "\n"
+                for row in rows
+            )
+
+    async def csv_lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            writer.writerows(
+                (*row[:-1], row.created_at.isoformat() if row.created_at else "")
+                for row in rows
+            )
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+        if out.tell():
+            yield out.getvalue()
+
+    if format == "csv":
+        return StreamingResponse(
+            csv_lines(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="evaluations.csv"'}
+        )
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+async def load_rating(resume_id: int, db: AsyncSession = Depends(get_db)):
+    """``(resume_id, rating)``, rating None if unrated; None if there is no such resume.
+
+    A single query, shared by the ETag check and the handler.
+    """
+    return (await db.execute(
+        select(Resume.id, ResumeRating).outerjoin(
+            ResumeRating, ResumeRating.resume_id == Resume.id
+        ).where(Resume.id == resume_id)
+    )).first()
+
+
+async def rating_version(loaded=Depends(load_rating)):
+    if loaded is None:
+        return None
+    rating = loaded.ResumeRating
+    return [rating.count, rating.updated_at] if rating else [0]
+
+
 @router.get("/resume/{resume_id}", response_model=List[EvaluationResponse])
 async def get_resume_evaluations(
     resume_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all evaluations for a specific resume."""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
+    key = (evaluations_tag(resume_id),)
+    body = response_cache.get(key)
+    if body is None:
+        version = response_cache.version(key[0])
+        # Joined from the resume: a missing resume gives no rows, an unrated
+        # one a single NULL row, so no separate existence check is needed
+        result = await db.execute(
+            select(Resume.id, Evaluation).outerjoin(
+                Evaluation, Evaluation.resume_id == Resume.id
+            ).where(Resume.id == resume_id).order_by(Evaluation.created_at.desc())
+        )
+        rows = result.all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        evaluations = [row.Evaluation for row in rows if row.Evaluation is not None]
+        body = EvaluationList.dump_json(EvaluationList.validate_python(evaluations, from_attributes=True))
+        response_cache.set(key, body, len(body), version)
+    return json_response(body)
 
-    evaluations = db.query(Evaluation).filter(
-        Evaluation.resume_id == resume_id
-    ).order_by(Evaluation.created_at.desc()).all()
 
-    return evaluations
+@router.get(
+    "/resume/{resume_id}/summary",
+    response_model=RatingSummary,
+    dependencies=[conditional(rating_version)]
+)
+async def get_resume_rating_summary(
+    resume_id: int,
+    loaded=Depends(load_rating)
+):
+    """Get rating aggregates (count, sum, mean, min, max, histogram) for a resume."""
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return rating_summary(resume_id, loaded.ResumeRating)
 
 
 @router.get("/{evaluation_id}", response_model=EvaluationResponse)
 async def get_evaluation(
     evaluation_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific evaluation by ID."""
-    evaluation = db.query(Evaluation).filter(
-        Evaluation.id == evaluation_id
-    ).first()
+    evaluation = await db.get(Evaluation, evaluation_id)
     if not evaluation:
         raise HTTPException(status_code=404, detail="Evaluation not found")
     return evaluation
@@ -1,48 +1,209 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy import delete, select, tuple_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, contains_eager, defer, joinedload, selectinload
+from email.utils import formatdate
+from typing import Optional
+from urllib.parse import quote
+import asyncio
 import os
-import aiofiles
-from PyPDF2 import PdfReader
+import uuid
+from app.cache import response_cache, resume_tag, evaluations_tag, chat_tag, json_response
 from app.database import get_db
-from app.models import Resume
-from app.schemas import ResumeResponse, ResumeListResponse
+from app.extraction import extract_document, ExtractedText, ExtractionQueueFull
+from app.fulltext import search_resumes, SearchHit
+from app.http_cache import CACHE_CONTROL, is_not_modified, make_etag
+from app.ingestion import ingestion_worker, supersede_jobs
+from app.metrics import UPLOAD_SIZE
+from app.models import ChatMessage, Evaluation, IngestionJob, Resume, ResumePage, ResumeRating
+from app.pages import PageOutOfRange, RESUME_PAGES_MAX_RANGE, clear_pages, get_pages, store_pages
+from app.pagination import CachedCount, InvalidCursor, encode_cursor, decode_cursor
+from app.ratings import rating_summary
+from app.routers.chat import CHAT_HISTORY_LIMIT, CHAT_HISTORY_MAX_LIMIT
+from app import search as memory_search
+from app.schemas import (
+    ResumeResponse,
+    ResumeSummary,
+    RatedResumeResponse,
+    RatedResumeSummary,
+    ResumeListResponse,
+    ResumePageResponse,
+    ResumePagesResponse,
+    ResumeSearchHit,
+    ResumeSearchResponse,
+    ResumeDossier,
+    IngestionJobResponse
+)
+from app.storage import save_blob, StoredFile, UploadTooLarge
 from dotenv import load_dotenv
 
 load_dotenv()
 
 router = APIRouter()
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+# Internal nginx location that serves UPLOAD_DIR (e.g. /protected-uploads/).
+# When set, proxied downloads are handed to nginx with X-Accel-Redirect.
+FILE_ACCEL_REDIRECT_PREFIX = os.getenv("FILE_ACCEL_REDIRECT_PREFIX", "")
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+resume_count = CachedCount(Resume)
 
-async def extract_text_from_file(file_path: str, file_type: str) -> str:
-    """Extract text content from PDF or TXT file."""
+FILE_MEDIA_TYPES = {"pdf": "application/pdf", "txt": "text/plain; charset=utf-8"}
+
+# Data left out of the list view unless requested with ?fields=
+OPTIONAL_FIELDS = {"content", "rating"}
+SORT_ORDERS = {"created_at", "rating"}
+
+
+def parse_fields(fields: Optional[str]) -> set:
+    requested = {f.strip() for f in fields.split(",") if f.strip()} if fields else set()
+    unknown = requested - OPTIONAL_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return requested
+
+
+async def extract_text_from_file(file_path: str, file_type: str) -> Optional[ExtractedText]:
+    """Extract text content from PDF or TXT file, or None if extraction failed.
+
+    PDFs are parsed in the extraction process pool; a full pool surfaces as
+    503 so clients can retry instead of piling more work onto the server.
+    """
     try:
-        if file_type.lower() == "pdf":
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        elif file_type.lower() == "txt":
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                return await f.read()
-        else:
-            return ""
+        return await extract_document(file_path, file_type)
+    except ExtractionQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many files are being processed, please retry later",
+            headers={"Retry-After": "5"}
+        )
+    except asyncio.TimeoutError:
+        print(f"Text extraction timed out: {file_path}")
+        return None
     except Exception as e:
         print(f"Error extracting text: {e}")
-        return ""
+        return None
+
+
+async def store_upload(file: UploadFile) -> StoredFile:
+    """Stream an uploaded file into the blob store, enforcing the size limit."""
+    try:
+        stored = await save_blob(file, UPLOAD_DIR)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    UPLOAD_SIZE.observe(stored.size)
+    return stored
+
+
+async def find_extracted_content(db: AsyncSession, content_hash: str, file_type: str) -> Optional[ExtractedText]:
+    """Return text already extracted from identical bytes, if any.
+
+    Only the joined content is reused; the pages of the copy are extracted
+    on demand by GET /resumes/{id}/pages.
+    """
+    result = await db.execute(
+        select(Resume.content).where(
+            Resume.content_hash == content_hash,
+            Resume.file_type == file_type,
+            Resume.extraction_status == "completed"
+        ).limit(1)
+    )
+    content = result.scalars().first()
+    return ExtractedText(content) if content is not None else None
+
+
+def set_content(resume: Resume, extracted: Optional[ExtractedText]):
+    resume.content = extracted.content if extracted is not None else ""
+    resume.extraction_status = "completed" if extracted is not None else "failed"
+
+
+async def set_pages(db: AsyncSession, resume: Resume, extracted: Optional[ExtractedText]):
+    """Store the pages of a full extraction, or drop those of a replaced file."""
+    if extracted is not None and extracted.pages:
+        await store_pages(db, resume.id, extracted.pages)
+    else:
+        await clear_pages(db, resume.id)
+
+
+async def release_file(db: AsyncSession, file_path: str, resume_id: Optional[int] = None):
+    """Delete a stored file unless another resume still references it.
+
+    An upload of the same bytes may be committing its row meanwhile, so
+    the file is moved aside before checking again: either that check sees
+    the new row and the file goes back, or the upload finds the file gone
+    once it has committed and writes it again (``keep_file``).
+    """
+    query = select(Resume.id).where(Resume.file_path == file_path)
+    if resume_id is not None:
+        query = query.where(Resume.id != resume_id)
+
+    async def referenced() -> bool:
+        return (await db.execute(query.limit(1))).first() is not None
+
+    if await referenced():
+        return
+    aside = f"{file_path}.{uuid.uuid4().hex}.deleting"
+    try:
+        os.replace(file_path, aside)
+    except FileNotFoundError:
+        return
+    if await referenced():
+        os.replace(aside, file_path)
+    else:
+        os.remove(aside)
+
+
+async def keep_file(file: UploadFile, stored: StoredFile):
+    """Write a blob again if a concurrent delete removed it before our row committed."""
+    if not os.path.exists(stored.path):
+        await file.seek(0)
+        await save_blob(file, UPLOAD_DIR)
 
 
-@router.post("/", response_model=ResumeResponse, status_code=201)
+async def queue_ingestion(db: AsyncSession, resume: Resume) -> JSONResponse:
+    """Mark a resume as pending and hand its extraction to the worker."""
+    resume.content = None
+    resume.extraction_status = "pending"
+    db.add(resume)
+    await db.flush()
+    job = IngestionJob(resume_id=resume.id)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    ingestion_worker.enqueue(job.id)
+    memory_search.index_resume(resume)
+    await response_cache.invalidate(resume_tag(resume.id))
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(IngestionJobResponse.model_validate(job))
+    )
+
+
+@router.post(
+    "/",
+    response_model=ResumeResponse,
+    status_code=201,
+    responses={202: {"model": IngestionJobResponse}}
+)
 async def create_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Upload a new resume file (PDF or TXT)."""
+    """Upload a new resume file (PDF or TXT).
+
+    With ``background=true`` the file is stored and 202 is returned with an
+    ingestion job; text extraction then happens in the background. Files
+    whose bytes were uploaded before reuse the stored text and skip
+    extraction entirely.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is required")
 
@@ -55,114 +216,479 @@ async def create_resume(
         )
 
     # Save file
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    async with aiofiles.open(file_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+    stored = await store_upload(file)
 
-    # Extract text content
-    content = await extract_text_from_file(file_path, file_extension)
-
-    # Create database record
     db_resume = Resume(
         filename=file.filename,
         original_filename=file.filename,
         file_type=file_extension,
-        file_path=file_path,
-        content=content
+        file_path=stored.path,
+        content_hash=stored.sha256
     )
+
+    # Extract text content
+    extracted = await find_extracted_content(db, stored.sha256, file_extension)
+    if extracted is None:
+        if background:
+            response = await queue_ingestion(db, db_resume)
+            resume_count.adjust(1)
+            await keep_file(file, stored)
+            return response
+        try:
+            extracted = await extract_text_from_file(stored.path, file_extension)
+        except HTTPException:
+            await release_file(db, stored.path)
+            raise
+    set_content(db_resume, extracted)
+
+    # Create database record
     db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
+    if extracted is not None and extracted.pages:
+        await db.flush()
+        await store_pages(db, db_resume.id, extracted.pages)
+    await db.commit()
+    await db.refresh(db_resume)
+    resume_count.adjust(1)
+    await keep_file(file, stored)
+    memory_search.index_resume(db_resume)
 
     return db_resume
 
 
+def list_item_schema(requested: set):
+    if "rating" in requested:
+        return RatedResumeResponse if "content" in requested else RatedResumeSummary
+    return ResumeResponse if "content" in requested else ResumeSummary
+
+
 @router.get("/", response_model=ResumeListResponse)
 async def list_resumes(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    db: AsyncSession = Depends(get_db)
+):
+    """Get list of all resumes, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page with a keyset query on (created_at, id), which costs the same at
+    any depth. ``skip`` is kept for existing clients. ``total`` comes from
+    a short-lived cached count and is skipped with ``include_total=false``.
+
+    Items are summaries without the extracted ``content``; request it with
+    ``fields=content``, and the rating aggregates with ``fields=rating``.
+    ``sort=rating`` orders by average rating, unrated resumes last, using
+    the precomputed aggregates; it pages with ``skip`` only.
+    """
+    requested = parse_fields(fields)
+    if sort not in SORT_ORDERS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+    if sort == "rating" and cursor:
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort=created_at")
+
+    query = select(Resume)
+    if "content" not in requested:
+        query = query.options(defer(Resume.content, raiseload=True))
+    if sort == "rating" or "rating" in requested:
+        query = query.outerjoin(ResumeRating, ResumeRating.resume_id == Resume.id)
+    if "rating" in requested:
+        query = query.options(contains_eager(Resume.rating))
+    if sort == "rating":
+        query = query.order_by(ResumeRating.average.desc().nulls_last(), Resume.id.desc())
+    else:
+        query = query.order_by(Resume.created_at.desc(), Resume.id.desc())
+
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(
+            tuple_(Resume.created_at, Resume.id)
+            < tuple_(literal(created_at, Resume.created_at.type), last_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+    resumes = (await db.execute(query.limit(limit))).scalars().all()
+
+    next_cursor = None
+    if sort == "created_at" and resumes and len(resumes) == limit:
+        next_cursor = encode_cursor(resumes[-1].created_at, resumes[-1].id)
+    total = await resume_count.get(db) if include_total else None
+    item_schema = list_item_schema(requested)
+    return ResumeListResponse(
+        resumes=[item_schema.model_validate(r) for r in resumes],
+        total=total,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/search", response_model=ResumeSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    engine: str = Query("database", pattern="^(database|memory)$"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get list of all resumes."""
-    resumes = db.query(Resume).offset(skip).limit(limit).all()
-    total = db.query(Resume).count()
-    return ResumeListResponse(resumes=resumes, total=total)
+    """Full-text search over resume filenames and content, best match first.
+
+    ``engine=memory`` ranks with the in-process index instead of the
+    database (when SEARCH_INDEX_ENABLED is set); its hits have no snippet.
+    """
+    if engine == "memory":
+        if not memory_search.service.SEARCH_INDEX_ENABLED:
+            raise HTTPException(status_code=400, detail="In-memory search index is disabled")
+        hits = [
+            SearchHit(resume_id, rank, None)
+            for resume_id, rank in memory_search.search_index(q, limit + 1, skip)
+        ]
+    else:
+        hits = await search_resumes(db, q, limit + 1, skip)
+    next_skip = skip + limit if len(hits) > limit else None
+    hits = hits[:limit]
+
+    resumes = {}
+    if hits:
+        result = await db.execute(
+            select(Resume)
+            .options(defer(Resume.content, raiseload=True))
+            .where(Resume.id.in_([hit.resume_id for hit in hits]))
+        )
+        resumes = {resume.id: resume for resume in result.scalars()}
+
+    return ResumeSearchResponse(
+        results=[
+            ResumeSearchHit(
+                resume=ResumeSummary.model_validate(resumes[hit.resume_id]),
+                rank=hit.rank,
+                snippet=hit.snippet
+            )
+            for hit in hits if hit.resume_id in resumes
+        ],
+        next_skip=next_skip
+    )
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific resume by ID."""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    key = (resume_tag(resume_id),)
+    body = response_cache.get(key)
+    if body is None:
+        version = response_cache.version(key[0])
+        resume = await db.get(Resume, resume_id)
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        body = ResumeResponse.model_validate(resume).model_dump_json().encode()
+        response_cache.set(key, body, len(body), version)
+    return json_response(body)
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"inline; filename*=utf-8''{quoted}"
+    return f'inline; filename="{filename}"'
+
+
+def accel_redirect_location(file_path: str) -> Optional[str]:
+    """Internal nginx URI of a stored file, or None if it lies outside UPLOAD_DIR."""
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(UPLOAD_DIR))
+    if relative.startswith(os.pardir):
+        return None
+    return FILE_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative.replace(os.sep, "/"))
+
+
+@router.get(
+    "/{resume_id}/file",
+    response_class=FileResponse,
+    responses={206: {"description": "Partial content"}, 304: {"description": "Not modified"}}
+)
+async def download_resume_file(
+    resume_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Download the original uploaded file, shown inline by browsers.
+
+    The file is streamed from disk in chunks (never read into memory) and
+    supports ``Range``/``If-Range``, ``If-None-Match`` and
+    ``If-Modified-Since``. Behind the bundled nginx, with
+    FILE_ACCEL_REDIRECT_PREFIX set, only headers are returned and nginx
+    sends the file itself with sendfile.
+    """
+    row = (await db.execute(
+        select(Resume.file_path, Resume.file_type, Resume.original_filename, Resume.content_hash)
+        .where(Resume.id == resume_id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    try:
+        stat_result = await asyncio.to_thread(os.stat, row.file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Blobs are content-addressed, so their hash is an exact strong validator
+    etag = f'"{row.content_hash}"' if row.content_hash else make_etag(
+        stat_result.st_mtime, stat_result.st_size
+    )
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    media_type = FILE_MEDIA_TYPES.get(row.file_type, "application/octet-stream")
+    # nginx announces that it can serve internal redirects (see frontend/nginx.conf)
+    if FILE_ACCEL_REDIRECT_PREFIX and request.headers.get("x-sendfile-type", "").lower() == "x-accel-redirect":
+        location = accel_redirect_location(row.file_path)
+        if location:
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": location,
+                    "Content-Disposition": content_disposition(row.original_filename),
+                    "Cache-Control": CACHE_CONTROL,
+                }
+            )
+
+    return FileResponse(
+        row.file_path,
+        media_type=media_type,
+        headers=headers,
+        filename=row.original_filename,
+        content_disposition_type="inline",
+        stat_result=stat_result
+    )
+
+
+@router.get("/{resume_id}/pages", response_model=ResumePagesResponse)
+async def get_resume_pages(
+    resume_id: int,
+    first: int = Query(1, alias="from", ge=1),
+    last: Optional[int] = Query(None, alias="to", ge=1),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the text of a range of pages (``from``..``to``, 1-based, inclusive).
+
+    ``to`` defaults to ``from`` and is clamped to the page count. Pages that
+    have not been extracted yet are parsed on demand (only the requested
+    ones) and stored, so a first-page preview stays cheap however long the
+    document is. TXT files are a single page.
+    """
+    if last is None:
+        last = first
+    if last < first:
+        raise HTTPException(status_code=400, detail="'to' must not be less than 'from'")
+    if last - first + 1 > RESUME_PAGES_MAX_RANGE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {RESUME_PAGES_MAX_RANGE} pages can be requested at once"
+        )
+
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    try:
+        page_count, pages = await get_pages(db, resume, first, last)
+    except PageOutOfRange as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExtractionQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many files are being processed, please retry later",
+            headers={"Retry-After": "5"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Page extraction timed out")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except Exception as e:
+        print(f"Error extracting pages: {e}")
+        raise HTTPException(status_code=422, detail="Could not extract text from the file")
+
+    return ResumePagesResponse(
+        resume_id=resume_id,
+        page_count=page_count,
+        pages=[ResumePageResponse(page_number=number, text=text) for number, text in pages]
+    )
+
+
+@router.get("/{resume_id}/dossier", response_model=ResumeDossier)
+async def get_resume_dossier(
+    resume_id: int,
+    messages: int = Query(CHAT_HISTORY_LIMIT, ge=0, le=CHAT_HISTORY_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a resume with its rating summary, evaluations and latest chat messages.
+
+    Replaces the three requests the resume page used to make. Only the
+    latest ``messages`` chat messages are loaded; ``has_more_messages``
+    tells whether older ones exist.
+    """
+    # Cached under the resume's tag; the evaluations and chat versions in
+    # the key retire the entry when either of those is invalidated
+    key = (
+        resume_tag(resume_id),
+        "dossier",
+        messages,
+        response_cache.version(evaluations_tag(resume_id)),
+        response_cache.version(chat_tag(resume_id)),
+    )
+    body = response_cache.get(key)
+    if body is not None:
+        return json_response(body)
+    version = response_cache.version(key[0])
+
+    # The chat collection is limited to the newest messages by a subquery,
+    # so a long thread costs no more than one page of it
+    recent = aliased(ChatMessage)
+    latest_ids = (
+        select(recent.id)
+        .where(recent.resume_id == resume_id)
+        .order_by(recent.created_at.desc(), recent.id.desc())
+        .limit(messages + 1)
+    )
+    resume = (await db.execute(
+        select(Resume)
+        .where(Resume.id == resume_id)
+        .options(
+            joinedload(Resume.rating),
+            selectinload(Resume.evaluations),
+            selectinload(Resume.chat_messages.and_(ChatMessage.id.in_(latest_ids))),
+        )
+    )).scalar_one_or_none()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
-    return resume
+
+    chat_messages = sorted(resume.chat_messages, key=lambda m: (m.created_at, m.id))
+    body = ResumeDossier(
+        resume=ResumeResponse.model_validate(resume),
+        rating=rating_summary(resume_id, resume.rating),
+        evaluations=sorted(resume.evaluations, key=lambda e: (e.created_at, e.id), reverse=True),
+        chat_messages=chat_messages[-messages:] if messages else [],
+        has_more_messages=len(chat_messages) > messages
+    ).model_dump_json().encode()
+    response_cache.set(key, body, len(body), version)
+    return json_response(body)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the status of a background ingestion job."""
+    job = await db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
-@router.put("/{resume_id}", response_model=ResumeResponse)
+@router.put(
+    "/{resume_id}",
+    response_model=ResumeResponse,
+    responses={202: {"model": IngestionJobResponse}}
+)
 async def update_resume(
     resume_id: int,
     file: UploadFile = File(None),
-    db: Session = Depends(get_db)
+    background: bool = False,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update a resume (replace file)."""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    """Update a resume (replace file).
+
+    ``background=true`` defers text extraction as in ``create_resume``.
+    """
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    if file:
-        # Validate file type
-        file_extension = file.filename.split(".")[-1].lower()
-        if file_extension not in ["pdf", "txt"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF and TXT files are allowed"
-            )
+    if not file:
+        return resume
 
-        # Delete old file
-        if os.path.exists(resume.file_path):
-            os.remove(resume.file_path)
+    # Validate file type
+    file_extension = file.filename.split(".")[-1].lower()
+    if file_extension not in ["pdf", "txt"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF and TXT files are allowed"
+        )
 
-        # Save new file
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        async with aiofiles.open(file_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
+    # Save new file
+    stored = await store_upload(file)
+    old_file_path = resume.file_path
 
-        # Extract text content
-        content = await extract_text_from_file(file_path, file_extension)
+    # Extract text content
+    extracted = await find_extracted_content(db, stored.sha256, file_extension)
+    if extracted is None and not background:
+        try:
+            extracted = await extract_text_from_file(stored.path, file_extension)
+        except HTTPException:
+            if stored.path != old_file_path:
+                await release_file(db, stored.path, resume.id)
+            raise
 
-        # Update database record
-        resume.filename = file.filename
-        resume.original_filename = file.filename
-        resume.file_type = file_extension
-        resume.file_path = file_path
-        resume.content = content
+    # Update database record
+    resume.filename = file.filename
+    resume.original_filename = file.filename
+    resume.file_type = file_extension
+    resume.file_path = stored.path
+    resume.content_hash = stored.sha256
+    await supersede_jobs(db, resume.id)
+    await set_pages(db, resume, extracted)
+    if extracted is None and background:
+        response = await queue_ingestion(db, resume)
+    else:
+        set_content(resume, extracted)
+        await db.commit()
+        await db.refresh(resume)
+        memory_search.index_resume(resume)
+        await response_cache.invalidate(resume_tag(resume.id))
+        response = resume
+    await keep_file(file, stored)
 
-    db.commit()
-    db.refresh(resume)
-    return resume
+    # Delete the old file once nothing points at it any more
+    if stored.path != old_file_path:
+        await release_file(db, old_file_path, resume.id)
+    return response
 
 
 @router.delete("/{resume_id}", status_code=204)
 async def delete_resume(
     resume_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a resume and its file."""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Delete file
-    if os.path.exists(resume.file_path):
-        os.remove(resume.file_path)
+    # One indexed DELETE per child table, instead of the ORM cascade
+    # loading every message and evaluation and deleting them row by row
+    file_path = resume.file_path
+    for child in (ChatMessage, Evaluation, IngestionJob, ResumePage, ResumeRating):
+        await db.execute(
+            delete(child).where(child.resume_id == resume_id).execution_options(synchronize_session=False)
+        )
+    await db.execute(delete(Resume).where(Resume.id == resume_id).execution_options(synchronize_session=False))
+    await db.commit()
+    resume_count.adjust(-1)
+    memory_search.unindex_resume(resume_id)
+    await response_cache.invalidate(
+        resume_tag(resume_id), evaluations_tag(resume_id), chat_tag(resume_id)
+    )
 
-    # Delete database record (cascade will handle related records)
-    db.delete(resume)
-    db.commit()
+    # Delete file unless an identical upload still uses it
+    await release_file(db, file_path)
     return None
-
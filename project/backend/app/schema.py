@@ -0,0 +1,104 @@
+"""Schema migrations (Alembic, in ``migrations/``).
+
+The application never issues DDL at startup; run ``alembic upgrade head``
+(or ``upgrade()``) before starting it. Revision 0001 is the schema the
+old startup ``create_all`` built, and every revision skips what already
+exists, so databases made before the migrations (by ``create_all`` or
+the former ``init-db`` SQL scripts) are adopted by the same plain
+``alembic upgrade head``, with no ``stamp``.
+
+The helpers below are for the revisions. Offline runs (``--sql``)
+assume an empty database; they only work for PostgreSQL, since SQLite
+table copies need the live table.
+"""
+import os
+from typing import List, Optional
+from alembic import command, context, op
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Created by hand in the migrations and app/fulltext.py, not in the metadata
+UNMANAGED_TABLES = ("resumes_fts",)
+UNMANAGED_COLUMNS = {("resumes", "search_vector")}
+UNMANAGED_INDEXES = {"ix_resumes_search_vector"}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Keep full-text search objects out of autogenerate comparisons."""
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLES)
+    if type_ == "column":
+        return (obj.table.name, name) not in UNMANAGED_COLUMNS
+    if type_ == "index":
+        return name not in UNMANAGED_INDEXES
+    return True
+
+
+def _dialect() -> str:
+    return op.get_context().dialect.name
+
+
+def has_table(table: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return any(c["name"] == column for c in inspect(op.get_bind()).get_columns(table))
+
+
+def create_index_online(name: str, table: str, columns: List[str], **kw):
+    """Create an index unless it already exists, without blocking writes.
+
+    On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY, which
+    cannot run in a transaction; an interrupted build leaves an invalid
+    index behind, so one is dropped and rebuilt.
+    """
+    if _dialect() != "postgresql":
+        op.create_index(name, table, columns, if_not_exists=True, **kw)
+        return
+    valid = None
+    if not context.is_offline_mode():
+        valid = op.get_bind().execute(
+            text(
+                "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ),
+            {"name": name}
+        ).scalar()
+    if valid:
+        return
+    with op.get_context().autocommit_block():
+        if valid is not None:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(name, table, columns, postgresql_concurrently=True, **kw)
+
+
+def drop_index_online(name: str, table: str):
+    """Drop an index if it exists, with DROP INDEX CONCURRENTLY on PostgreSQL."""
+    if _dialect() != "postgresql":
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    config = Config(ALEMBIC_INI)
+    if database_url:
+        # The ini parser would read percent-encoded characters as interpolation
+        config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+
+def upgrade(database_url: Optional[str] = None, revision: str = "head"):
+    """Migrate the database (DATABASE_URL by default) to ``revision``.
+
+    Runs its own event loop, so call it outside of one.
+    """
+    command.upgrade(alembic_config(database_url), revision)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union, Dict
 
 
 class ResumeBase(BaseModel):
@@ -17,6 +17,8 @@ class ResumeCreate(ResumeBase):
 class ResumeResponse(ResumeBase):
     id: int
     file_path: str
+    content_hash: Optional[str] = None
+    extraction_status: str
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -24,9 +26,84 @@ class ResumeResponse(ResumeBase):
         from_attributes = True
 
 
+class ResumeSummary(BaseModel):
+    """List view of a resume, without the heavy extracted text."""
+    id: int
+    filename: str
+    original_filename: str
+    file_type: str
+    file_path: str
+    content_hash: Optional[str] = None
+    extraction_status: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RatingSummary(BaseModel):
+    resume_id: int
+    count: int
+    total: float
+    average: Optional[float] = None
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+    # Number of ratings per star (1-5), each rounded to the nearest star
+    histogram: Dict[int, int]
+
+    class Config:
+        from_attributes = True
+
+
+class RatedResumeSummary(ResumeSummary):
+    rating: Optional[RatingSummary] = None
+
+
+class RatedResumeResponse(ResumeResponse):
+    rating: Optional[RatingSummary] = None
+
+
 class ResumeListResponse(BaseModel):
-    resumes: List[ResumeResponse]
-    total: int
+    # Full items with ?fields=content, rating aggregates with ?fields=rating
+    resumes: List[Union[ResumeSummary, ResumeResponse, RatedResumeSummary, RatedResumeResponse]]
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class ResumeSearchHit(BaseModel):
+    resume: ResumeSummary
+    rank: float
+    # Matching fragments of the content, with terms wrapped in <mark>
+    snippet: Optional[str] = None
+
+
+class ResumeSearchResponse(BaseModel):
+    results: List[ResumeSearchHit]
+    next_skip: Optional[int] = None
+
+
+class ResumePageResponse(BaseModel):
+    page_number: int
+    text: str
+
+
+class ResumePagesResponse(BaseModel):
+    resume_id: int
+    page_count: int
+    pages: List[ResumePageResponse]
+
+
+class IngestionJobResponse(BaseModel):
+    id: int
+    resume_id: int
+    status: str
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 
 class EvaluationBase(BaseModel):
@@ -48,6 +125,16 @@ class EvaluationResponse(EvaluationBase):
         from_attributes = True
 
 
+class EvaluationBulkError(BaseModel):
+    row: int  # 1-based position in the array, or line number in NDJSON
+    error: str
+
+
+class EvaluationBulkResult(BaseModel):
+    inserted: int
+    errors: List[EvaluationBulkError]
+
+
 class ChatMessageBase(BaseModel):
     message: str
     username: str
@@ -65,3 +152,13 @@ class ChatMessageResponse(ChatMessageBase):
     class Config:
         from_attributes = True
 
+
+class ResumeDossier(BaseModel):
+    """Everything the resume page shows, in one response."""
+    resume: ResumeResponse
+    rating: RatingSummary
+    # Newest first, as GET /api/evaluations/resume/{id}
+    evaluations: List[EvaluationResponse]
+    # The latest messages, oldest first; older pages via GET /api/chat/resume/{id}?before_id=
+    chat_messages: List[ChatMessageResponse]
+    has_more_messages: bool
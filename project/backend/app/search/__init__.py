@@ -0,0 +1,26 @@
+"""In-process BM25 index over resume text.
+
+An alternative to the database full-text search in ``app.fulltext`` for
+single-process deployments: queries never leave the process, and the
+index is snapshotted to disk on shutdown so restarts only replay recent
+changes. Disabled unless SEARCH_INDEX_ENABLED is set.
+"""
+from app.search.index import InvertedIndex
+from app.search.tokenizer import tokenize
+from app.search.service import (
+    index_resume,
+    save_snapshot,
+    search_index,
+    unindex_resume,
+    warm_start,
+)
+
+__all__ = [
+    "InvertedIndex",
+    "tokenize",
+    "index_resume",
+    "save_snapshot",
+    "search_index",
+    "unindex_resume",
+    "warm_start",
+]
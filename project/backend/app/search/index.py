@@ -0,0 +1,258 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from app.search.tokenizer import tokenize
+
+# Snapshot layout: header, JSON metadata, then the raw arrays, each section
+# aligned to 8 bytes so the postings can be used straight from the mmap.
+_MAGIC = b"RSIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")  # magic, version, metadata length
+
+# Postings are arrays once built or modified, and read-only memoryviews
+# into the snapshot file right after a load.
+Postings = Union[array, memoryview]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class InvertedIndex:
+    """BM25 inverted index over resume text, stored in compact arrays.
+
+    Documents get internal numbers in insertion order. Each term owns two
+    parallel ``array('I')`` postings lists: document numbers (ascending)
+    and term frequencies. Removing or re-adding a resume tombstones its old
+    number; postings are compacted once tombstones make up COMPACT_RATIO
+    of all numbers. Document frequencies include tombstoned postings until
+    then, which only nudges idf slightly.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    COMPACT_RATIO = 0.25
+    NORM_DRIFT = 0.05
+
+    def __init__(self):
+        self._terms: Dict[str, int] = {}
+        self._docs: List[Postings] = []
+        self._freqs: List[Postings] = []
+        self._doc_ids = array("q")  # document number -> resume id
+        self._doc_lens = array("I")
+        self._live = bytearray()
+        self._docno_by_id: Dict[int, int] = {}
+        self._total_len = 0
+        self._norms: Optional[array] = None
+        self._norms_avgdl = 0.0
+        self._mmap: Optional[mmap.mmap] = None
+        self.saved_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._docno_by_id)
+
+    def __contains__(self, resume_id: int) -> bool:
+        return resume_id in self._docno_by_id
+
+    def ids(self) -> Iterator[int]:
+        return iter(list(self._docno_by_id))
+
+    def add(self, resume_id: int, text: str):
+        """Index a resume, replacing any previous version of it."""
+        self.remove(resume_id)
+        counts = Counter(tokenize(text))
+        length = sum(counts.values())
+
+        docno = len(self._doc_ids)
+        self._doc_ids.append(resume_id)
+        self._doc_lens.append(length)
+        self._live.append(1)
+        self._docno_by_id[resume_id] = docno
+        self._total_len += length
+        if self._norms is not None:
+            self._norms.append(self._norm(length, self._norms_avgdl))
+
+        for term, tf in counts.items():
+            term_id = self._terms.get(term)
+            if term_id is None:
+                term_id = self._terms[term] = len(self._docs)
+                self._docs.append(array("I"))
+                self._freqs.append(array("I"))
+            elif not isinstance(self._docs[term_id], array):
+                # First write to a term loaded from a snapshot: copy it out
+                self._docs[term_id] = self._to_array(self._docs[term_id])
+                self._freqs[term_id] = self._to_array(self._freqs[term_id])
+            self._docs[term_id].append(docno)
+            self._freqs[term_id].append(tf)
+
+    def remove(self, resume_id: int) -> bool:
+        docno = self._docno_by_id.pop(resume_id, None)
+        if docno is None:
+            return False
+        self._live[docno] = 0
+        self._total_len -= self._doc_lens[docno]
+        if len(self._doc_ids) - len(self._docno_by_id) > self.COMPACT_RATIO * len(self._doc_ids):
+            self.compact()
+        return True
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the survivors."""
+        remap = array("q", [-1]) * len(self._doc_ids)
+        doc_ids, doc_lens = array("q"), array("I")
+        for old, resume_id in enumerate(self._doc_ids):
+            if self._live[old]:
+                remap[old] = len(doc_ids)
+                doc_ids.append(resume_id)
+                doc_lens.append(self._doc_lens[old])
+
+        terms, all_docs, all_freqs = {}, [], []
+        for term, term_id in self._terms.items():
+            docs, freqs = array("I"), array("I")
+            for docno, tf in zip(self._docs[term_id], self._freqs[term_id]):
+                new = remap[docno]
+                if new >= 0:
+                    docs.append(new)
+                    freqs.append(tf)
+            if docs:
+                terms[term] = len(all_docs)
+                all_docs.append(docs)
+                all_freqs.append(freqs)
+
+        self._terms, self._docs, self._freqs = terms, all_docs, all_freqs
+        self._doc_ids, self._doc_lens = doc_ids, doc_lens
+        self._live = bytearray(b"\x01") * len(doc_ids)
+        self._docno_by_id = {resume_id: docno for docno, resume_id in enumerate(doc_ids)}
+        self._norms = None
+        # Nothing points into the snapshot any more
+        self._mmap = None
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Tuple[int, float]]:
+        """Return ``(resume_id, score)`` pairs for the best BM25 matches."""
+        n = len(self._docno_by_id)
+        if n == 0:
+            return []
+        norms = self._length_norms()
+        has_tombstones = n != len(self._doc_ids)
+        live = self._live
+
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term in set(tokenize(query)):
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            docs, freqs = self._docs[term_id], self._freqs[term_id]
+            df = min(len(docs), n)
+            weight = math.log(1 + (n - df + 0.5) / (df + 0.5)) * (self.k1 + 1)
+            for docno, tf in zip(docs, freqs):
+                if has_tombstones and not live[docno]:
+                    continue
+                scores[docno] = get(docno, 0.0) + weight * tf / (tf + norms[docno])
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))[offset:]
+        return [(self._doc_ids[docno], score) for docno, score in top]
+
+    def _norm(self, length: int, avgdl: float) -> float:
+        return self.k1 * (1 - self.b + self.b * length / avgdl)
+
+    def _length_norms(self) -> array:
+        """Per-document BM25 length normalisation, ``k1 * (1 - b + b * len / avgdl)``.
+
+        Recomputing this for every document after each write would dominate
+        query time, so it is cached and rebuilt only once the average
+        document length has drifted by more than NORM_DRIFT.
+        """
+        avgdl = self._total_len / max(len(self._docno_by_id), 1) or 1
+        if self._norms is None or abs(avgdl - self._norms_avgdl) > self.NORM_DRIFT * self._norms_avgdl:
+            self._norms = array("d", (self._norm(length, avgdl) for length in self._doc_lens))
+            self._norms_avgdl = avgdl
+        return self._norms
+
+    def save(self, path: str):
+        """Write a snapshot that ``load`` can map back without parsing postings."""
+        if len(self._docno_by_id) != len(self._doc_ids):
+            self.compact()
+        meta = json.dumps({
+            "byteorder": sys.byteorder,
+            "doc_count": len(self._doc_ids),
+            "total_len": self._total_len,
+            "terms": [[term, len(self._docs[term_id])] for term, term_id in self._terms.items()],
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }).encode()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            def pad():
+                f.write(b"\0" * (_align(f.tell()) - f.tell()))
+
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(meta)))
+            f.write(meta)
+            pad()
+            self._doc_ids.tofile(f)
+            self._doc_lens.tofile(f)
+            f.write(self._live)
+            pad()
+            for term_id in self._terms.values():
+                f.write(self._docs[term_id])
+            for term_id in self._terms.values():
+                f.write(self._freqs[term_id])
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        """Map a snapshot into memory.
+
+        Document tables are copied, but postings stay as views into the
+        mapped file until a term is modified, so loading costs little more
+        than reading the vocabulary.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a search index snapshot: {path}")
+        meta = json.loads(mapped[_HEADER.size:_HEADER.size + meta_len])
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError("Snapshot was written on a machine with a different byte order")
+
+        index = cls()
+        view = memoryview(mapped)
+        n = meta["doc_count"]
+        offset = _align(_HEADER.size + meta_len)
+        index._doc_ids.frombytes(view[offset:offset + 8 * n])
+        offset += 8 * n
+        index._doc_lens.frombytes(view[offset:offset + 4 * n])
+        offset += 4 * n
+        index._live = bytearray(view[offset:offset + n])
+        offset = _align(offset + n)
+
+        total = sum(count for _, count in meta["terms"])
+        docs = view[offset:offset + 4 * total].cast("I")
+        freqs = view[offset + 4 * total:offset + 8 * total].cast("I")
+        position = 0
+        for term_id, (term, count) in enumerate(meta["terms"]):
+            index._terms[term] = term_id
+            index._docs.append(docs[position:position + count])
+            index._freqs.append(freqs[position:position + count])
+            position += count
+
+        index._docno_by_id = {resume_id: docno for docno, resume_id in enumerate(index._doc_ids)}
+        index._total_len = meta["total_len"]
+        index._mmap = mapped
+        index.saved_at = datetime.fromisoformat(meta["saved_at"])
+        return index
+
+    @staticmethod
+    def _to_array(postings: memoryview) -> array:
+        copy = array("I")
+        copy.frombytes(postings.cast("B"))
+        return copy
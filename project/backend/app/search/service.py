@@ -0,0 +1,85 @@
+import os
+from datetime import timedelta
+from typing import List, Tuple
+from sqlalchemy import select, func
+from dotenv import load_dotenv
+from app.database import SessionLocal
+from app.models import Resume
+from app.search.index import InvertedIndex
+
+load_dotenv()
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "./search-index.bin")
+# Rows changed this long before a snapshot was taken are re-indexed on load,
+# covering clock skew between the app and the database
+SNAPSHOT_REPLAY_MARGIN = timedelta(minutes=5)
+
+# Callers go through the functions below rather than importing the index,
+# because warm_start swaps in a new instance.
+resume_index = InvertedIndex()
+
+
+def document_text(original_filename: str, content: str) -> str:
+    return f"{original_filename or ''}\n{content or ''}"
+
+
+def index_resume(resume: Resume):
+    if not SEARCH_INDEX_ENABLED:
+        return
+    if resume.extraction_status == "completed":
+        resume_index.add(resume.id, document_text(resume.original_filename, resume.content))
+    else:
+        resume_index.remove(resume.id)
+
+
+def unindex_resume(resume_id: int):
+    if SEARCH_INDEX_ENABLED:
+        resume_index.remove(resume_id)
+
+
+def search_index(q: str, limit: int, offset: int) -> List[Tuple[int, float]]:
+    return resume_index.search(q, limit=limit, offset=offset)
+
+
+async def warm_start(session_factory=SessionLocal, path: str = None):
+    """Load the snapshot, then catch up with the database.
+
+    Without a usable snapshot the index is built from scratch. Otherwise
+    only resumes changed since the snapshot are re-indexed, and resumes that
+    no longer exist are dropped.
+    """
+    global resume_index
+    path = path or SEARCH_INDEX_PATH
+    index, since = InvertedIndex(), None
+    if os.path.exists(path):
+        try:
+            index = InvertedIndex.load(path)
+            since = index.saved_at - SNAPSHOT_REPLAY_MARGIN
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading search index snapshot {path}: {e}")
+
+    async with session_factory() as db:
+        if since is not None:
+            existing = set((await db.execute(select(Resume.id))).scalars())
+            for resume_id in index.ids():
+                if resume_id not in existing:
+                    index.remove(resume_id)
+
+        query = select(
+            Resume.id, Resume.original_filename, Resume.content, Resume.extraction_status
+        ).execution_options(yield_per=1000)
+        if since is not None:
+            query = query.where(func.coalesce(Resume.updated_at, Resume.created_at) >= since)
+        rows = await db.stream(query)
+        async for row in rows:
+            if row.extraction_status == "completed":
+                index.add(row.id, document_text(row.original_filename, row.content))
+            else:
+                index.remove(row.id)
+
+    resume_index = index
+
+
+def save_snapshot(path: str = None):
+    resume_index.save(path or SEARCH_INDEX_PATH)
@@ -0,0 +1,17 @@
+import re
+from typing import List
+
+_WORD = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+to was were will with i me my we our you your he she they them this those
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens with stopwords and single characters removed."""
+    return [
+        token for token in _WORD.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
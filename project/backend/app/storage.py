@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple, Optional
+import aiofiles
+from fastapi import UploadFile
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(25 * 1024 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class StoredFile(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+    # False when identical bytes were already stored and nothing was written
+    created: bool = True
+
+
+async def _stream_to_temp(upload: UploadFile, directory: str, limit: int):
+    """Copy an upload into a temp file in ``directory``, hashing on the fly."""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    os.close(fd)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge(f"File exceeds the {limit} byte limit")
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+
+def blob_path(root: str, sha256: str) -> str:
+    """Location of a blob, sharded by hash prefix to keep directories small."""
+    return os.path.join(root, "blobs", sha256[:2], sha256[2:4], sha256)
+
+
+async def save_blob(
+    upload: UploadFile,
+    root: str,
+    max_size: Optional[int] = None
+) -> StoredFile:
+    """Stream an upload into the content-addressed store under ``root``.
+
+    Blobs are named by their SHA-256, so identical uploads share one file
+    and same-named uploads never overwrite each other. If the blob already
+    exists the streamed copy is discarded and ``created`` is False.
+    """
+    limit = MAX_UPLOAD_SIZE if max_size is None else max_size
+    staging = os.path.join(root, "blobs")
+    os.makedirs(staging, exist_ok=True)
+    tmp_path, size, sha256 = await _stream_to_temp(upload, staging, limit)
+
+    path = blob_path(root, sha256)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return StoredFile(path=path, size=size, sha256=sha256, created=False)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return StoredFile(path=path, size=size, sha256=sha256)
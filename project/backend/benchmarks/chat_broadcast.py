@@ -0,0 +1,109 @@
+"""Delivery latency of chat broadcasts to many sockets on one resume.
+
+Connects N listener WebSockets (plus optional stalled clients that stop
+reading) to one resume, sends messages from a separate socket at a fixed
+interval, and measures the time from sending until each listener
+receives each message. Prints delivery counts and latency percentiles.
+
+    uv run python -m benchmarks.chat_broadcast --base-url http://localhost:8000 --clients 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+import websockets
+from benchmarks.stats import summarize
+
+
+async def _listen(url: str, expected: int, samples: list, connected: asyncio.Event, counter: list, timeout: float):
+    received = 0
+    async with websockets.connect(url, open_timeout=60) as ws:
+        counter[0] += 1
+        if counter[0] == counter[1]:
+            connected.set()
+        deadline = time.monotonic() + timeout
+        while received < expected:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), max(deadline - time.monotonic(), 0.001))
+            except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                break
+            message = json.loads(raw)
+            if "id" in message:
+                samples.append((time.time() - float(message["message"].split(" ", 1)[0])) * 1000)
+                received += 1
+    return received
+
+
+async def _stall(url: str, hold: asyncio.Event):
+    # Reads nothing after the handshake, so its server-side queue fills up
+    try:
+        async with websockets.connect(url, open_timeout=60, max_queue=1):
+            await hold.wait()
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def run(
+    base_url: str, clients: int, stalled: int, messages: int, interval: float,
+    payload_bytes: int, timeout: float
+) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.post(
+            "/api/resumes/", files={"file": ("broadcast.txt", b"Broadcast load test", "text/plain")}
+        )
+        response.raise_for_status()
+        resume_id = response.json()["id"]
+    url = base_url.replace("http", "ws", 1) + f"/api/chat/ws/{resume_id}"
+
+    samples, connected, hold = [], asyncio.Event(), asyncio.Event()
+    counter = [0, clients]
+    stallers = [asyncio.create_task(_stall(url, hold)) for _ in range(stalled)]
+    listeners = [
+        asyncio.create_task(_listen(url, messages, samples, connected, counter, timeout))
+        for _ in range(clients)
+    ]
+    await asyncio.wait_for(connected.wait(), 120)
+
+    padding = "x" * payload_bytes
+    started = time.perf_counter()
+    async with websockets.connect(url) as sender:
+        for _ in range(messages):
+            await sender.send(json.dumps({"username": "bench", "message": f"{time.time()!r} {padding}"}))
+            await asyncio.sleep(interval)
+        received = await asyncio.gather(*listeners)
+    elapsed = time.perf_counter() - started
+    hold.set()
+    await asyncio.gather(*stallers)
+
+    return {
+        "clients": clients,
+        "stalled_clients": stalled,
+        "messages": messages,
+        "payload_bytes": payload_bytes,
+        "delivered": sum(received),
+        "expected": clients * messages,
+        "elapsed_s": round(elapsed, 2),
+        "latency": summarize(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--stalled", type=int, default=0, help="clients that stop reading")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between messages")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="padding added to each message")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+    result = asyncio.run(run(
+        args.base_url, args.clients, args.stalled, args.messages, args.interval,
+        args.payload_bytes, args.timeout
+    ))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
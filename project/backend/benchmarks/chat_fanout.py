@@ -0,0 +1,75 @@
+"""Check that chat messages reach clients on every worker process.
+
+Opens N WebSocket clients for one resume against a server started with
+several workers (connections spread across the processes), has each client
+send one message, and verifies every client receives every message.
+Prints delivery counts and end-to-end latency as JSON. With the in-memory
+broadcast backend only clients on the sender's worker see a message; with
+BROADCAST_BACKEND=postgres all of them should.
+
+    BROADCAST_BACKEND=postgres uv run uvicorn app.main:app --workers 4 --port 8000
+    uv run python -m benchmarks.chat_fanout --base-url http://localhost:8000 --clients 40
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+import websockets
+from benchmarks.stats import summarize
+
+
+async def _client(url: str, name: str, expected: int, ready: asyncio.Barrier, timeout: float) -> dict:
+    received, latencies = set(), []
+    async with websockets.connect(url) as ws:
+        await ready.wait()
+        await ws.send(json.dumps({"username": name, "message": f"{name} {time.time()}"}))
+        deadline = time.monotonic() + timeout
+        while len(received) < expected and time.monotonic() < deadline:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            message = json.loads(raw)
+            if "id" not in message:
+                continue
+            received.add(message["id"])
+            sent_at = float(message["message"].rsplit(" ", 1)[1])
+            latencies.append((time.time() - sent_at) * 1000)
+    return {"received": len(received), "latencies": latencies}
+
+
+async def run(base_url: str, clients: int, timeout: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.post(
+            "/api/resumes/", files={"file": ("fanout.txt", b"Chat fan-out check", "text/plain")}
+        )
+        response.raise_for_status()
+        resume_id = response.json()["id"]
+
+    ws_url = base_url.replace("http", "ws", 1) + f"/api/chat/ws/{resume_id}"
+    ready = asyncio.Barrier(clients)
+    results = await asyncio.gather(*(
+        _client(ws_url, f"client-{i}", clients, ready, timeout) for i in range(clients)
+    ))
+    counts = [r["received"] for r in results]
+    return {
+        "clients": clients,
+        "expected_per_client": clients,
+        "fully_delivered_clients": sum(1 for c in counts if c == clients),
+        "min_received": min(counts),
+        "latency": summarize(l for r in results for l in r["latencies"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.base_url, args.clients, args.timeout)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
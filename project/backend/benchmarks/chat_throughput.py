@@ -0,0 +1,66 @@
+"""Chat message throughput with many concurrent senders.
+
+Each of N sender sockets (all on one resume) sends messages one at a
+time and waits for its own message to come back before sending the next,
+so the round trip includes persisting the message. Reports messages per
+second and per-message round-trip latency; compare runs with
+CHAT_WRITE_BEHIND unset and set.
+
+    uv run python -m benchmarks.chat_throughput --base-url http://localhost:8000 --senders 20
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+import websockets
+from benchmarks.stats import summarize
+
+
+async def _sender(url: str, name: str, messages: int, samples: list):
+    async with websockets.connect(url, max_queue=None) as ws:
+        for i in range(messages):
+            text = f"{name}-{i}"
+            started = time.perf_counter()
+            await ws.send(json.dumps({"username": name, "message": text}))
+            # Skip other senders' messages until our own comes back
+            while json.loads(await ws.recv()).get("message") != text:
+                pass
+            samples.append((time.perf_counter() - started) * 1000)
+
+
+async def run(base_url: str, senders: int, messages: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.post(
+            "/api/resumes/", files={"file": ("throughput.txt", b"Chat throughput", "text/plain")}
+        )
+        response.raise_for_status()
+        resume_id = response.json()["id"]
+    url = base_url.replace("http", "ws", 1) + f"/api/chat/ws/{resume_id}"
+
+    samples = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _sender(url, f"sender-{i}", messages, samples) for i in range(senders)
+    ))
+    elapsed = time.perf_counter() - started
+    return {
+        "senders": senders,
+        "messages": senders * messages,
+        "elapsed_s": round(elapsed, 2),
+        "messages_per_s": round(senders * messages / elapsed, 1),
+        "round_trip": summarize(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--senders", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=50, help="messages per sender")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.base_url, args.senders, args.messages)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
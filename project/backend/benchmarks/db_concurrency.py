@@ -0,0 +1,99 @@
+"""Throughput and latency of read endpoints under many concurrent clients.
+
+Seeds a few resumes (with evaluations) through the API, then runs N client
+coroutines that each loop over ``GET /api/resumes/{id}``, the resume list
+and ``GET /api/evaluations/resume/{id}`` for a fixed duration. Used to
+compare the synchronous Session (blocking the event loop on every query)
+with the AsyncSession layer.
+
+Measured on one CPU with PostgreSQL on a local socket, the AsyncSession
+layer did not serve more requests than the synchronous Session when that
+one finished (60-128 rps against 95-126 rps at 200 clients), and on
+SQLite it was slower. What it removed are the stalls: the synchronous
+Session, blocking the event loop, held a request past the 60 s client
+timeout in 7 of 9 runs, while the async layer finished all 9.
+
+    uv run python -m benchmarks.db_concurrency --base-url http://localhost:8000 --clients 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import httpx
+from benchmarks.stats import summarize
+
+
+async def _seed(client: httpx.AsyncClient, count: int) -> list:
+    ids = []
+    for i in range(count):
+        response = await client.post(
+            "/api/resumes/",
+            files={"file": (f"load-{i}.txt", f"Load test resume {i} {time.time()}".encode(), "text/plain")},
+        )
+        response.raise_for_status()
+        resume_id = response.json()["id"]
+        ids.append(resume_id)
+        for rating in (3.0, 4.5):
+            await client.post("/api/evaluations/", json={
+                "resume_id": resume_id, "rating": rating, "evaluator_name": "bench",
+            })
+    return ids
+
+
+async def _client_loop(client: httpx.AsyncClient, ids: list, deadline: float, samples: dict):
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        resume_id = rng.choice(ids)
+        path, key = rng.choice([
+            (f"/api/resumes/{resume_id}", "get_resume"),
+            ("/api/resumes/?limit=20", "list_resumes"),
+            (f"/api/evaluations/resume/{resume_id}", "resume_evaluations"),
+        ])
+        started = time.perf_counter()
+        response = await client.get(path)
+        elapsed = (time.perf_counter() - started) * 1000
+        samples[key].append(elapsed)
+        if response.status_code != 200:
+            samples["errors"].append(response.status_code)
+
+
+async def run(base_url: str, clients: int, duration: float, seed: int) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        ids = await _seed(client, seed)
+        samples = {"get_resume": [], "list_resumes": [], "resume_evaluations": [], "errors": []}
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(_client_loop(client, ids, deadline, samples) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        for resume_id in ids:
+            await client.delete(f"/api/resumes/{resume_id}")
+
+    total = sum(len(v) for k, v in samples.items() if k != "errors")
+    report = {
+        "clients": clients,
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "errors": len(samples["errors"]),
+        "all": summarize(v for k, values in samples.items() if k != "errors" for v in values),
+    }
+    for key in ("get_resume", "list_resumes", "resume_evaluations"):
+        report[key] = summarize(samples[key])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=20, help="Resumes to create first")
+    args = parser.parse_args()
+    report = asyncio.run(run(args.base_url, args.clients, args.duration, args.seed))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Importing evaluations one request per row versus through /bulk.
+
+Uploads a few resumes, then imports the same generated evaluations
+twice: once with one POST /api/evaluations/ per row (a few requests in
+flight at a time), once as a single NDJSON POST /api/evaluations/bulk.
+Reports rows per second for both and the export time for the result.
+
+    uv run python -m benchmarks.evaluation_import --base-url http://localhost:8000 --rows 10000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import httpx
+
+
+async def _upload_resumes(client: httpx.AsyncClient, count: int) -> list:
+    ids = []
+    for i in range(count):
+        response = await client.post(
+            "/api/resumes/", files={"file": (f"import-{i}.txt", b"Evaluation import", "text/plain")}
+        )
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def _post_rows(client: httpx.AsyncClient, rows: list, concurrency: int):
+    async def worker(chunk):
+        for row in chunk:
+            (await client.post("/api/evaluations/", json=row)).raise_for_status()
+
+    await asyncio.gather(*(worker(rows[i::concurrency]) for i in range(concurrency)))
+
+
+async def run(base_url: str, rows: int, resumes: int, concurrency: int, skip_single: bool) -> dict:
+    rng = random.Random(15)
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        resume_ids = await _upload_resumes(client, resumes)
+        evaluations = [
+            {
+                "resume_id": rng.choice(resume_ids),
+                "rating": round(rng.uniform(1, 5), 1),
+                "comment": "Imported from the previous ATS",
+                "evaluator_name": f"recruiter-{rng.randrange(20)}",
+            }
+            for _ in range(rows)
+        ]
+        result = {"rows": rows, "resumes": resumes}
+
+        if not skip_single:
+            started = time.perf_counter()
+            await _post_rows(client, evaluations, concurrency)
+            elapsed = time.perf_counter() - started
+            result["single_s"] = round(elapsed, 2)
+            result["single_rows_per_s"] = round(rows / elapsed, 1)
+
+        body = "\n".join(json.dumps(row) for row in evaluations)
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/evaluations/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        result["bulk_s"] = round(elapsed, 2)
+        result["bulk_rows_per_s"] = round(rows / elapsed, 1)
+        result["bulk_errors"] = len(response.json()["errors"])
+
+        started = time.perf_counter()
+        exported = await client.get("/api/evaluations/export", params={"format": "csv"})
+        exported.raise_for_status()
+        result["export_s"] = round(time.perf_counter() - started, 2)
+        result["export_rows"] = len(exported.text.splitlines()) - 1
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight for the per-row import")
+    parser.add_argument("--skip-single", action="store_true", help="only run the bulk import")
+    args = parser.parse_args()
+    print(json.dumps(
+        asyncio.run(run(args.base_url, args.rows, args.resumes, args.concurrency, args.skip_single)),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
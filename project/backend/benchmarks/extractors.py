@@ -0,0 +1,152 @@
+"""Throughput, memory and accuracy of the text extraction engines.
+
+Runs a corpus through every installed engine of each file type, each in a
+fresh subprocess so its peak RSS is its own, and reports pages/sec, peak
+RSS and how closely the output matches the expected text (word-level
+similarity, 1.0 = identical). The generated corpus (PDFs of 1-60 pages
+and TXT files) has known text; for a directory of real files given with
+``--corpus``, the ``--reference`` engine's output is the expected text.
+Ends with the fastest engine per file type whose mean similarity is at
+least ``--min-similarity``.
+
+    uv run --extra extractors python -m benchmarks.extractors --rounds 3
+    uv run --extra extractors python -m benchmarks.extractors --corpus ./uploads/blobs
+"""
+import argparse
+import difflib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from benchmarks.pdfgen import build_pdf
+from app.extractors import engines, lookup
+
+WORDS = (
+    "Python SQL PostgreSQL FastAPI Kubernetes Docker engineer developer senior lead team "
+    "designed built migrated reduced latency throughput 30% $1.2M (2019-2023) e-commerce "
+    "platform analytics pipeline Berlin London remote B.Sc. M.Sc. mentoring on-call"
+).split()
+
+
+def _page_lines(rng: random.Random, lines: int) -> List[str]:
+    return [" ".join(rng.choices(WORDS, k=rng.randint(6, 12))) for _ in range(lines)]
+
+
+def generate_corpus(directory: str, seed: int = 7) -> List[dict]:
+    """Write PDFs and TXT files with known text; returns the manifest."""
+    rng = random.Random(seed)
+    manifest = []
+    for number, page_count in enumerate([1, 2, 2, 3, 5, 10, 20, 60]):
+        pages = [_page_lines(rng, 45) for _ in range(page_count)]
+        path = os.path.join(directory, f"resume-{number}.pdf")
+        with open(path, "wb") as f:
+            f.write(build_pdf(pages))
+        manifest.append({"path": path, "file_type": "pdf", "pages": ["\n".join(lines) for lines in pages]})
+    for number in range(8):
+        text = "\n".join(_page_lines(rng, 60))
+        path = os.path.join(directory, f"resume-{number}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        manifest.append({"path": path, "file_type": "txt", "pages": [text]})
+    return manifest
+
+
+def similarity(expected: str, actual: str) -> float:
+    matcher = difflib.SequenceMatcher(None, expected.split(), actual.split(), autojunk=False)
+    return matcher.ratio()
+
+
+def _worker(file_type: str, engine: str, manifest_path: str, rounds: int) -> dict:
+    """Runs in a subprocess: extract every file of the type ``rounds`` times."""
+    extractor = lookup(file_type, engine)
+    with open(manifest_path) as f:
+        documents = [doc for doc in json.load(f) if doc["file_type"] == file_type]
+    outputs = {}
+    pages = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for doc in documents:
+            page_count, texts = extractor.extract_pages(doc["path"])
+            pages += page_count
+            outputs[doc["path"]] = "\n".join(texts)
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed_s": elapsed,
+        "pages": pages,
+        "outputs": outputs,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _run_engine(file_type: str, engine: str, manifest_path: str, rounds: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.extractors", "--worker", file_type, engine, manifest_path, str(rounds)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def run(corpus: Optional[str], reference: str, rounds: int, min_similarity: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        if corpus:
+            manifest = [
+                {"path": os.path.join(corpus, name), "file_type": name.rsplit(".", 1)[-1].lower(), "pages": None}
+                for name in sorted(os.listdir(corpus))
+                if name.rsplit(".", 1)[-1].lower() in ("pdf", "txt")
+            ]
+        else:
+            manifest = generate_corpus(tmp)
+        manifest_path = os.path.join(tmp, "manifest.json")
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+        report: Dict[str, dict] = {}
+        for file_type in sorted({doc["file_type"] for doc in manifest}):
+            runs = {
+                extractor.name: _run_engine(file_type, extractor.name, manifest_path, rounds)
+                for extractor in engines(file_type) if extractor.available()
+            }
+            expected = {
+                doc["path"]: "\n".join(doc["pages"]) if doc["pages"] is not None
+                else runs.get(reference, next(iter(runs.values())))["outputs"][doc["path"]]
+                for doc in manifest if doc["file_type"] == file_type
+            }
+            results = {}
+            for name, measured in runs.items():
+                scores = [similarity(expected[path], text) for path, text in measured["outputs"].items()]
+                results[name] = {
+                    "pages_per_s": round(measured["pages"] / measured["elapsed_s"], 1),
+                    "peak_rss_mb": round(measured["peak_rss_mb"], 1),
+                    "similarity_mean": round(sum(scores) / len(scores), 4),
+                    "similarity_min": round(min(scores), 4),
+                }
+            accurate = [name for name, r in results.items() if r["similarity_mean"] >= min_similarity]
+            report[file_type] = {
+                "documents": len(expected),
+                "engines": results,
+                "recommended": max(accurate, key=lambda name: results[name]["pages_per_s"]) if accurate else None,
+            }
+    return report
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        file_type, engine, manifest_path, rounds = sys.argv[2:6]
+        print(json.dumps(_worker(file_type, engine, manifest_path, int(rounds))))
+        return
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of real .pdf/.txt files instead of the generated corpus")
+    parser.add_argument("--reference", default="pypdf2", help="engine whose output is expected for --corpus files")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--min-similarity", type=float, default=0.98)
+    args = parser.parse_args()
+    print(json.dumps(run(args.corpus, args.reference, args.rounds, args.min_similarity), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Original-file downloads and their effect on other requests.
+
+Uploads one large file, then runs N concurrent clients downloading it
+(optionally as 1 MB ranges) while another client polls ``/health``.
+Reports download throughput, the latency of the health checks and, when
+``--pid`` is given, the server's peak resident memory.
+
+    uv run python -m benchmarks.file_download --base-url http://localhost:8000 --size-mb 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import httpx
+from benchmarks.stats import summarize
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def _downloader(client, url, deadline, ranged, size, totals):
+    offset = 0
+    while time.perf_counter() < deadline:
+        headers = {}
+        if ranged:
+            headers["Range"] = f"bytes={offset}-{offset + 2**20 - 1}"
+            offset = (offset + 2**20) % size
+        async with client.stream("GET", url, headers=headers) as response:
+            async for chunk in response.aiter_bytes():
+                totals["bytes"] += len(chunk)
+        totals["requests"] += 1
+
+
+async def _poller(client, deadline, samples):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/health")
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def _sample_rss(pid, deadline, peak):
+    while time.perf_counter() < deadline:
+        peak[0] = max(peak[0], _rss_mb(pid))
+        await asyncio.sleep(0.1)
+
+
+async def run(base_url: str, size_mb: int, clients: int, seconds: float, ranged: bool, pid: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        data = b"%PDF-1.4\n" + os.urandom(size_mb * 2**20)
+        response = await client.post(
+            "/api/resumes/", files={"file": ("large.pdf", data, "application/pdf")}
+        )
+        response.raise_for_status()
+        url = f"/api/resumes/{response.json()['id']}/file"
+
+        totals = {"bytes": 0, "requests": 0}
+        samples = []
+        peak = [_rss_mb(pid) if pid else 0.0]
+        idle_rss = peak[0]
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(_downloader(client, url, deadline, ranged, len(data), totals) for _ in range(clients)),
+            _poller(client, deadline, samples),
+            *([_sample_rss(pid, deadline, peak)] if pid else [])
+        )
+    return {
+        "clients": clients,
+        "ranged": ranged,
+        "downloads": totals["requests"],
+        "mb_per_s": round(totals["bytes"] / 2**20 / seconds, 1),
+        "health_latency": summarize(samples),
+        "server_rss_mb": {"idle": round(idle_rss, 1), "peak": round(peak[0], 1)} if pid else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--size-mb", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--ranged", action="store_true", help="download 1 MB ranges instead of whole files")
+    parser.add_argument("--pid", type=int, default=0, help="server process id, to report its memory")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(
+        args.base_url, args.size_mb, args.clients, args.seconds, args.ranged, args.pid
+    )), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Throughput of the hot read endpoints under repeated reads.
+
+Uploads a set of resumes with evaluations and chat history, then keeps
+N clients reading ``GET /api/resumes/{id}``, the evaluation list and the
+chat history of random resumes. Compare runs with CACHE_ENABLED unset
+and set to false (or against an older revision).
+
+    uv run python -m benchmarks.hot_reads --base-url http://localhost:8000 --clients 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import httpx
+from benchmarks.stats import summarize
+
+ENDPOINTS = ["/api/resumes/{id}", "/api/evaluations/resume/{id}", "/api/chat/resume/{id}"]
+
+
+async def _seed(client: httpx.AsyncClient, resumes: int, content_bytes: int) -> list:
+    text = ("Senior Python developer, PostgreSQL, FastAPI. " * (content_bytes // 48 + 1))[:content_bytes]
+    ids = []
+    for i in range(resumes):
+        response = await client.post(
+            "/api/resumes/", files={"file": (f"hot-{i}.txt", f"{i} {text}".encode(), "text/plain")}
+        )
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+        for rating in (3.0, 4.5):
+            await client.post("/api/evaluations/", json={
+                "resume_id": ids[-1], "rating": rating, "evaluator_name": "bench"
+            })
+    return ids
+
+
+async def _reader(client: httpx.AsyncClient, ids: list, deadline: float, samples: dict, rng):
+    while time.perf_counter() < deadline:
+        endpoint = rng.choice(ENDPOINTS)
+        started = time.perf_counter()
+        response = await client.get(endpoint.format(id=rng.choice(ids)))
+        response.raise_for_status()
+        samples[endpoint].append((time.perf_counter() - started) * 1000)
+
+
+async def run(base_url: str, clients: int, resumes: int, seconds: float, content_bytes: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        ids = await _seed(client, resumes, content_bytes)
+        samples = {endpoint: [] for endpoint in ENDPOINTS}
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(
+            _reader(client, ids, deadline, samples, random.Random(i)) for i in range(clients)
+        ))
+        stats = await client.get("/cache/stats")
+    total = sum(len(s) for s in samples.values())
+    return {
+        "clients": clients,
+        "requests": total,
+        "requests_per_s": round(total / seconds, 1),
+        "latency": {endpoint: summarize(s) for endpoint, s in samples.items()},
+        "cache": stats.json() if stats.status_code == 200 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--content-bytes", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(
+        asyncio.run(run(args.base_url, args.clients, args.resumes, args.seconds, args.content_bytes)),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
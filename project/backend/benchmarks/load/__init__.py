@@ -0,0 +1,13 @@
+"""End-to-end load tests against a running server.
+
+* ``benchmarks.load.seed`` fills the database named by DATABASE_URL
+  (SQLite or PostgreSQL) with Faker-generated resumes, evaluations and
+  chat messages. Run it before starting the server so no cache or
+  in-process index misses the rows.
+* ``benchmarks.load.run`` drives a weighted mix of resume, evaluation and
+  chat requests plus WebSocket fan-out at a fixed concurrency and prints
+  throughput and latency percentiles per endpoint as JSON, tagged with
+  the commit it ran against.
+* ``benchmarks.load.compare`` diffs two such reports and exits non-zero
+  when an endpoint regressed past a threshold, for gating changes.
+"""
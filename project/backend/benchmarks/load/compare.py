@@ -0,0 +1,103 @@
+"""Compare two ``benchmarks.load.run`` reports and flag regressions.
+
+For every endpoint present in both reports (and the WebSocket fan-out),
+prints the relative change in throughput and p50/p95/p99 latency. An
+endpoint regresses when its throughput drops or its p95 grows by more
+than ``--threshold`` percent (latency changes under ``--min-ms`` are
+treated as noise), or when its error rate grows past
+``--max-error-rate``. Exits with status 1 on any regression, so it can
+gate a change in CI. Run both sides against the same seeded data.
+
+    uv run python -m benchmarks.load.compare baseline.json current.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if not before:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def _error_rate(stats: dict) -> float:
+    return stats.get("errors", 0) / stats["count"] if stats["count"] else 0.0
+
+
+def compare_stats(
+    name: str,
+    before: dict,
+    after: dict,
+    limits: dict,
+    regressions: List[str]
+) -> dict:
+    result = {}
+    if "rps" in before:
+        result["rps"] = {"before": before["rps"], "after": after["rps"], "change_pct": _change(before["rps"], after["rps"])}
+        if result["rps"]["change_pct"] is not None and result["rps"]["change_pct"] < -limits["threshold"]:
+            regressions.append(f"{name}: throughput {result['rps']['change_pct']}%")
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        result[key] = {"before": before[key], "after": after[key], "change_pct": _change(before[key], after[key])}
+    p95 = result["p95_ms"]
+    if (
+        p95["change_pct"] is not None
+        and p95["change_pct"] > limits["threshold"]
+        and p95["after"] - p95["before"] > limits["min_ms"]
+    ):
+        regressions.append(f"{name}: p95 latency +{p95['change_pct']}%")
+    error_rate = _error_rate(after)
+    if error_rate > max(_error_rate(before), limits["max_error_rate"]):
+        regressions.append(f"{name}: error rate {error_rate:.2%}")
+    return result
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_ms: float, max_error_rate: float) -> dict:
+    regressions: List[str] = []
+    limits = {"threshold": threshold, "min_ms": min_ms, "max_error_rate": max_error_rate}
+    endpoints = {
+        name: compare_stats(name, baseline["endpoints"][name], stats, limits, regressions)
+        for name, stats in current["endpoints"].items()
+        if name in baseline["endpoints"] and baseline["endpoints"][name]["count"] and stats["count"]
+    }
+    report = {
+        "baseline": baseline["meta"].get("commit"),
+        "current": current["meta"].get("commit"),
+        "threshold_pct": threshold,
+        "total": compare_stats("total", baseline["total"], current["total"], limits, regressions),
+        "endpoints": endpoints,
+    }
+    before_ws, after_ws = baseline.get("websocket"), current.get("websocket")
+    if before_ws and after_ws and before_ws["count"] and after_ws["count"]:
+        report["websocket"] = compare_stats("websocket", before_ws, after_ws, limits, regressions)
+        ratio_before, ratio_after = before_ws["delivery_ratio"], after_ws["delivery_ratio"]
+        report["websocket"]["delivery_ratio"] = {"before": ratio_before, "after": ratio_after}
+        if ratio_after < ratio_before - threshold / 100:
+            regressions.append(f"websocket: delivery ratio {ratio_before} -> {ratio_after}")
+    for key in ("clients", "duration_s", "mix", "seed"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            report.setdefault("warnings", []).append(f"runs differ in {key}; results may not be comparable")
+    report["regressions"] = regressions
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore p95 increases smaller than this")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="error rate tolerated per endpoint")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    report = compare(baseline, current, args.threshold, args.min_ms, args.max_error_rate)
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["regressions"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Mixed HTTP and WebSocket load against a running server.
+
+``--clients`` coroutines each pick a scenario by weight (``--mix``) and
+issue it back to back for ``--duration`` seconds; the first ``--warmup``
+seconds are not measured. Alongside, ``--ws-rooms`` chat rooms each get
+``--ws-subscribers`` WebSocket clients and one sender posting
+``--ws-rate`` messages per second, measuring fan-out delivery and latency.
+Each client's random choices come from ``--seed``, so runs against
+different commits issue the same request sequence.
+
+Prints a JSON report (per-endpoint throughput, error count and
+p50/p95/p99 latency, plus run metadata and the git commit) that
+``benchmarks.load.compare`` can diff. Seed the database first with
+``benchmarks.load.seed``.
+
+    uv run python -m benchmarks.load.run --base-url http://localhost:8000 --clients 50 --duration 30 > current.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import subprocess
+import time
+from typing import Callable, Dict, List
+import httpx
+import websockets
+from benchmarks.load.seed import SKILLS
+from benchmarks.stats import summarize
+
+# name: (weight, description)
+SCENARIOS = {
+    "list_resumes": (20, "GET /api/resumes/?limit=20"),
+    "get_resume": (20, "GET /api/resumes/{id}"),
+    "search_resumes": (5, "GET /api/resumes/search?q={skill}"),
+    "resume_evaluations": (15, "GET /api/evaluations/resume/{id}"),
+    "rating_summary": (10, "GET /api/evaluations/resume/{id}/summary"),
+    "create_evaluation": (10, "POST /api/evaluations/"),
+    "chat_history": (15, "GET /api/chat/resume/{id}?limit=50"),
+    "upload_resume": (5, "POST /api/resumes/ (TXT)"),
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """``name=weight,...`` overrides; unlisted scenarios keep their default weight."""
+    weights = {name: weight for name, (weight, _) in SCENARIOS.items()}
+    for pair in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = pair.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario: {name} (one of {', '.join(SCENARIOS)})")
+        weights[name] = int(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def _request(name: str, ids: List[int], rng: random.Random, sequence: int) -> Callable:
+    resume_id = rng.choice(ids)
+    if name == "list_resumes":
+        return lambda client: client.get("/api/resumes/", params={"limit": 20})
+    if name == "get_resume":
+        return lambda client: client.get(f"/api/resumes/{resume_id}")
+    if name == "search_resumes":
+        return lambda client: client.get("/api/resumes/search", params={"q": rng.choice(SKILLS)})
+    if name == "resume_evaluations":
+        return lambda client: client.get(f"/api/evaluations/resume/{resume_id}")
+    if name == "rating_summary":
+        return lambda client: client.get(f"/api/evaluations/resume/{resume_id}/summary")
+    if name == "create_evaluation":
+        body = {"resume_id": resume_id, "rating": round(rng.uniform(1, 5), 1), "evaluator_name": "load"}
+        return lambda client: client.post("/api/evaluations/", json=body)
+    if name == "chat_history":
+        return lambda client: client.get(f"/api/chat/resume/{resume_id}", params={"limit": 50})
+    text = f"Load test resume {sequence} {time.time()}\nSkills: {', '.join(rng.sample(SKILLS, 4))}"
+    files = {"file": (f"load-{sequence}.txt", text.encode(), "text/plain")}
+    return lambda client: client.post("/api/resumes/", files=files)
+
+
+async def _resume_ids(client: httpx.AsyncClient, limit: int) -> List[int]:
+    ids, cursor = [], None
+    while len(ids) < limit:
+        params = {"limit": min(100, limit - len(ids))}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/resumes/", params=params)
+        response.raise_for_status()
+        page = response.json()
+        ids.extend(resume["id"] for resume in page["resumes"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    if not ids:
+        raise SystemExit("No resumes found; seed the database with benchmarks.load.seed first")
+    return ids
+
+
+async def _http_client(client, ids, weights, rng, measure_from, deadline, samples, errors):
+    names, cum = list(weights), list(weights.values())
+    sequence = 0
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=cum)[0]
+        send = _request(name, ids, rng, sequence)
+        sequence += 1
+        started = time.perf_counter()
+        try:
+            response = await send(client)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if started >= measure_from:
+            samples[name].append((time.perf_counter() - started) * 1000)
+            errors[name] += failed
+
+
+async def _drain(ws):
+    try:
+        async for _ in ws:
+            pass
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def _ws_room(base_url, resume_id, subscribers, rate, measure_from, deadline, stats):
+    url = base_url.replace("http", "ws", 1) + f"/api/chat/ws/{resume_id}"
+    sent_at: Dict[str, float] = {}
+
+    async def subscriber():
+        try:
+            async with websockets.connect(url) as ws:
+                while time.perf_counter() < deadline + 1:
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), max(0.01, deadline + 1 - time.perf_counter()))
+                    except asyncio.TimeoutError:
+                        break
+                    message = json.loads(raw)
+                    token = message.get("message")
+                    if token in sent_at:
+                        stats["delivered"] += 1
+                        stats["latencies"].append((time.perf_counter() - sent_at[token]) * 1000)
+        except websockets.ConnectionClosed:
+            # e.g. dropped by the server for falling behind
+            stats["disconnects"] += 1
+
+    async def sender():
+        sequence = 0
+        while time.perf_counter() < deadline:
+            try:
+                async with websockets.connect(url) as ws:
+                    # Read our own echoes so the server never drops us as a slow consumer
+                    drain = asyncio.create_task(_drain(ws))
+                    while time.perf_counter() < deadline:
+                        if time.perf_counter() >= measure_from:
+                            token = f"load {resume_id}-{sequence}"
+                            sequence += 1
+                            sent_at[token] = time.perf_counter()
+                            await ws.send(json.dumps({"username": "load", "message": token}))
+                            stats["sent"] += 1
+                            stats["expected"] += subscribers
+                        await asyncio.sleep(1 / rate)
+                    drain.cancel()
+            except websockets.ConnectionClosed:
+                # The server closes the socket when storing a message fails
+                stats["disconnects"] += 1
+
+    tasks = [asyncio.create_task(subscriber()) for _ in range(subscribers)]
+    # Let the subscribers join the room before anything is sent
+    await asyncio.sleep(0.5)
+    await sender()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _git_commit() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+async def run(args) -> dict:
+    weights = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        ids = await _resume_ids(client, args.id_sample)
+        samples = {name: [] for name in weights}
+        errors = {name: 0 for name in weights}
+        ws_stats = {"sent": 0, "expected": 0, "delivered": 0, "disconnects": 0, "latencies": []}
+
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        deadline = measure_from + args.duration
+        rooms = random.Random(args.seed).sample(ids, min(args.ws_rooms, len(ids)))
+        await asyncio.gather(
+            *(
+                _http_client(
+                    client, ids, weights, random.Random(args.seed + number),
+                    measure_from, deadline, samples, errors
+                )
+                for number in range(args.clients)
+            ),
+            *(
+                _ws_room(args.base_url, room, args.ws_subscribers, args.ws_rate, measure_from, deadline, ws_stats)
+                for room in rooms
+            )
+        )
+
+    endpoints = {
+        name: {
+            "errors": errors[name],
+            "rps": round(len(samples[name]) / args.duration, 1),
+            **summarize(samples[name]),
+        }
+        for name in weights
+    }
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        "meta": {
+            **_git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "base_url": args.base_url,
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "mix": weights,
+            "resumes_sampled": len(ids),
+        },
+        "total": {
+            "errors": sum(errors.values()),
+            "rps": round(len(all_samples) / args.duration, 1),
+            **summarize(all_samples),
+        },
+        "endpoints": endpoints,
+        "websocket": {
+            "rooms": len(rooms),
+            "subscribers_per_room": args.ws_subscribers,
+            "messages_sent": ws_stats["sent"],
+            "disconnects": ws_stats["disconnects"],
+            "delivery_ratio": round(ws_stats["delivered"] / ws_stats["expected"], 4) if ws_stats["expected"] else None,
+            **summarize(ws_stats["latencies"]),
+        } if rooms else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent HTTP clients")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", default="", help="scenario weights, e.g. get_resume=50,upload_resume=0")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--id-sample", type=int, default=1000, help="resume ids the clients pick from")
+    parser.add_argument("--ws-rooms", type=int, default=5, help="chat rooms with WebSocket traffic (0 to skip)")
+    parser.add_argument("--ws-subscribers", type=int, default=20, help="WebSocket clients per room")
+    parser.add_argument("--ws-rate", type=float, default=5, help="messages per second per room")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
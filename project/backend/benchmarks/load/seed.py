@@ -0,0 +1,121 @@
+"""Seed the database with synthetic resumes, evaluations and chat messages.
+
+Migrates the database to the latest schema, writes TXT resumes into the
+blob store under UPLOAD_DIR and inserts rows in batches straight through
+the application's engine, then rebuilds the rating aggregates. The same
+``--seed`` gives the same data.
+
+    DATABASE_URL=sqlite:///./load.db uv run --extra test python -m benchmarks.load.seed --resumes 2000
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from faker import Faker
+from sqlalchemy import insert
+from app.database import SessionLocal, engine
+from app.models import ChatMessage, Evaluation, Resume
+from app.ratings import rebuild_ratings
+from app.schema import upgrade
+from app.storage import blob_path
+
+SKILLS = [
+    "Python", "SQL", "PostgreSQL", "FastAPI", "Django", "React", "TypeScript", "Kubernetes",
+    "Docker", "AWS", "Terraform", "Kafka", "Spark", "Airflow", "Go", "Rust", "Java", "GraphQL",
+]
+
+
+def resume_text(fake: Faker, rng: random.Random) -> str:
+    lines = [fake.name(), fake.job(), fake.email(), fake.city(), "", "Summary", fake.paragraph(nb_sentences=4), ""]
+    lines.append("Experience")
+    for _ in range(rng.randint(2, 5)):
+        lines.append(f"{fake.job()} at {fake.company()} ({rng.randint(2008, 2020)}-{rng.randint(2021, 2025)})")
+        lines.extend(f"- {fake.sentence(nb_words=12)}" for _ in range(rng.randint(2, 4)))
+    lines.append("")
+    lines.append("Skills: " + ", ".join(rng.sample(SKILLS, rng.randint(3, 8))))
+    return "\n".join(lines)
+
+
+def _store(upload_dir: str, text: str) -> dict:
+    data = text.encode("utf-8")
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = blob_path(upload_dir, sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return {"file_path": path, "content_hash": sha256}
+
+
+async def seed(resumes: int, evaluations: int, messages: int, seed: int, upload_dir: str, batch: int) -> dict:
+    fake = Faker()
+    Faker.seed(seed)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    counts = {"resumes": 0, "evaluations": 0, "chat_messages": 0}
+    async with SessionLocal() as db:
+        for offset in range(0, resumes, batch):
+            rows = []
+            for number in range(offset, min(offset + batch, resumes)):
+                text = resume_text(fake, rng)
+                filename = f"{fake.user_name()}-{number}.txt"
+                rows.append({
+                    "filename": filename,
+                    "original_filename": filename,
+                    "file_type": "txt",
+                    "content": text,
+                    "extraction_status": "completed",
+                    **_store(upload_dir, text),
+                })
+            ids = (await db.execute(insert(Resume).returning(Resume.id), rows)).scalars().all()
+
+            evaluation_rows = [
+                {
+                    "resume_id": resume_id,
+                    "rating": round(rng.uniform(1, 5), 1),
+                    "comment": fake.sentence(nb_words=10),
+                    "evaluator_name": fake.name(),
+                }
+                for resume_id in ids for _ in range(evaluations)
+            ]
+            message_rows = [
+                {"resume_id": resume_id, "username": fake.first_name(), "message": fake.sentence(nb_words=8)}
+                for resume_id in ids for _ in range(messages)
+            ]
+            if evaluation_rows:
+                await db.execute(insert(Evaluation), evaluation_rows)
+            if message_rows:
+                await db.execute(insert(ChatMessage), message_rows)
+            await db.commit()
+            counts["resumes"] += len(ids)
+            counts["evaluations"] += len(evaluation_rows)
+            counts["chat_messages"] += len(message_rows)
+
+        await rebuild_ratings(db)
+        await db.commit()
+    await engine.dispose()
+
+    return {**counts, "seed": seed, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--evaluations", type=int, default=5, help="evaluations per resume")
+    parser.add_argument("--messages", type=int, default=20, help="chat messages per resume")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--upload-dir", default=os.getenv("UPLOAD_DIR", "./uploads"))
+    parser.add_argument("--batch", type=int, default=500, help="resumes inserted per transaction")
+    args = parser.parse_args()
+    upgrade()
+    print(json.dumps(asyncio.run(seed(
+        args.resumes, args.evaluations, args.messages, args.seed, args.upload_dir, args.batch
+    )), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""First-page previews of long PDFs versus full extraction.
+
+Uploads a generated PDF of ``--pages`` pages (a synchronous upload parses
+every page), then uploads the same bytes again: the copy reuses the stored
+content, so its pages are not in ``resume_pages`` yet. Reports the upload
+time, the first ``GET /pages?from=1`` on the copy (parses page 1 only) and
+repeated warm reads served from the table.
+
+    uv run python -m benchmarks.page_preview --base-url http://localhost:8000 --pages 60
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+from benchmarks.pdfgen import build_pdf
+from benchmarks.stats import summarize
+
+
+def _document(pages: int, lines: int) -> bytes:
+    return build_pdf([
+        [f"Page {page} line {line}: Python, SQL, distributed systems, team lead" for line in range(lines)]
+        for page in range(1, pages + 1)
+    ])
+
+
+async def _timed(client, method, url, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    response.raise_for_status()
+    return response, (time.perf_counter() - started) * 1000
+
+
+async def run(base_url: str, pages: int, lines: int, requests: int) -> dict:
+    data = _document(pages, lines)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        files = {"file": ("long.pdf", data, "application/pdf")}
+        _, full_ms = await _timed(client, "POST", "/api/resumes/", files=files)
+        copy, _ = await _timed(client, "POST", "/api/resumes/", files={"file": ("copy.pdf", data, "application/pdf")})
+        url = f"/api/resumes/{copy.json()['id']}/pages?from=1"
+
+        _, cold_ms = await _timed(client, "GET", url)
+        warm = []
+        for _ in range(requests):
+            _, elapsed = await _timed(client, "GET", url)
+            warm.append(elapsed)
+    return {
+        "pages": pages,
+        "pdf_kb": round(len(data) / 1024, 1),
+        "full_extraction_upload_ms": round(full_ms, 1),
+        "first_page_cold_ms": round(cold_ms, 1),
+        "first_page_warm": summarize(warm),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--lines", type=int, default=50, help="text lines per page")
+    parser.add_argument("--requests", type=int, default=200, help="warm reads to time")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.base_url, args.pages, args.lines, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
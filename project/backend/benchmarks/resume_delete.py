@@ -0,0 +1,83 @@
+"""Deleting resumes with long chat threads, under concurrent chat reads.
+
+Run against a server whose database was filled by ``benchmarks.load.seed``
+with many messages per resume. Deletes ``--deletes`` resumes one after
+another while ``--readers`` clients keep reading the chat history of
+other resumes, and reports the delete latency and the readers' latency
+before and during the deletes (how long deletes hold up other traffic).
+
+    uv run python -m benchmarks.load.seed --resumes 40 --messages 5000 --evaluations 200
+    uv run python -m benchmarks.resume_delete --base-url http://localhost:8000 --deletes 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import httpx
+from benchmarks.stats import summarize
+
+
+async def _reader(client, ids, stop: asyncio.Event, samples: list, rng):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(f"/api/chat/resume/{rng.choice(ids)}", params={"limit": 50})
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+async def _read_for(client, ids, readers: int, seconds: float) -> list:
+    samples, stop = [], asyncio.Event()
+    tasks = [asyncio.create_task(_reader(client, ids, stop, samples, random.Random(i))) for i in range(readers)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return samples
+
+
+async def run(base_url: str, deletes: int, readers: int, baseline_seconds: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        page = (await client.get("/api/resumes/", params={"limit": deletes * 2, "include_total": "false"})).json()
+        ids = [resume["id"] for resume in page["resumes"]]
+        if len(ids) < deletes * 2:
+            raise SystemExit("Not enough resumes; seed the database with benchmarks.load.seed first")
+        doomed, kept = ids[:deletes], ids[deletes:]
+        # Warm the session pool and caches, then measure reads alone
+        await _read_for(client, kept, readers, 1)
+        before = await _read_for(client, kept, readers, baseline_seconds)
+
+        during, stop = [], asyncio.Event()
+        tasks = [
+            asyncio.create_task(_reader(client, kept, stop, during, random.Random(100 + i)))
+            for i in range(readers)
+        ]
+        delete_ms = []
+        for resume_id in doomed:
+            started = time.perf_counter()
+            response = await client.delete(f"/api/resumes/{resume_id}")
+            response.raise_for_status()
+            delete_ms.append((time.perf_counter() - started) * 1000)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    return {
+        "deletes": deletes,
+        "readers": readers,
+        "delete": summarize(delete_ms),
+        "chat_reads_before": summarize(before),
+        "chat_reads_during_deletes": summarize(during),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--deletes", type=int, default=10)
+    parser.add_argument("--readers", type=int, default=4, help="concurrent chat history readers")
+    parser.add_argument("--baseline-seconds", type=float, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.base_url, args.deletes, args.readers, args.baseline_seconds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
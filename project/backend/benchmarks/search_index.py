@@ -0,0 +1,108 @@
+"""Build time, snapshot cost and query latency of the in-process search index.
+
+Generates synthetic resumes whose words follow a Zipf distribution over a
+fixed vocabulary, builds an ``InvertedIndex`` for each corpus size, writes
+and reloads a snapshot, and times queries for rare, mid-frequency and
+common terms plus two-term queries. Prints one JSON document per size.
+
+    uv run python -m benchmarks.search_index --sizes 10000,100000,1000000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from benchmarks.stats import summarize
+from app.search.index import InvertedIndex
+
+
+def _vocabulary(size: int) -> list:
+    return [f"term{n:x}" for n in range(size)]
+
+
+def _corpus(count: int, vocabulary: list, doc_length: int, seed: int):
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    for resume_id in range(count):
+        yield resume_id, " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=doc_length))
+
+
+def _time_queries(index: InvertedIndex, queries: list, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, limit=20)
+            samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def run(size: int, vocabulary_size: int, doc_length: int, repeat: int, seed: int) -> dict:
+    vocabulary = _vocabulary(vocabulary_size)
+    index = InvertedIndex()
+    build_s = 0.0
+    for resume_id, text in _corpus(size, vocabulary, doc_length, seed):
+        started = time.perf_counter()
+        index.add(resume_id, text)
+        build_s += time.perf_counter() - started
+    # The first query computes the length norms for the whole corpus
+    started = time.perf_counter()
+    index.search(vocabulary[-1])
+    first_query_ms = (time.perf_counter() - started) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.bin")
+        started = time.perf_counter()
+        index.save(path)
+        save_s = time.perf_counter() - started
+        snapshot_mb = os.path.getsize(path) / 2 ** 20
+        started = time.perf_counter()
+        loaded = InvertedIndex.load(path)
+        load_s = time.perf_counter() - started
+
+        # Rank buckets of the Zipf distribution, by expected document frequency
+        rng = random.Random(seed)
+        by_rank = {
+            "rare": vocabulary[vocabulary_size // 2:],
+            "mid": vocabulary[100:1000],
+            "common": vocabulary[:10],
+        }
+        queries = {name: [rng.choice(words) for _ in range(20)] for name, words in by_rank.items()}
+        queries["two_terms"] = [
+            f"{rng.choice(by_rank['mid'])} {rng.choice(by_rank['rare'])}" for _ in range(20)
+        ]
+        latency = {
+            name: _time_queries(loaded, batch, repeat) for name, batch in queries.items()
+        }
+        del loaded
+
+    return {
+        "documents": size,
+        "doc_length": doc_length,
+        "terms": len(index._terms),
+        "build_s": round(build_s, 2),
+        "docs_per_s": round(size / build_s),
+        "snapshot_mb": round(snapshot_mb, 1),
+        "save_s": round(save_s, 2),
+        "load_s": round(load_s, 3),
+        "first_query_ms": round(first_query_ms, 1),
+        "query_latency": latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="comma separated corpus sizes")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--doc-length", type=int, default=200, help="words per synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        print(json.dumps(run(size, args.vocabulary, args.doc_length, args.repeat, args.seed), indent=2), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure read latency while concurrent PDF uploads are being processed.
+
+Fires N concurrent multi-page PDF uploads at a running server and, for as long
+as they are in flight, keeps probing ``/health`` and ``/api/resumes/``. Before
+PDF extraction moved off the event loop the probes stalled for the full
+parsing time of every upload; now they should stay close to idle latency.
+
+    uv run python -m benchmarks.upload_latency --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+from benchmarks.pdfgen import build_pdf, lorem_pages
+from benchmarks.stats import summarize
+
+
+async def _probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+
+async def _upload(client: httpx.AsyncClient, index: int, pdf: bytes, results: list):
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/resumes/",
+        files={"file": (f"bench-{index}.pdf", pdf, "application/pdf")},
+    )
+    results.append({
+        "status": response.status_code,
+        "ms": (time.perf_counter() - started) * 1000,
+        "id": response.json().get("id") if response.status_code == 201 else None,
+    })
+
+
+async def run(base_url: str, uploads: int, pages: int, cleanup: bool) -> dict:
+    pdf = build_pdf(lorem_pages(pages))
+    limits = httpx.Limits(max_connections=uploads + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        stop = asyncio.Event()
+        health, listing, upload_results = [], [], []
+        probes = [
+            asyncio.create_task(_probe(client, "/health", stop, health)),
+            asyncio.create_task(_probe(client, "/api/resumes/?limit=20", stop, listing)),
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(*(_upload(client, i, pdf, upload_results) for i in range(uploads)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*probes)
+
+        if cleanup:
+            for result in upload_results:
+                if result["id"] is not None:
+                    await client.delete(f"/api/resumes/{result['id']}")
+
+    statuses = {}
+    for result in upload_results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+    return {
+        "uploads": uploads,
+        "pages_per_pdf": pages,
+        "pdf_bytes": len(pdf),
+        "wall_time_s": round(elapsed, 3),
+        "upload_statuses": statuses,
+        "upload_latency": summarize(r["ms"] for r in upload_results),
+        "health_latency": summarize(health),
+        "list_latency": summarize(listing),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--no-cleanup", action="store_true", help="Keep the uploaded resumes")
+    args = parser.parse_args()
+    report = asyncio.run(run(args.base_url, args.uploads, args.pages, not args.no_cleanup))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
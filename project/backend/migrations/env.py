@@ -0,0 +1,59 @@
+"""Alembic environment: migrates DATABASE_URL through its asyncio driver."""
+import asyncio
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import models  # noqa: F401  (registers the tables on the metadata)
+from app.database import Base, DATABASE_URL, to_async_url
+from app.schema import include_object
+
+config = context.config
+if config.config_file_name is not None and not config.get_main_option("sqlalchemy.url"):
+    # Programmatic callers (tests, seeding) keep their own logging
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+
+def run_migrations_offline():
+    """Print the SQL instead of running it (``alembic upgrade head --sql``)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite can only alter tables by copying them
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    engine = create_async_engine(to_async_url(database_url()), poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
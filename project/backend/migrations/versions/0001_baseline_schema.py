@@ -0,0 +1,73 @@
+"""Baseline schema: the tables the app used to create at startup
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+This is exactly what the old startup ``create_all`` built. Tables that
+already exist are left alone, so such databases (and those made by the
+former ``init-db`` SQL scripts) need no ``stamp`` before ``upgrade head``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema import create_index_online, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_table("resumes"):
+        op.create_table(
+            "resumes",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("original_filename", sa.String(), nullable=False),
+            sa.Column("file_type", sa.String(), nullable=False),
+            sa.Column("file_path", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    create_index_online("ix_resumes_id", "resumes", ["id"])
+
+    if not has_table("evaluations"):
+        op.create_table(
+            "evaluations",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("rating", sa.Float(), nullable=False),
+            sa.Column("comment", sa.Text(), nullable=True),
+            sa.Column("evaluator_name", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    create_index_online("ix_evaluations_id", "evaluations", ["id"])
+
+    if not has_table("chat_messages"):
+        op.create_table(
+            "chat_messages",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    create_index_online("ix_chat_messages_id", "chat_messages", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("chat_messages")
+    op.drop_table("evaluations")
+    op.drop_table("resumes")
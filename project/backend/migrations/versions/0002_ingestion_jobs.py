@@ -0,0 +1,49 @@
+"""Background ingestion: resume extraction status and the job table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Existing resumes were extracted during upload, so they are ``completed``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema import create_index_online, has_column, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_column("resumes", "extraction_status"):
+        op.add_column(
+            "resumes",
+            sa.Column("extraction_status", sa.String(), server_default="completed", nullable=False)
+        )
+
+    if not has_table("ingestion_jobs"):
+        op.create_table(
+            "ingestion_jobs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    create_index_online("ix_ingestion_jobs_id", "ingestion_jobs", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("ingestion_jobs")
+    with op.batch_alter_table("resumes") as batch_op:
+        batch_op.drop_column("extraction_status")
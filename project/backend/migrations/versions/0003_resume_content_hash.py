@@ -0,0 +1,33 @@
+"""The SHA-256 of each resume file, to reuse the text of identical uploads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Resumes uploaded before this revision have no hash, so their text is never reused.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema import create_index_online, has_column
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_column("resumes", "content_hash"):
+        op.add_column("resumes", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    create_index_online("ix_resumes_content_hash", "resumes", ["content_hash"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_resumes_content_hash", table_name="resumes")
+    with op.batch_alter_table("resumes") as batch_op:
+        batch_op.drop_column("content_hash")
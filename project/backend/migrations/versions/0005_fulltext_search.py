@@ -0,0 +1,83 @@
+"""Full-text search over resume filenames and content
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+A frozen copy of the DDL in app/fulltext.py. PostgreSQL computes the
+generated column for existing rows itself; on SQLite the new FTS5 index
+is rebuilt from the rows already in ``resumes``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from app.schema import create_index_online, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Filename matches rank above body matches
+POSTGRES_SEARCH_VECTOR = """
+    ALTER TABLE resumes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(original_filename, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+"""
+SQLITE_FULLTEXT = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        original_filename, content,
+        content='resumes', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ai AFTER INSERT ON resumes BEGIN
+        INSERT INTO resumes_fts(rowid, original_filename, content)
+        VALUES (new.id, new.original_filename, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_ad AFTER DELETE ON resumes BEGIN
+        INSERT INTO resumes_fts(resumes_fts, rowid, original_filename, content)
+        VALUES ('delete', old.id, old.original_filename, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS resumes_fts_au AFTER UPDATE ON resumes BEGIN
+        INSERT INTO resumes_fts(resumes_fts, rowid, original_filename, content)
+        VALUES ('delete', old.id, old.original_filename, old.content);
+        INSERT INTO resumes_fts(rowid, original_filename, content)
+        VALUES (new.id, new.original_filename, new.content);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute(POSTGRES_SEARCH_VECTOR)
+        create_index_online("ix_resumes_search_vector", "resumes", ["search_vector"], postgresql_using="gin")
+    elif dialect == "sqlite":
+        created = not has_table("resumes_fts")
+        for statement in SQLITE_FULLTEXT:
+            op.execute(statement)
+        if created:
+            op.execute("INSERT INTO resumes_fts(resumes_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_resumes_search_vector")
+        op.execute("ALTER TABLE resumes DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("resumes_fts_ai", "resumes_fts_ad", "resumes_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS resumes_fts")
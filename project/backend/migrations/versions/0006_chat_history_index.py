@@ -0,0 +1,29 @@
+"""Keyset pagination of chat history on (resume_id, created_at, id)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from app.schema import create_index_online
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_online(
+        "ix_chat_messages_resume_created_id", "chat_messages", ["resume_id", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_chat_messages_resume_created_id", table_name="chat_messages")
@@ -0,0 +1,66 @@
+"""Per-resume rating aggregates, backfilled from the evaluations
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+The backfill uses the same star buckets as app/ratings.py and only fills
+in resumes that have no aggregate row yet, so it is safe to run again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema import create_index_online, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each rating counts towards its nearest whole star, halves rounding up
+BACKFILL = """
+    INSERT INTO resume_ratings (
+        resume_id, count, total, average, min_rating, max_rating,
+        bucket_1, bucket_2, bucket_3, bucket_4, bucket_5
+    )
+    SELECT resume_id, count(*), sum(rating), avg(rating), min(rating), max(rating),
+           sum(CASE WHEN rating < 1.5 THEN 1 ELSE 0 END),
+           sum(CASE WHEN rating >= 1.5 AND rating < 2.5 THEN 1 ELSE 0 END),
+           sum(CASE WHEN rating >= 2.5 AND rating < 3.5 THEN 1 ELSE 0 END),
+           sum(CASE WHEN rating >= 3.5 AND rating < 4.5 THEN 1 ELSE 0 END),
+           sum(CASE WHEN rating >= 4.5 THEN 1 ELSE 0 END)
+    FROM evaluations
+    WHERE resume_id NOT IN (SELECT resume_id FROM resume_ratings)
+    GROUP BY resume_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_table("resume_ratings"):
+        op.create_table(
+            "resume_ratings",
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("total", sa.Float(), nullable=False),
+            sa.Column("average", sa.Float(), nullable=True),
+            sa.Column("min_rating", sa.Float(), nullable=True),
+            sa.Column("max_rating", sa.Float(), nullable=True),
+            sa.Column("bucket_1", sa.Integer(), nullable=False),
+            sa.Column("bucket_2", sa.Integer(), nullable=False),
+            sa.Column("bucket_3", sa.Integer(), nullable=False),
+            sa.Column("bucket_4", sa.Integer(), nullable=False),
+            sa.Column("bucket_5", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("resume_id"),
+        )
+    create_index_online("ix_resume_ratings_average", "resume_ratings", ["average"])
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resume_ratings")
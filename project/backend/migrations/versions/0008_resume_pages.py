@@ -0,0 +1,36 @@
+"""Page-level text of PDF resumes, filled in as pages are read
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema import has_table
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_table("resume_pages"):
+        op.create_table(
+            "resume_pages",
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("page_number", sa.Integer(), nullable=False),
+            sa.Column("text", sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("resume_id", "page_number"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resume_pages")
@@ -0,0 +1,37 @@
+"""Index the evaluation and ingestion job foreign keys
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+
+Per-resume evaluation lists (newest first), rating rebuilds and resume
+deletes all look rows up by ``resume_id``; without these indexes each of
+them scans the whole table. Chat messages are already covered by the
+leading column of ``ix_chat_messages_resume_created_id``.
+"""
+from typing import Sequence, Union
+
+from app.schema import create_index_online, drop_index_online
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_evaluations_resume_id_created_at", "evaluations", ["resume_id", "created_at"]),
+    ("ix_ingestion_jobs_resume_id", "ingestion_jobs", ["resume_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in INDEXES:
+        drop_index_online(name, table)
@@ -0,0 +1,134 @@
+"""Reconcile databases made by the former init-db SQL scripts; cascade deletes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+
+Databases created from ``infra/init-db`` differ from the models:
+
+- Their ``idx_*`` indexes duplicate the ``ix_*`` ones the migrations
+  create, or serve no query the app makes. They are dropped.
+- Their CHECK constraints on ``file_type``, ``extraction_status``,
+  ``rating`` and the job ``status`` are dropped: databases built by
+  ``create_all`` never had them, and the API validates those values.
+- Their ``evaluations.rating`` is NUMERIC(3, 1); it becomes the FLOAT
+  column the models declare.
+
+Both kinds of database get the same child foreign keys: deleting a
+resume deletes its evaluations, chat messages and ingestion jobs, as
+``init-db`` did and as ``resume_ratings`` and ``resume_pages`` already
+do. On PostgreSQL the new key is validated after it is added, which does
+not block writes to the tables.
+
+The downgrade restores the foreign keys without the cascade; the other
+changes are not reversed.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from app.schema import drop_index_online
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEGACY_INDEXES = [
+    ("idx_resumes_created_at", "resumes"),
+    ("idx_resumes_created_at_id", "resumes"),
+    ("idx_resumes_file_type", "resumes"),
+    ("idx_resumes_content_hash", "resumes"),
+    ("idx_resumes_updated_at", "resumes"),
+    ("idx_evaluations_resume_id", "evaluations"),
+    ("idx_evaluations_rating", "evaluations"),
+    ("idx_evaluations_created_at", "evaluations"),
+    ("idx_evaluations_resume_rating", "evaluations"),
+    ("idx_chat_messages_resume_id", "chat_messages"),
+    ("idx_chat_messages_created_at", "chat_messages"),
+    ("idx_chat_messages_resume_created", "chat_messages"),
+    ("idx_chat_messages_resume_created_id", "chat_messages"),
+    ("idx_ingestion_jobs_resume_id", "ingestion_jobs"),
+    ("idx_ingestion_jobs_unfinished", "ingestion_jobs"),
+    ("idx_resume_ratings_average", "resume_ratings"),
+]
+LEGACY_CHECKS = [
+    ("resumes_file_type_check", "resumes"),
+    ("resumes_extraction_status_check", "resumes"),
+    ("evaluations_rating_check", "evaluations"),
+    ("ingestion_jobs_status_check", "ingestion_jobs"),
+]
+CASCADED_TABLES = ["evaluations", "chat_messages", "ingestion_jobs"]
+
+
+def resume_fks(table: str) -> list:
+    if context.is_offline_mode():
+        # As the baseline created it
+        return [{"name": f"{table}_resume_id_fkey", "options": {}}]
+    return [
+        fk for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+        if fk["referred_table"] == "resumes"
+    ]
+
+
+def replace_resume_fk(table: str, ondelete: Union[str, None]):
+    """Point ``table.resume_id`` at ``resumes`` again, with ``ondelete``.
+
+    The key is named as PostgreSQL names it by default, whatever it was
+    called before, so every database ends up with the same name.
+    """
+    name = f"{table}_resume_id_fkey"
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite can only change a foreign key by copying the table; the
+        # naming convention names the unnamed key the baseline created
+        with op.batch_alter_table(
+            table,
+            recreate="always",
+            naming_convention={"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+        ) as batch_op:
+            batch_op.drop_constraint(name, type_="foreignkey")
+            batch_op.create_foreign_key(name, "resumes", ["resume_id"], ["id"], ondelete=ondelete)
+        return
+
+    for fk in resume_fks(table):
+        op.drop_constraint(fk["name"], table, type_="foreignkey")
+    action = f" ON DELETE {ondelete}" if ondelete else ""
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY (resume_id) "
+        f"REFERENCES resumes (id){action} NOT VALID"
+    )
+    # Checking the existing rows in a later transaction only takes a lock
+    # that lets writes through
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table in LEGACY_INDEXES:
+        drop_index_online(name, table)
+
+    if op.get_context().dialect.name == "postgresql":
+        for name, table in LEGACY_CHECKS:
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        rating_types = [] if context.is_offline_mode() else [
+            c["type"] for c in sa.inspect(op.get_bind()).get_columns("evaluations") if c["name"] == "rating"
+        ]
+        if any(not isinstance(type_, sa.Float) for type_ in rating_types):
+            op.alter_column(
+                "evaluations",
+                "rating",
+                type_=sa.Float(),
+                postgresql_using="rating::double precision"
+            )
+
+    for table in CASCADED_TABLES:
+        if any((fk["options"].get("ondelete") or "").upper() != "CASCADE" for fk in resume_fks(table)):
+            replace_resume_fk(table, "CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CASCADED_TABLES:
+        replace_resume_fk(table, None)
@@ -7,11 +7,15 @@ import atexit
 os.environ["ENVIRONMENT"] = "test"
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
+from contextlib import contextmanager
 from typing import Generator
-from app.database import Base, get_db
+from app.database import Base, enforce_foreign_keys, get_db, to_async_url
 from app.main import app
+from app.querylog import instrument_engine, record_queries
 
 # Create a temporary file for SQLite database (more reliable than in-memory)
 _test_db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
@@ -27,6 +31,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The app itself talks to the same file through aiosqlite. NullPool keeps
+# connections from outliving the event loop of each TestClient.
+async_engine = create_async_engine(to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+instrument_engine(async_engine)
+enforce_foreign_keys(async_engine)
+
 
 def cleanup_test_db():
     """Clean up test database file on exit."""
@@ -53,6 +66,24 @@ def setup_database():
     engine.dispose()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_cached_counts():
+    """Forget in-process counts so each test sees its own database."""
+    from app.routers import resumes
+
+    resumes.resume_count.invalidate()
+    yield
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_response_cache():
+    """Start each test with an empty response cache."""
+    from app.cache import response_cache
+
+    response_cache.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a database session for each test."""
@@ -63,29 +94,67 @@ def db_session():
         db.close()
 
 
+@pytest.fixture
+def session_factory():
+    """Async session factory bound to the test database, for background workers."""
+    return TestingAsyncSessionLocal
+
+
 @pytest.fixture(scope="function")
-def client(db_session) -> Generator:
+def client(db_session, monkeypatch) -> Generator:
     """Create a test client with database override."""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    from app.routers import chat
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    # WebSocket handlers open their own sessions
+    monkeypatch.setattr(chat, "SessionLocal", TestingAsyncSessionLocal)
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def upload_dir(tmp_path):
+def query_budget():
+    """Fail if the requests made in a block run more SQL statements than allowed.
+
+        with query_budget(1):
+            client.get("/api/resumes/1")
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with record_queries(keep_statements=True) as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries, budget {max_queries}:\n" + "\n".join(stats.statements)
+        )
+
+    return budget
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
     """Create a temporary upload directory for tests."""
+    from app.routers import resumes
+
     upload_path = tmp_path / "uploads"
     upload_path.mkdir()
     os.environ["UPLOAD_DIR"] = str(upload_path)
+    monkeypatch.setattr(resumes, "UPLOAD_DIR", str(upload_path))
     yield str(upload_path)
     # Cleanup
     if "UPLOAD_DIR" in os.environ:
         del os.environ["UPLOAD_DIR"]
 
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Write a small two-page text PDF and return its path."""
+    from benchmarks.pdfgen import build_pdf
+
+    path = tmp_path / "sample.pdf"
+    path.write_bytes(build_pdf([["Jane Doe", "Python developer"], ["Skills: SQL"]]))
+    return str(path)
@@ -61,3 +61,233 @@ def test_get_chat_messages_resume_not_found(client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert "Resume not found" in response.json()["detail"]
 
+
+
+def test_websocket_broadcasts_to_all_clients(client, db_session):
+    """Test a message sent on one socket reaches every socket for the resume."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as sender, \
+            client.websocket_connect(f"/api/chat/ws/{resume.id}") as listener:
+        sender.send_json({"username": "Alice", "message": "Hello"})
+
+        received = [sender.receive_json(), listener.receive_json()]
+
+    assert all(m["message"] == "Hello" and m["resume_id"] == resume.id for m in received)
+    assert db_session.query(ChatMessage).count() == 1
+
+
+def test_websocket_requires_username_and_message(client, db_session):
+    """Test incomplete messages are rejected without being stored."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"username": "Alice"})
+        assert "error" in ws.receive_json()
+
+    assert db_session.query(ChatMessage).count() == 0
+
+
+def test_websocket_write_behind(client, db_session, session_factory, monkeypatch):
+    """Test write-behind mode broadcasts at once and stores the message on flush."""
+    import asyncio
+    from app.chat_writer import ChatWriter
+    from app.routers import chat
+
+    writer = ChatWriter(session_factory, enabled=True)
+    monkeypatch.setattr(chat, "chat_writer", writer)
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"username": "Alice", "message": "Hello"})
+        received = ws.receive_json()
+
+    assert received["id"] == 1 and received["message"] == "Hello"
+    asyncio.run(writer.flush())
+    assert db_session.query(ChatMessage).one().id == 1
+
+
+def test_websocket_write_behind_buffer_full(client, db_session, session_factory, monkeypatch):
+    """Test a message is refused with an error, not broadcast, when the buffer is full."""
+    from app.chat_writer import ChatWriter
+    from app.routers import chat
+
+    writer = ChatWriter(session_factory, enabled=True, max_buffered=0)
+    monkeypatch.setattr(chat, "chat_writer", writer)
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"username": "Alice", "message": "Hello"})
+        received = ws.receive_json()
+
+    assert "error" in received
+    assert db_session.query(ChatMessage).count() == 0
+
+
+async def test_write_behind_drops_messages_of_deleted_resume(client, db_session, session_factory):
+    """Test messages buffered for a resume deleted before the flush are dropped, not orphaned."""
+    from app.chat_writer import ChatWriter
+
+    writer = ChatWriter(session_factory, enabled=True)
+    deleted = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    kept = Resume(filename="b.txt", original_filename="b.txt", file_type="txt", file_path="/b")
+    db_session.add_all([deleted, kept])
+    db_session.commit()
+    await writer.add(deleted.id, "Alice", "Gone")
+    await writer.add(kept.id, "Bob", "Kept")
+
+    assert client.delete(f"/api/resumes/{deleted.id}").status_code == status.HTTP_204_NO_CONTENT
+    await writer.flush()
+
+    assert [(m.resume_id, m.message) for m in db_session.query(ChatMessage)] == [(kept.id, "Kept")]
+    assert writer._buffer == []
+
+
+def add_thread(db_session, count):
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+    messages = [
+        ChatMessage(resume_id=resume.id, username="User", message=f"m{i}") for i in range(count)
+    ]
+    # Same-second timestamps: order falls back to id
+    for message in messages:
+        db_session.add(message)
+        db_session.commit()
+    return resume, [m.id for m in messages]
+
+
+def test_get_chat_messages_latest_page(client, db_session):
+    """Test the default page is the latest messages, oldest first."""
+    resume, ids = add_thread(db_session, 5)
+
+    response = client.get(f"/api/chat/resume/{resume.id}", params={"limit": 3})
+
+    assert [m["id"] for m in response.json()] == ids[2:]
+
+
+def test_get_chat_messages_before_id(client, db_session):
+    """Test paging backwards from the oldest message received."""
+    resume, ids = add_thread(db_session, 5)
+
+    response = client.get(f"/api/chat/resume/{resume.id}", params={"before_id": ids[2], "limit": 10})
+
+    assert [m["id"] for m in response.json()] == ids[:2]
+
+
+def test_get_chat_messages_after_id(client, db_session):
+    """Test fetching only the messages newer than the last one seen."""
+    resume, ids = add_thread(db_session, 5)
+
+    first = client.get(f"/api/chat/resume/{resume.id}", params={"after_id": ids[1], "limit": 2}).json()
+    rest = client.get(f"/api/chat/resume/{resume.id}", params={"after_id": first[-1]["id"]}).json()
+
+    assert [m["id"] for m in first] == ids[2:4]
+    assert [m["id"] for m in rest] == ids[4:]
+
+
+def test_get_chat_messages_unknown_cursor(client, db_session):
+    """Test a cursor from another thread or a missing message is rejected."""
+    resume, _ = add_thread(db_session, 1)
+    other, other_ids = add_thread(db_session, 1)
+
+    response = client.get(f"/api/chat/resume/{resume.id}", params={"after_id": other_ids[0]})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_websocket_sync_sends_missed_messages(client, db_session):
+    """Test the sync handshake returns only messages after the last seen id."""
+    resume, ids = add_thread(db_session, 4)
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"type": "sync", "last_id": ids[1]})
+        frame = ws.receive_json()
+
+    assert frame["type"] == "sync"
+    assert [m["id"] for m in frame["messages"]] == ids[2:]
+    assert frame["has_more"] is False
+
+
+def test_websocket_sync_without_last_id_sends_latest(client, db_session, monkeypatch):
+    """Test a sync with no last id sends the newest messages, not the oldest."""
+    from app.routers import chat
+
+    monkeypatch.setattr(chat, "CHAT_HISTORY_MAX_LIMIT", 3)
+    resume, ids = add_thread(db_session, 5)
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"type": "sync", "last_id": None})
+        latest = ws.receive_json()
+        ws.send_json({"type": "sync", "last_id": ids[0]})
+        after_first = ws.receive_json()
+
+    assert [m["id"] for m in latest["messages"]] == ids[2:]
+    assert latest["has_more"] is True
+    assert [m["id"] for m in after_first["messages"]] == ids[1:4]
+    assert after_first["has_more"] is True
+
+
+async def test_sync_drops_client_that_cannot_take_the_frame(client, db_session):
+    """Test a client whose send queue is full is dropped rather than silently missing the sync."""
+    from app.routers.chat import sync_messages
+
+    resume, _ = add_thread(db_session, 2)
+
+    class FullClient:
+        """A client whose send queue is full; it is its own manager."""
+
+        def __init__(self):
+            self.manager = self
+            self.dropped = []
+
+        def send(self, text):
+            return False
+
+        def drop(self, client, reason):
+            self.dropped.append(reason)
+
+    full = FullClient()
+
+    await sync_messages(full, resume.id, None)
+
+    assert full.dropped == ["Client too slow"]
+
+
+def test_chat_history_cache_invalidated_by_new_message(client, db_session):
+    """Test cached history is refreshed once a message arrives over the socket."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    assert client.get(f"/api/chat/resume/{resume.id}").json() == []
+    assert client.get(f"/api/chat/resume/{resume.id}").json() == []
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}") as ws:
+        ws.send_json({"username": "Alice", "message": "Hello"})
+        ws.receive_json()
+
+    messages = client.get(f"/api/chat/resume/{resume.id}").json()
+    assert [m["message"] for m in messages] == ["Hello"]
+
+
+def test_chat_history_query_budget(client, db_session, query_budget):
+    """Test a history page takes one query, whether the thread is full, empty or missing."""
+    resume, _ = add_thread(db_session, 3)
+    empty = Resume(filename="b.txt", original_filename="b.txt", file_type="txt", file_path="/b")
+    db_session.add(empty)
+    db_session.commit()
+
+    for resume_id, expected in ((resume.id, 3), (empty.id, 0)):
+        with query_budget(1):
+            response = client.get(f"/api/chat/resume/{resume_id}")
+        assert len(response.json()) == expected
+    with query_budget(1):
+        assert client.get("/api/chat/resume/999").status_code == status.HTTP_404_NOT_FOUND
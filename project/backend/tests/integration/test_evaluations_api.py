@@ -154,3 +154,187 @@ def test_get_evaluation_not_found(client):
     
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+
+
+def add_rated_resume(client, db_session, name, ratings):
+    resume = Resume(filename=name, original_filename=name, file_type="txt", file_path=f"/{name}")
+    db_session.add(resume)
+    db_session.commit()
+    for rating in ratings:
+        client.post("/api/evaluations/", json={
+            "resume_id": resume.id, "rating": rating, "evaluator_name": "HR"
+        })
+    return resume
+
+
+def test_get_rating_summary(client, db_session):
+    """Test aggregates are maintained as evaluations are created."""
+    resume = add_rated_resume(client, db_session, "a.txt", [4.5, 2.0, 3.4, 5.0])
+
+    response = client.get(f"/api/evaluations/resume/{resume.id}/summary")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == 4
+    assert data["total"] == pytest.approx(14.9)
+    assert data["average"] == pytest.approx(3.725)
+    assert data["min_rating"] == 2.0
+    assert data["max_rating"] == 5.0
+    assert data["histogram"] == {"1": 0, "2": 1, "3": 1, "4": 0, "5": 2}
+
+
+def test_get_rating_summary_without_evaluations(client, db_session):
+    """Test an unrated resume has an empty summary."""
+    resume = add_rated_resume(client, db_session, "a.txt", [])
+
+    data = client.get(f"/api/evaluations/resume/{resume.id}/summary").json()
+
+    assert data["count"] == 0
+    assert data["average"] is None
+    assert sum(data["histogram"].values()) == 0
+
+
+def test_get_rating_summary_resume_not_found(client):
+    """Test the summary of a missing resume is a 404."""
+    response = client.get("/api/evaluations/resume/999/summary")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_list_resumes_sorted_by_rating(client, db_session):
+    """Test the resume list can embed ratings and sort by average."""
+    low = add_rated_resume(client, db_session, "low.txt", [2.0])
+    unrated = add_rated_resume(client, db_session, "unrated.txt", [])
+    high = add_rated_resume(client, db_session, "high.txt", [5.0, 4.0])
+
+    response = client.get("/api/resumes/", params={"sort": "rating", "fields": "rating"})
+
+    assert response.status_code == status.HTTP_200_OK
+    resumes = response.json()["resumes"]
+    assert [r["id"] for r in resumes] == [high.id, low.id, unrated.id]
+    assert resumes[0]["rating"]["average"] == 4.5
+    assert resumes[2]["rating"] is None
+    assert "content" not in resumes[0]
+
+
+def test_deleting_resume_removes_rating(client, db_session):
+    """Test aggregates go away with their resume."""
+    from app.models import ResumeRating
+
+    resume = add_rated_resume(client, db_session, "a.txt", [3.0])
+    client.delete(f"/api/resumes/{resume.id}")
+
+    assert db_session.query(ResumeRating).count() == 0
+
+
+def test_bulk_import_json(client, db_session):
+    """Test a JSON array is imported with per-row errors."""
+    resume = add_rated_resume(client, db_session, "a.txt", [])
+    rows = [
+        {"resume_id": resume.id, "rating": 4.0, "evaluator_name": "HR"},
+        {"resume_id": resume.id, "rating": 9.0, "evaluator_name": "HR"},
+        {"resume_id": 999, "rating": 3.0, "evaluator_name": "HR"},
+        {"resume_id": resume.id, "rating": 2.0, "evaluator_name": "HR", "comment": "meh"},
+    ]
+
+    response = client.post("/api/evaluations/bulk", json=rows)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [e["row"] for e in data["errors"]] == [2, 3]
+    assert "rating" in data["errors"][0]["error"]
+    assert "999" in data["errors"][1]["error"]
+    summary = client.get(f"/api/evaluations/resume/{resume.id}/summary").json()
+    assert summary["count"] == 2
+    assert summary["average"] == 3.0
+
+
+def test_bulk_import_ndjson(client, db_session, monkeypatch):
+    """Test an NDJSON stream is imported across several chunks."""
+    from app.routers import evaluations
+
+    monkeypatch.setattr(evaluations, "EVALUATION_BULK_CHUNK_SIZE", 2)
+    resume = add_rated_resume(client, db_session, "a.txt", [5.0])
+    lines = [f'{{"resume_id": {resume.id}, "rating": {r}, "evaluator_name": "HR"}}' for r in (1, 2, 3)]
+    body = "\n".join(lines[:2] + ["", "not json"] + lines[2:])
+
+    response = client.post(
+        "/api/evaluations/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    data = response.json()
+    assert data["inserted"] == 3
+    assert [e["row"] for e in data["errors"]] == [4]
+    summary = client.get(f"/api/evaluations/resume/{resume.id}/summary").json()
+    assert summary["count"] == 4
+    assert summary["min_rating"] == 1.0
+    assert summary["max_rating"] == 5.0
+
+
+def test_bulk_import_rejects_non_array(client):
+    """Test a JSON body that is not an array is rejected."""
+    response = client.post("/api/evaluations/bulk", json={"rating": 4.0})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_export_round_trip(client, db_session):
+    """Test exported NDJSON can be imported again, and CSV has a header row."""
+    resume = add_rated_resume(client, db_session, "a.txt", [4.0, 2.5])
+
+    exported = client.get("/api/evaluations/export")
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+    assert len(exported.text.splitlines()) == 2
+
+    response = client.post(
+        "/api/evaluations/bulk",
+        content=exported.content,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.json() == {"inserted": 2, "errors": []}
+
+    csv_lines = client.get(
+        "/api/evaluations/export", params={"format": "csv", "resume_id": resume.id}
+    ).text.splitlines()
+    assert csv_lines[0] == "id,resume_id,rating,comment,evaluator_name,created_at"
+    assert len(csv_lines) == 5
+
+
+def test_get_evaluations_conditional(client, db_session):
+    """Test evaluation lists and summaries revalidate until a new evaluation arrives."""
+    resume = add_rated_resume(client, db_session, "a.txt", [4.0])
+    urls = [f"/api/evaluations/resume/{resume.id}", f"/api/evaluations/resume/{resume.id}/summary"]
+    etags = [client.get(url).headers["etag"] for url in urls]
+
+    for url, etag in zip(urls, etags):
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post("/api/evaluations/", json={"resume_id": resume.id, "rating": 2.0, "evaluator_name": "HR"})
+    for url, etag in zip(urls, etags):
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+
+
+def test_get_evaluations_conditional_missing_resume(client):
+    """Test a missing resume is still a 404 without an ETag."""
+    response = client.get("/api/evaluations/resume/999", headers={"If-None-Match": "*"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "etag" not in response.headers
+
+
+def test_evaluation_reads_query_budget(client, db_session, query_budget):
+    """Test evaluation lists and summaries take one query, found or not."""
+    rated = add_rated_resume(client, db_session, "a.txt", [4.0, 5.0])
+    unrated = add_rated_resume(client, db_session, "b.txt", [])
+
+    for resume_id, expected in ((rated.id, 200), (unrated.id, 200), (999, 404)):
+        with query_budget(1):
+            assert client.get(f"/api/evaluations/resume/{resume_id}").status_code == expected
+        with query_budget(1):
+            assert client.get(f"/api/evaluations/resume/{resume_id}/summary").status_code == expected
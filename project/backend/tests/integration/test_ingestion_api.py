@@ -0,0 +1,193 @@
+import io
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from app.ingestion import IngestionWorker
+from app.models import Resume, IngestionJob
+
+
+def test_create_resume_background(client, upload_dir):
+    """Test background upload returns 202 with a queued job."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Background content"), "text/plain")}
+
+    response = client.post("/api/resumes/?background=true", files=files)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] == "queued"
+
+    resume = client.get(f"/api/resumes/{job['resume_id']}").json()
+    assert resume["extraction_status"] == "pending"
+    assert resume["content"] is None
+
+
+def test_get_ingestion_job(client, upload_dir):
+    """Test getting the status of an ingestion job."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Background content"), "text/plain")}
+    job_id = client.post("/api/resumes/?background=true", files=files).json()["id"]
+
+    response = client.get(f"/api/resumes/jobs/{job_id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == job_id
+    assert response.json()["status"] == "queued"
+
+
+def test_get_ingestion_job_not_found(client):
+    """Test getting a non-existent ingestion job."""
+    response = client.get("/api/resumes/jobs/999")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "Job not found" in response.json()["detail"]
+
+
+def test_update_resume_background(client, upload_dir, db_session):
+    """Test background update resets the content and queues a job."""
+    resume = Resume(
+        filename="old.txt",
+        original_filename="old.txt",
+        file_type="txt",
+        file_path="/uploads/old.txt",
+        content="Old content"
+    )
+    db_session.add(resume)
+    db_session.commit()
+
+    files = {"file": ("new.txt", io.BytesIO(b"New content"), "text/plain")}
+    response = client.put(f"/api/resumes/{resume.id}?background=true", files=files)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["resume_id"] == resume.id
+    db_session.refresh(resume)
+    assert resume.filename == "new.txt"
+    assert resume.extraction_status == "pending"
+
+
+async def test_worker_processes_job(client, upload_dir, session_factory):
+    """Test the worker extracts text and completes the job."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Extracted later"), "text/plain")}
+    job = client.post("/api/resumes/?background=true", files=files).json()
+
+    await IngestionWorker(session_factory=session_factory).process(job["id"])
+
+    async with session_factory() as db:
+        stored_job = await db.get(IngestionJob, job["id"])
+        resume = await db.get(Resume, job["resume_id"])
+        assert stored_job.status == "completed"
+        assert resume.extraction_status == "completed"
+        assert resume.content == "Extracted later"
+
+
+async def test_worker_marks_failed_job(client, db_session, session_factory):
+    """Test the worker records extraction failures on the job."""
+    resume = Resume(
+        filename="missing.txt",
+        original_filename="missing.txt",
+        file_type="txt",
+        file_path="/nonexistent/missing.txt",
+        extraction_status="pending"
+    )
+    job = IngestionJob(resume=resume)
+    db_session.add(job)
+    db_session.commit()
+
+    await IngestionWorker(session_factory=session_factory).process(job.id)
+
+    db_session.expire_all()
+    assert job.status == "failed"
+    assert job.error
+    assert resume.extraction_status == "failed"
+
+
+async def test_worker_start_requeues_unfinished_jobs(db_session, session_factory):
+    """Test queued jobs and jobs whose lease ran out are picked up on start."""
+    now = datetime.now(timezone.utc)
+    resume = Resume(
+        filename="a.txt",
+        original_filename="a.txt",
+        file_type="txt",
+        file_path="/uploads/a.txt"
+    )
+    queued = IngestionJob(resume=resume, status="queued")
+    abandoned = IngestionJob(resume=resume, status="processing", updated_at=now - timedelta(hours=1))
+    running = IngestionJob(resume=resume, status="processing", updated_at=now)
+    done = IngestionJob(resume=resume, status="completed")
+    db_session.add_all([queued, abandoned, running, done])
+    db_session.commit()
+
+    worker = IngestionWorker(session_factory=session_factory, concurrency=0, lease=60)
+    await worker.start()
+    await worker.requeue_unfinished()
+
+    assert worker.queue.qsize() == 2
+    assert sorted(worker._queued) == [queued.id, abandoned.id]
+    await worker.stop()
+
+
+async def test_worker_skips_job_claimed_elsewhere(client, upload_dir, db_session, session_factory):
+    """Test a job another worker holds a live lease on is not run again."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Extracted elsewhere"), "text/plain")}
+    job = client.post("/api/resumes/?background=true", files=files).json()
+    first = IngestionWorker(session_factory=session_factory, lease=60)
+    second = IngestionWorker(session_factory=session_factory, lease=60)
+
+    async with session_factory() as db:
+        assert await first.claim(db, job["id"]) is True
+        assert await second.claim(db, job["id"]) is False
+    await second.process(job["id"])
+
+    resume = db_session.get(Resume, job["resume_id"])
+    assert resume.content is None
+    assert db_session.get(IngestionJob, job["id"]).status == "processing"
+
+
+async def test_worker_takes_over_expired_lease(client, upload_dir, db_session, session_factory):
+    """Test a job left processing past its lease is run by another worker."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Taken over"), "text/plain")}
+    job_id = client.post("/api/resumes/?background=true", files=files).json()["id"]
+    job = db_session.get(IngestionJob, job_id)
+    job.status = "processing"
+    job.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+
+    await IngestionWorker(session_factory=session_factory, lease=60).process(job_id)
+
+    db_session.expire_all()
+    assert job.status == "completed"
+    assert job.resume.content == "Taken over"
+
+
+def test_update_resume_supersedes_unfinished_jobs(client, upload_dir, db_session):
+    """Test replacing the file retires the jobs queued for the old one."""
+    files = {"file": ("old.txt", io.BytesIO(b"Old text"), "text/plain")}
+    old_job = client.post("/api/resumes/?background=true", files=files).json()
+
+    files = {"file": ("new.txt", io.BytesIO(b"New text"), "text/plain")}
+    new_job = client.put(f"/api/resumes/{old_job['resume_id']}?background=true", files=files).json()
+
+    assert client.get(f"/api/resumes/jobs/{old_job['id']}").json()["status"] == "superseded"
+    assert client.get(f"/api/resumes/jobs/{new_job['id']}").json()["status"] == "queued"
+
+
+async def test_worker_discards_text_of_replaced_file(client, upload_dir, db_session, session_factory, monkeypatch):
+    """Test a file replaced while its job runs keeps the new text and supersedes the job."""
+    from app import ingestion
+
+    files = {"file": ("old.txt", io.BytesIO(b"Old text"), "text/plain")}
+    job = client.post("/api/resumes/?background=true", files=files).json()
+    extract_document = ingestion.extract_document
+
+    async def extract_then_replace(file_path, file_type):
+        extracted = await extract_document(file_path, file_type)
+        files = {"file": ("new.txt", io.BytesIO(b"New text"), "text/plain")}
+        assert client.put(f"/api/resumes/{job['resume_id']}", files=files).status_code == status.HTTP_200_OK
+        return extracted
+
+    monkeypatch.setattr(ingestion, "extract_document", extract_then_replace)
+    await IngestionWorker(session_factory=session_factory).process(job["id"])
+
+    resume = client.get(f"/api/resumes/{job['resume_id']}").json()
+    assert resume["original_filename"] == "new.txt"
+    assert resume["content"] == "New text"
+    assert resume["extraction_status"] == "completed"
+    assert db_session.get(IngestionJob, job["id"]).status == "superseded"
@@ -0,0 +1,37 @@
+import io
+from fastapi import status
+
+
+def test_metrics_route_templates(client, upload_dir):
+    """Test request latency is labelled by route template, not raw path."""
+    files = {"file": ("cv.txt", io.BytesIO(b"Metrics resume"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+    client.get(f"/api/resumes/{resume_id}")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/resumes/{resume_id}",status="200"}' in body
+    assert 'route="unmatched"' in body
+    assert f"/api/resumes/{resume_id}\"" not in body
+    assert "upload_size_bytes_count" in body
+    assert 'extraction_pages_count{engine="plain",file_type="txt"}' in body
+
+
+def test_metrics_websocket_connections(client, db_session):
+    """Test open chat sockets are counted per resume."""
+    from app.models import Resume
+
+    resume = Resume(filename="ws.txt", original_filename="ws.txt", file_type="txt", file_path="/tmp/ws.txt")
+    db_session.add(resume)
+    db_session.commit()
+
+    with client.websocket_connect(f"/api/chat/ws/{resume.id}"):
+        during = client.get("/metrics").text
+    after = client.get("/metrics").text
+
+    assert f'websocket_connections{{resume_id="{resume.id}"}} 1.0' in during
+    assert f'websocket_connections{{resume_id="{resume.id}"}} 0.0' in after
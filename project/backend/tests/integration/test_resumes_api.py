@@ -1,7 +1,9 @@
 import pytest
 import io
+import os
 from fastapi import status
-from app.models import Resume
+from sqlalchemy import delete
+from app.models import Resume, ResumePage
 
 
 def test_create_resume_pdf(client, upload_dir):
@@ -151,9 +153,541 @@ def test_delete_resume(client, db_session):
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_get_resume_dossier(client, db_session, query_budget):
+    """Test the dossier bundles the resume, rating, evaluations and latest messages."""
+    from app.models import ChatMessage
+
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a", content="Jane")
+    db_session.add(resume)
+    db_session.commit()
+    for rating in (3.0, 5.0):
+        client.post("/api/evaluations/", json={"resume_id": resume.id, "rating": rating, "evaluator_name": "HR"})
+    for i in range(5):
+        db_session.add(ChatMessage(resume_id=resume.id, username="HR", message=f"m{i}"))
+        db_session.commit()
+
+    with query_budget(3):
+        response = client.get(f"/api/resumes/{resume.id}/dossier?messages=3")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["resume"]["content"] == "Jane"
+    assert data["rating"]["count"] == 2
+    assert data["rating"]["average"] == 4.0
+    assert [e["rating"] for e in data["evaluations"]] == [5.0, 3.0]
+    assert [m["message"] for m in data["chat_messages"]] == ["m2", "m3", "m4"]
+    assert data["has_more_messages"] is True
+
+
+def test_get_resume_dossier_cached_until_evaluated(client, db_session, query_budget):
+    """Test a cached dossier is served without queries and rebuilt after a new evaluation."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+    client.get(f"/api/resumes/{resume.id}/dossier")
+
+    with query_budget(0):
+        assert client.get(f"/api/resumes/{resume.id}/dossier").json()["rating"]["count"] == 0
+
+    client.post("/api/evaluations/", json={"resume_id": resume.id, "rating": 4.0, "evaluator_name": "HR"})
+    data = client.get(f"/api/resumes/{resume.id}/dossier").json()
+
+    assert data["rating"]["count"] == 1
+    assert [e["rating"] for e in data["evaluations"]] == [4.0]
+
+
+def test_get_resume_dossier_empty(client, db_session):
+    """Test an unrated resume without chat has an empty dossier."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+
+    data = client.get(f"/api/resumes/{resume.id}/dossier").json()
+
+    assert data["rating"]["count"] == 0
+    assert data["evaluations"] == []
+    assert data["chat_messages"] == []
+    assert data["has_more_messages"] is False
+    assert client.get("/api/resumes/999/dossier").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_delete_resume_removes_related_rows(client, db_session):
+    """Test deleting a resume removes its evaluations, messages, jobs, pages and rating."""
+    from app.models import ChatMessage, Evaluation, IngestionJob, ResumeRating
+
+    resume = Resume(filename="a.pdf", original_filename="a.pdf", file_type="pdf", file_path="/a.pdf")
+    other = Resume(filename="b.pdf", original_filename="b.pdf", file_type="pdf", file_path="/b.pdf")
+    db_session.add_all([resume, other])
+    db_session.commit()
+    for owner in (resume, other):
+        db_session.add_all([
+            Evaluation(resume_id=owner.id, rating=4.0, evaluator_name="HR"),
+            ChatMessage(resume_id=owner.id, username="HR", message="hi"),
+            IngestionJob(resume_id=owner.id, status="completed"),
+            ResumePage(resume_id=owner.id, page_number=1, text="page"),
+            ResumeRating(resume_id=owner.id, count=1, total=4.0, average=4.0),
+        ])
+    db_session.commit()
+
+    assert client.delete(f"/api/resumes/{resume.id}").status_code == status.HTTP_204_NO_CONTENT
+
+    db_session.expire_all()
+    for model in (Evaluation, ChatMessage, IngestionJob, ResumePage, ResumeRating):
+        assert [row.resume_id for row in db_session.query(model).all()] == [other.id]
+
+
 def test_delete_resume_not_found(client):
     """Test deleting a non-existent resume."""
     response = client.delete("/api/resumes/999")
     
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+
+
+def test_create_resume_pdf_extracts_text(client, upload_dir, sample_pdf):
+    """Test uploaded PDF text is extracted into the resume content."""
+    with open(sample_pdf, "rb") as f:
+        files = {"file": ("extract_me.pdf", f, "application/pdf")}
+        response = client.post("/api/resumes/", files=files)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "Jane Doe" in response.json()["content"]
+
+
+def test_create_resume_extraction_queue_full(client, upload_dir, sample_pdf, monkeypatch):
+    """Test upload returns 503 when the extraction queue is full."""
+    from app import extraction
+    monkeypatch.setattr(extraction, "EXTRACTION_MAX_PENDING", 0)
+
+    with open(sample_pdf, "rb") as f:
+        files = {"file": ("busy.pdf", f, "application/pdf")}
+        response = client.post("/api/resumes/", files=files)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_create_resume_too_large(client, upload_dir, monkeypatch):
+    """Test uploads above the size limit are rejected with 413."""
+    from app import storage
+    monkeypatch.setattr(storage, "MAX_UPLOAD_SIZE", 10)
+    files = {"file": ("big.txt", io.BytesIO(b"x" * 100), "text/plain")}
+
+    response = client.post("/api/resumes/", files=files)
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_create_resume_same_name_does_not_overwrite(client, upload_dir):
+    """Test files with the same name but different bytes are kept apart."""
+    first = client.post(
+        "/api/resumes/", files={"file": ("cv.txt", io.BytesIO(b"First"), "text/plain")}
+    ).json()
+    second = client.post(
+        "/api/resumes/", files={"file": ("cv.txt", io.BytesIO(b"Second"), "text/plain")}
+    ).json()
+
+    assert first["file_path"] != second["file_path"]
+    assert client.get(f"/api/resumes/{first['id']}").json()["content"] == "First"
+    with open(first["file_path"], "rb") as f:
+        assert f.read() == b"First"
+
+
+def test_create_resume_duplicate_reuses_content(client, upload_dir, monkeypatch):
+    """Test re-uploading identical bytes shares the blob and skips extraction."""
+    from app.routers import resumes
+    files = {"file": ("cv.txt", io.BytesIO(b"Same bytes"), "text/plain")}
+    first = client.post("/api/resumes/", files=files).json()
+
+    async def fail_extraction(file_path, file_type):
+        raise AssertionError("extraction should be skipped for duplicates")
+    monkeypatch.setattr(resumes, "extract_text_from_file", fail_extraction)
+
+    files = {"file": ("renamed.txt", io.BytesIO(b"Same bytes"), "text/plain")}
+    response = client.post("/api/resumes/", files=files)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    second = response.json()
+    assert second["id"] != first["id"]
+    assert second["content_hash"] == first["content_hash"]
+    assert second["file_path"] == first["file_path"]
+    assert second["content"] == "Same bytes"
+
+
+def test_delete_resume_keeps_shared_file(client, upload_dir):
+    """Test deleting one of two identical uploads keeps the shared blob."""
+    files = {"file": ("cv.txt", io.BytesIO(b"Shared"), "text/plain")}
+    first = client.post("/api/resumes/", files=files).json()
+    files = {"file": ("cv.txt", io.BytesIO(b"Shared"), "text/plain")}
+    second = client.post("/api/resumes/", files=files).json()
+
+    client.delete(f"/api/resumes/{first['id']}")
+    assert os.path.exists(second["file_path"])
+
+    client.delete(f"/api/resumes/{second['id']}")
+    assert not os.path.exists(second["file_path"])
+
+
+def test_upload_rewrites_blob_deleted_before_commit(client, upload_dir, session_factory, monkeypatch):
+    """Test an upload reusing a blob that a concurrent delete removed writes it again."""
+    from app.routers import resumes
+
+    files = {"file": ("cv.txt", io.BytesIO(b"Shared"), "text/plain")}
+    first = client.post("/api/resumes/", files=files).json()
+    find_extracted_content = resumes.find_extracted_content
+
+    async def delete_first_then_find(db, content_hash, file_type):
+        # The delete commits and releases the blob after the upload found it
+        async with session_factory() as other:
+            await other.execute(delete(Resume).where(Resume.id == first["id"]))
+            await other.commit()
+            await resumes.release_file(other, first["file_path"])
+        return await find_extracted_content(db, content_hash, file_type)
+
+    monkeypatch.setattr(resumes, "find_extracted_content", delete_first_then_find)
+    files = {"file": ("cv.txt", io.BytesIO(b"Shared"), "text/plain")}
+    job = client.post("/api/resumes/?background=true", files=files).json()
+
+    second = client.get(f"/api/resumes/{job['resume_id']}").json()
+    assert second["file_path"] == first["file_path"]
+    with open(second["file_path"], "rb") as f:
+        assert f.read() == b"Shared"
+
+
+def test_delete_keeps_blob_claimed_during_release(client, upload_dir, db_session, monkeypatch):
+    """Test a blob is put back when an identical upload commits while it is being deleted."""
+    from app.routers import resumes
+
+    files = {"file": ("cv.txt", io.BytesIO(b"Shared"), "text/plain")}
+    first = client.post("/api/resumes/", files=files).json()
+    replace = os.replace
+
+    def commit_upload_then_replace(src, dst):
+        if dst.endswith(".deleting"):
+            db_session.add(Resume(
+                filename="cv.txt", original_filename="cv.txt", file_type="txt",
+                file_path=first["file_path"], content_hash=first["content_hash"]
+            ))
+            db_session.commit()
+        replace(src, dst)
+
+    monkeypatch.setattr(resumes.os, "replace", commit_upload_then_replace)
+    client.delete(f"/api/resumes/{first['id']}")
+
+    assert os.path.exists(first["file_path"])
+    assert not [name for name in os.listdir(os.path.dirname(first["file_path"])) if name.endswith(".deleting")]
+
+
+def test_list_resumes_cursor_pagination(client, db_session):
+    """Test keyset pagination walks every resume exactly once, newest first."""
+    for i in range(5):
+        db_session.add(Resume(
+            filename=f"resume{i}.txt",
+            original_filename=f"resume{i}.txt",
+            file_type="txt",
+            file_path=f"/uploads/resume{i}.txt"
+        ))
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/api/resumes/", params=params).json()
+        assert data["total"] is None
+        seen.extend(r["id"] for r in data["resumes"])
+        cursor = data["next_cursor"]
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 5
+    assert cursor is None
+
+
+def test_list_resumes_skip_still_supported(client, db_session):
+    """Test legacy skip/limit paging alongside the cursor."""
+    for i in range(3):
+        db_session.add(Resume(
+            filename=f"resume{i}.txt",
+            original_filename=f"resume{i}.txt",
+            file_type="txt",
+            file_path=f"/uploads/resume{i}.txt"
+        ))
+    db_session.commit()
+
+    data = client.get("/api/resumes/", params={"skip": 2, "limit": 2}).json()
+
+    assert data["total"] == 3
+    assert len(data["resumes"]) == 1
+
+
+def test_list_resumes_query_budget(client, db_session, query_budget):
+    """Test a page costs one query, plus the count when it is not cached."""
+    for i in range(3):
+        db_session.add(Resume(filename=f"{i}.txt", original_filename=f"{i}.txt", file_type="txt", file_path=f"/{i}"))
+    db_session.commit()
+
+    with query_budget(2):
+        client.get("/api/resumes/?fields=rating")
+    with query_budget(1):
+        client.get("/api/resumes/?include_total=false")
+
+
+def test_query_debug_headers(client, monkeypatch):
+    """Test QUERY_DEBUG reports the request's query count and time."""
+    from app import querylog
+
+    assert "X-Query-Count" not in client.get("/api/resumes/999").headers
+    monkeypatch.setattr(querylog, "QUERY_DEBUG", True)
+    response = client.get("/api/resumes/999")
+
+    assert response.headers["X-Query-Count"] == "1"
+    assert float(response.headers["X-Query-Time"]) > 0
+
+
+def test_list_resumes_invalid_cursor(client):
+    """Test a malformed cursor is rejected."""
+    response = client.get("/api/resumes/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_resumes_total_tracks_writes(client, upload_dir):
+    """Test the cached total follows creates and deletes in this process."""
+    assert client.get("/api/resumes/").json()["total"] == 0
+
+    files = {"file": ("a.txt", io.BytesIO(b"A"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+    assert client.get("/api/resumes/").json()["total"] == 1
+
+    client.delete(f"/api/resumes/{resume_id}")
+    assert client.get("/api/resumes/").json()["total"] == 0
+
+
+def test_list_resumes_excludes_content(client, db_session):
+    """Test list items are summaries without the extracted text."""
+    db_session.add(Resume(
+        filename="big.txt",
+        original_filename="big.txt",
+        file_type="txt",
+        file_path="/uploads/big.txt",
+        content="x" * 10000
+    ))
+    db_session.commit()
+
+    item = client.get("/api/resumes/").json()["resumes"][0]
+
+    assert "content" not in item
+    assert item["filename"] == "big.txt"
+
+
+def test_list_resumes_fields_content(client, db_session):
+    """Test heavy fields can be requested explicitly."""
+    db_session.add(Resume(
+        filename="cv.txt",
+        original_filename="cv.txt",
+        file_type="txt",
+        file_path="/uploads/cv.txt",
+        content="Full text"
+    ))
+    db_session.commit()
+
+    response = client.get("/api/resumes/", params={"fields": "content"})
+
+    assert response.json()["resumes"][0]["content"] == "Full text"
+
+
+def test_list_resumes_unknown_field(client):
+    """Test unknown fields are rejected."""
+    response = client.get("/api/resumes/", params={"fields": "content,secret"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in response.json()["detail"]
+
+
+def test_get_resume_conditional(client, upload_dir):
+    """Test a resume is answered with 304 until it is replaced."""
+    files = {"file": ("resume.txt", io.BytesIO(b"First version"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+
+    first = client.get(f"/api/resumes/{resume_id}")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    cached = client.get(f"/api/resumes/{resume_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    files = {"file": ("resume.txt", io.BytesIO(b"Second version"), "text/plain")}
+    client.put(f"/api/resumes/{resume_id}", files=files)
+    changed = client.get(f"/api/resumes/{resume_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.json()["content"] == "Second version"
+    assert changed.headers["etag"] != etag
+
+
+def test_list_resumes_conditional(client, upload_dir):
+    """Test the list gets a body ETag that changes when a resume is added."""
+    client.post("/api/resumes/", files={"file": ("a.txt", io.BytesIO(b"A"), "text/plain")})
+    etag = client.get("/api/resumes/").headers["etag"]
+
+    cached = client.get("/api/resumes/", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post("/api/resumes/", files={"file": ("b.txt", io.BytesIO(b"B"), "text/plain")})
+    changed = client.get("/api/resumes/", headers={"If-None-Match": etag})
+    assert changed.status_code == status.HTTP_200_OK
+    assert len(changed.json()["resumes"]) == 2
+
+
+def test_get_resume_served_from_cache(client, upload_dir):
+    """Test repeated reads hit the response cache until the resume is deleted."""
+    files = {"file": ("resume.txt", io.BytesIO(b"Cached"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+    before = client.get("/cache/stats").json()
+
+    for _ in range(3):
+        assert client.get(f"/api/resumes/{resume_id}").json()["content"] == "Cached"
+    stats = client.get("/cache/stats").json()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 2
+
+    client.delete(f"/api/resumes/{resume_id}")
+    assert client.get(f"/api/resumes/{resume_id}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_download_resume_file(client, upload_dir):
+    """Test the original file is served inline with validators."""
+    files = {"file": ("cv.txt", io.BytesIO(b"Original resume bytes"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+
+    response = client.get(f"/api/resumes/{resume_id}/file")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == b"Original resume bytes"
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["content-disposition"] == 'inline; filename="cv.txt"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "last-modified" in response.headers
+
+
+def test_download_resume_file_range(client, upload_dir):
+    """Test a byte range is answered with 206 and only those bytes."""
+    files = {"file": ("cv.txt", io.BytesIO(b"0123456789"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+
+    response = client.get(f"/api/resumes/{resume_id}/file", headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+
+
+def test_download_resume_file_conditional(client, upload_dir):
+    """Test If-None-Match and If-Modified-Since produce 304s."""
+    files = {"file": ("cv.txt", io.BytesIO(b"Unchanged"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+    first = client.get(f"/api/resumes/{resume_id}/file")
+
+    by_etag = client.get(
+        f"/api/resumes/{resume_id}/file", headers={"If-None-Match": first.headers["etag"]}
+    )
+    by_date = client.get(
+        f"/api/resumes/{resume_id}/file", headers={"If-Modified-Since": first.headers["last-modified"]}
+    )
+    stale = client.get(
+        f"/api/resumes/{resume_id}/file", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    )
+
+    assert by_etag.status_code == status.HTTP_304_NOT_MODIFIED
+    assert by_etag.content == b""
+    assert by_date.status_code == status.HTTP_304_NOT_MODIFIED
+    assert stale.status_code == status.HTTP_200_OK
+
+
+def test_download_resume_file_accel_redirect(client, upload_dir, monkeypatch):
+    """Test requests proxied by nginx are handed back to it with X-Accel-Redirect."""
+    from app.routers import resumes
+
+    monkeypatch.setattr(resumes, "FILE_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+    files = {"file": ("cv.pdf", io.BytesIO(b"%PDF-1.4 bytes"), "application/pdf")}
+    created = client.post("/api/resumes/", files=files)
+    resume_id = created.json()["id"]
+
+    proxied = client.get(
+        f"/api/resumes/{resume_id}/file", headers={"X-Sendfile-Type": "X-Accel-Redirect"}
+    )
+    direct = client.get(f"/api/resumes/{resume_id}/file")
+
+    assert proxied.headers["x-accel-redirect"].startswith("/protected-uploads/blobs/")
+    assert proxied.headers["content-type"] == "application/pdf"
+    assert proxied.content == b""
+    assert direct.content == b"%PDF-1.4 bytes"
+
+
+def test_download_resume_file_missing(client, db_session):
+    """Test a resume whose file is gone is a 404."""
+    resume = Resume(filename="a.pdf", original_filename="a.pdf", file_type="pdf", file_path="/nonexistent/a.pdf")
+    db_session.add(resume)
+    db_session.commit()
+
+    assert client.get(f"/api/resumes/{resume.id}/file").status_code == status.HTTP_404_NOT_FOUND
+    assert client.get("/api/resumes/999/file").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_resume_pages_extracts_on_demand(client, db_session, sample_pdf):
+    """Test only the requested pages are extracted, then served from the table."""
+    resume = Resume(filename="cv.pdf", original_filename="cv.pdf", file_type="pdf", file_path=sample_pdf)
+    db_session.add(resume)
+    db_session.commit()
+
+    response = client.get(f"/api/resumes/{resume.id}/pages?from=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["page_count"] == 2
+    assert [p["page_number"] for p in data["pages"]] == [2]
+    assert "Skills: SQL" in data["pages"][0]["text"]
+    stored = db_session.query(ResumePage).filter_by(resume_id=resume.id).order_by(ResumePage.page_number).all()
+    assert [(p.page_number, p.text is None) for p in stored] == [(1, True), (2, False)]
+
+    both = client.get(f"/api/resumes/{resume.id}/pages?from=1&to=10").json()
+    assert [p["page_number"] for p in both["pages"]] == [1, 2]
+    assert "Jane Doe" in both["pages"][0]["text"]
+
+
+def test_get_resume_pages_stored_on_upload(client, upload_dir, sample_pdf, monkeypatch):
+    """Test a synchronous upload stores every page, so reads need no extraction."""
+    from app import pages
+
+    with open(sample_pdf, "rb") as f:
+        resume_id = client.post("/api/resumes/", files={"file": ("cv.pdf", f, "application/pdf")}).json()["id"]
+
+    async def fail_extraction(*args, **kwargs):
+        raise AssertionError("pages should come from resume_pages")
+
+    monkeypatch.setattr(pages, "extract_pages", fail_extraction)
+    response = client.get(f"/api/resumes/{resume_id}/pages?from=1&to=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "Skills: SQL" in response.json()["pages"][1]["text"]
+
+
+def test_get_resume_pages_txt_and_errors(client, upload_dir):
+    """Test a TXT file is one page and bad ranges are rejected."""
+    files = {"file": ("cv.txt", io.BytesIO(b"Plain resume"), "text/plain")}
+    resume_id = client.post("/api/resumes/", files=files).json()["id"]
+
+    response = client.get(f"/api/resumes/{resume_id}/pages")
+
+    assert response.json() == {
+        "resume_id": resume_id,
+        "page_count": 1,
+        "pages": [{"page_number": 1, "text": "Plain resume"}]
+    }
+    assert client.get(f"/api/resumes/{resume_id}/pages?from=2").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(f"/api/resumes/{resume_id}/pages?from=3&to=2").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get(f"/api/resumes/{resume_id}/pages?from=1&to=100").status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/api/resumes/999/pages").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,128 @@
+import pytest
+from fastapi import status
+from app.models import Resume
+
+
+def add_resume(db_session, name, content):
+    resume = Resume(
+        filename=name,
+        original_filename=name,
+        file_type="txt",
+        file_path=f"/uploads/{name}",
+        content=content
+    )
+    db_session.add(resume)
+    db_session.commit()
+    return resume
+
+
+def test_search_resumes(client, db_session):
+    """Test search returns matching resumes with highlighted snippets."""
+    python_dev = add_resume(db_session, "alice.txt", "Senior Python developer with Django experience")
+    add_resume(db_session, "bob.txt", "Accountant with payroll background")
+
+    response = client.get("/api/resumes/search", params={"q": "python"})
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [r["resume"]["id"] for r in results] == [python_dev.id]
+    assert "<mark>Python</mark>" in results[0]["snippet"]
+    assert "content" not in results[0]["resume"]
+
+
+def test_search_resumes_ranked(client, db_session):
+    """Test filename matches outrank body matches."""
+    body = add_resume(db_session, "cv.txt", "Worked alongside a kotlin team")
+    named = add_resume(db_session, "kotlin-engineer.txt", "Mobile engineer")
+
+    results = client.get("/api/resumes/search", params={"q": "kotlin"}).json()["results"]
+
+    assert [r["resume"]["id"] for r in results] == [named.id, body.id]
+    assert results[0]["rank"] >= results[1]["rank"]
+
+
+def test_search_resumes_pagination(client, db_session):
+    """Test search results are paginated with next_skip."""
+    for i in range(3):
+        add_resume(db_session, f"r{i}.txt", "golang engineer")
+
+    first = client.get("/api/resumes/search", params={"q": "golang", "limit": 2}).json()
+    second = client.get(
+        "/api/resumes/search", params={"q": "golang", "limit": 2, "skip": first["next_skip"]}
+    ).json()
+
+    assert len(first["results"]) == 2
+    assert first["next_skip"] == 2
+    assert len(second["results"]) == 1
+    assert second["next_skip"] is None
+
+
+def test_search_resumes_tracks_updates_and_deletes(client, db_session):
+    """Test the index follows content changes and deletions."""
+    resume = add_resume(db_session, "cv.txt", "rust developer")
+    resume.content = "haskell developer"
+    db_session.commit()
+
+    assert client.get("/api/resumes/search", params={"q": "rust"}).json()["results"] == []
+    assert len(client.get("/api/resumes/search", params={"q": "haskell"}).json()["results"]) == 1
+
+    db_session.delete(resume)
+    db_session.commit()
+    assert client.get("/api/resumes/search", params={"q": "haskell"}).json()["results"] == []
+
+
+def test_search_resumes_special_characters(client, db_session):
+    """Test query syntax characters are treated as plain text."""
+    add_resume(db_session, "cv.txt", "C developer")
+
+    response = client.get("/api/resumes/search", params={"q": '"unbalanced AND ('})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == []
+
+
+def test_search_resumes_requires_query(client):
+    """Test an empty query is rejected."""
+    response = client.get("/api/resumes/search", params={"q": ""})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.fixture
+def memory_index(monkeypatch, upload_dir):
+    """Enable the in-process search index with a fresh, empty index."""
+    from app.search import service
+    from app.search.index import InvertedIndex
+    monkeypatch.setattr(service, "SEARCH_INDEX_ENABLED", True)
+    monkeypatch.setattr(service, "resume_index", InvertedIndex())
+    return service
+
+
+def test_search_memory_engine_follows_uploads(client, memory_index):
+    """Test uploads, replacements and deletes are reflected in the memory index."""
+    created = client.post(
+        "/api/resumes/",
+        files={"file": ("cv.txt", b"Elixir and Phoenix engineer", "text/plain")}
+    ).json()
+    params = {"q": "elixir", "engine": "memory"}
+
+    results = client.get("/api/resumes/search", params=params).json()["results"]
+    assert [r["resume"]["id"] for r in results] == [created["id"]]
+    assert results[0]["snippet"] is None
+
+    client.put(
+        f"/api/resumes/{created['id']}",
+        files={"file": ("cv.txt", b"Scala engineer", "text/plain")}
+    )
+    assert client.get("/api/resumes/search", params=params).json()["results"] == []
+
+    client.delete(f"/api/resumes/{created['id']}")
+    response = client.get("/api/resumes/search", params={"q": "scala", "engine": "memory"})
+    assert response.json()["results"] == []
+
+
+def test_search_memory_engine_disabled(client):
+    """Test the memory engine is rejected unless the index is enabled."""
+    response = client.get("/api/resumes/search", params={"q": "python", "engine": "memory"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,52 @@
+import pytest
+from app.broadcast import MemoryBroadcast, PostgresBroadcast, PayloadTooLarge, create_broadcast
+
+
+async def test_memory_broadcast_delivers_to_subscribers():
+    """Test published messages reach every subscriber."""
+    backend = MemoryBroadcast()
+    received = []
+
+    async def first(message):
+        received.append(("first", message))
+
+    async def second(message):
+        received.append(("second", message))
+
+    backend.subscribe(first)
+    backend.subscribe(second)
+    await backend.publish({"resume_id": 1})
+
+    assert received == [("first", {"resume_id": 1}), ("second", {"resume_id": 1})]
+
+
+async def test_failing_subscriber_does_not_block_others():
+    """Test an exception in one subscriber still lets the others run."""
+    backend = MemoryBroadcast()
+    received = []
+
+    async def broken(message):
+        raise RuntimeError("boom")
+
+    async def working(message):
+        received.append(message)
+
+    backend.subscribe(broken)
+    backend.subscribe(working)
+    await backend.publish({"resume_id": 1})
+
+    assert received == [{"resume_id": 1}]
+
+
+async def test_postgres_broadcast_rejects_oversized_payload():
+    """Test payloads over the NOTIFY limit are refused before hitting the database."""
+    backend = PostgresBroadcast("postgresql://unused", publish_engine=None)
+
+    with pytest.raises(PayloadTooLarge):
+        await backend.publish({"message": "x" * 10000})
+
+
+def test_create_broadcast_unknown_backend():
+    """Test an unknown backend name is rejected."""
+    with pytest.raises(ValueError):
+        create_broadcast("redis")
@@ -0,0 +1,112 @@
+from app import cache
+from app.broadcast import MemoryBroadcast
+from app.cache import ENTRY_OVERHEAD, LRUCache
+
+
+def put(lru, key, size=100):
+    lru.set(key, f"value of {key}", size, lru.version(key[0]))
+
+
+def test_get_counts_hits_and_misses():
+    """Test lookups are counted and stored values come back."""
+    lru = LRUCache(max_bytes=10_000, ttl=60, enabled=True)
+    put(lru, ("resume:1",))
+
+    assert lru.get(("resume:1",)) == "value of ('resume:1',)"
+    assert lru.get(("resume:2",)) is None
+    stats = lru.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes"] == 100 + ENTRY_OVERHEAD
+
+
+def test_evicts_least_recently_used_over_byte_budget():
+    """Test the byte budget evicts the entry used longest ago."""
+    lru = LRUCache(max_bytes=3 * (100 + ENTRY_OVERHEAD), ttl=60, enabled=True)
+    for i in range(3):
+        put(lru, (f"resume:{i}",))
+    lru.get(("resume:0",))
+    put(lru, ("resume:3",))
+
+    assert lru.get(("resume:1",)) is None
+    assert lru.get(("resume:0",)) is not None
+    assert lru.stats()["evictions"] == 1
+    assert lru.bytes <= lru.max_bytes
+
+
+def test_skips_values_larger_than_budget():
+    """Test a value that can never fit is not stored."""
+    lru = LRUCache(max_bytes=1000, ttl=60, enabled=True)
+    put(lru, ("resume:1",), size=5000)
+
+    assert lru.stats()["entries"] == 0
+
+
+def test_entries_expire(monkeypatch):
+    """Test entries are not served after the TTL."""
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    lru = LRUCache(max_bytes=10_000, ttl=5, enabled=True)
+    put(lru, ("resume:1",))
+
+    now[0] += 4
+    assert lru.get(("resume:1",)) is not None
+    now[0] += 2
+    assert lru.get(("resume:1",)) is None
+    assert lru.bytes == 0
+
+
+def test_invalidate_drops_every_variant_and_stale_loads():
+    """Test invalidating a tag drops its keys and rejects values loaded before it."""
+    lru = LRUCache(max_bytes=10_000, ttl=60, enabled=True)
+    put(lru, ("chat:1", None, None, 100))
+    put(lru, ("chat:1", 50, None, 100))
+    put(lru, ("chat:2", None, None, 100))
+    version = lru.version("chat:1")
+
+    lru.invalidate_local("chat:1")
+    lru.set(("chat:1", None, None, 100), "loaded before the write", 10, version)
+
+    assert lru.get(("chat:1", None, None, 100)) is None
+    assert lru.get(("chat:1", 50, None, 100)) is None
+    assert lru.get(("chat:2", None, None, 100)) is not None
+
+
+
+def test_forgotten_tag_versions_still_reject_stale_loads(monkeypatch):
+    """Test tag versions stay bounded and a load that saw a forgotten version is not stored."""
+    monkeypatch.setattr(cache, "MAX_TAG_VERSIONS", 10)
+    lru = LRUCache(max_bytes=10_000, ttl=60, enabled=True)
+    version = lru.version("resume:0")
+
+    lru.invalidate_local("resume:0")
+    for i in range(1, 100):
+        lru.invalidate_local(f"resume:{i}")
+    lru.set(("resume:0",), "loaded before the write", 10, version)
+
+    assert len(lru._versions) == 10
+    assert lru.stats()["tag_versions"] == 10
+    assert lru.get(("resume:0",)) is None
+    put(lru, ("resume:0",))
+    assert lru.get(("resume:0",)) is not None
+
+async def test_invalidation_reaches_other_workers():
+    """Test an invalidation published by one cache clears another on the channel."""
+    channel = MemoryBroadcast()
+    first = LRUCache(max_bytes=10_000, ttl=60, enabled=True, channel=channel)
+    second = LRUCache(max_bytes=10_000, ttl=60, enabled=True, channel=channel)
+    put(first, ("resume:1",))
+    put(second, ("resume:1",))
+
+    await first.invalidate("resume:1")
+
+    assert first.get(("resume:1",)) is None
+    assert second.get(("resume:1",)) is None
+    assert first.stats()["invalidations"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    """Test CACHE_ENABLED=false turns the cache into a no-op."""
+    lru = LRUCache(max_bytes=10_000, ttl=60, enabled=False)
+    put(lru, ("resume:1",))
+
+    assert lru.get(("resume:1",)) is None
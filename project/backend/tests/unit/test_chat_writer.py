@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from sqlalchemy.exc import DataError, OperationalError
+from app.chat_writer import ChatBufferFull, ChatWriter
+from app.models import ChatMessage, Resume
+
+
+def add_resume(db_session):
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+    return resume
+
+
+async def test_messages_are_buffered_until_flush(db_session, session_factory):
+    """Test added messages get ids immediately but are stored on flush."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True, flush_size=2)
+
+    messages = [await writer.add(resume.id, "Alice", f"message {i}") for i in range(5)]
+
+    assert [m.id for m in messages] == [1, 2, 3, 4, 5]
+    assert messages[0].created_at is not None
+    assert db_session.query(ChatMessage).count() == 0
+
+    await writer.flush()
+
+    stored = db_session.query(ChatMessage).order_by(ChatMessage.id).all()
+    assert [(m.id, m.message) for m in stored] == [(m.id, m.message) for m in messages]
+
+
+async def test_ids_continue_after_existing_messages(db_session, session_factory):
+    """Test ids do not collide with messages already in the table."""
+    resume = add_resume(db_session)
+    db_session.add(ChatMessage(resume_id=resume.id, username="Bob", message="earlier"))
+    db_session.commit()
+    writer = ChatWriter(session_factory, enabled=True)
+
+    message = await writer.add(resume.id, "Alice", "later")
+    await writer.flush()
+
+    assert message.id == 2
+    assert db_session.query(ChatMessage).count() == 2
+
+
+async def test_background_task_flushes_on_interval(db_session, session_factory):
+    """Test the background task writes messages without an explicit flush."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True, flush_interval=0.01)
+    await writer.start()
+
+    await writer.add(resume.id, "Alice", "hello")
+    await asyncio.sleep(0.2)
+
+    assert db_session.query(ChatMessage).count() == 1
+    await writer.stop()
+
+
+async def test_stop_flushes_buffer(db_session, session_factory):
+    """Test stopping the writer stores everything still buffered."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True, flush_interval=60)
+    await writer.start()
+
+    await writer.add(resume.id, "Alice", "bye")
+    await writer.stop()
+
+    assert db_session.query(ChatMessage).count() == 1
+
+
+async def test_refused_rows_are_dropped_and_the_rest_stored(db_session, session_factory, monkeypatch):
+    """Test a row the database refuses is dropped without holding up the others."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True)
+    insert = writer._insert
+
+    async def refuse_bad_rows(batch):
+        if any(row["message"] == "bad\x00" for row in batch):
+            raise DataError("INSERT", {}, Exception("invalid byte sequence"))
+        await insert(batch)
+
+    monkeypatch.setattr(writer, "_insert", refuse_bad_rows)
+    for text in ("first", "bad\x00", "last"):
+        await writer.add(resume.id, "Alice", text)
+    await writer.flush()
+
+    assert writer._buffer == []
+    assert [m.message for m in db_session.query(ChatMessage).order_by(ChatMessage.id)] == ["first", "last"]
+
+
+async def test_unreachable_database_keeps_batch_buffered(db_session, session_factory, monkeypatch):
+    """Test a connection failure leaves the batch for the next flush instead of dropping it."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True)
+    await writer.add(resume.id, "Alice", "hello")
+
+    async def unreachable(batch):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(writer, "_insert", unreachable)
+    await writer.flush()
+    assert len(writer._buffer) == 1
+
+    monkeypatch.undo()
+    await writer.flush()
+    assert db_session.query(ChatMessage).count() == 1
+
+
+async def test_full_buffer_refuses_new_messages(db_session, session_factory, monkeypatch):
+    """Test messages are refused, not buffered without bound, while flushes fail."""
+    resume = add_resume(db_session)
+    writer = ChatWriter(session_factory, enabled=True, max_buffered=2)
+
+    async def unreachable(batch):
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(writer, "_insert", unreachable)
+    await writer.add(resume.id, "Alice", "one")
+    await writer.add(resume.id, "Alice", "two")
+
+    with pytest.raises(ChatBufferFull):
+        await writer.add(resume.id, "Alice", "three")
+    assert len(writer._buffer) == 2
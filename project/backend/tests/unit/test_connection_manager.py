@@ -0,0 +1,89 @@
+import asyncio
+from app.broadcast import MemoryBroadcast
+from app.routers import chat
+from app.routers.chat import ConnectionManager, SLOW_CLIENT_CLOSE_CODE
+
+
+class FakeWebSocket:
+    """Records sent frames; ``blocked`` sockets never finish a send."""
+
+    def __init__(self, blocked=False, broken=False):
+        self.blocked = blocked
+        self.broken = broken
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.broken:
+            raise ConnectionResetError("gone")
+        if self.blocked:
+            await asyncio.Event().wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_slow_client_does_not_delay_others(monkeypatch):
+    """Test a stalled socket is dropped on overflow while others keep receiving."""
+    monkeypatch.setattr(chat, "CHAT_SEND_QUEUE_SIZE", 2)
+    manager = ConnectionManager(MemoryBroadcast())
+    fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+    await manager.connect(fast, 1)
+    await manager.connect(slow, 1)
+
+    for i in range(5):
+        await manager.broadcast({"id": i}, 1)
+        await settle()
+
+    assert fast.sent == [f'{{"id": {i}}}' for i in range(5)]
+    assert slow not in manager.active_connections[1]
+    assert slow.closed_with == SLOW_CLIENT_CLOSE_CODE
+
+
+async def test_send_timeout_drops_client(monkeypatch):
+    """Test a send that exceeds the timeout disconnects the client."""
+    monkeypatch.setattr(chat, "CHAT_SEND_TIMEOUT", 0.01)
+    manager = ConnectionManager(MemoryBroadcast())
+    slow = FakeWebSocket(blocked=True)
+    await manager.connect(slow, 1)
+
+    await manager.broadcast({"id": 1}, 1)
+    await asyncio.sleep(0.05)
+
+    assert 1 not in manager.active_connections
+    assert slow.closed_with == SLOW_CLIENT_CLOSE_CODE
+
+
+async def test_failed_socket_is_removed():
+    """Test a socket whose send fails is removed from the manager."""
+    manager = ConnectionManager(MemoryBroadcast())
+    broken = FakeWebSocket(broken=True)
+    await manager.connect(broken, 1)
+
+    await manager.broadcast({"id": 1}, 1)
+    await settle()
+
+    assert 1 not in manager.active_connections
+
+
+async def test_disconnect_stops_sender():
+    """Test disconnecting cancels the client's sender task."""
+    manager = ConnectionManager(MemoryBroadcast())
+    websocket = FakeWebSocket()
+    client = await manager.connect(websocket, 1)
+
+    manager.disconnect(websocket, 1)
+    manager.disconnect(websocket, 1)
+    await settle()
+
+    assert client.sender.cancelled()
+    assert manager.active_connections == {}
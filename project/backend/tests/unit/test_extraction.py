@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app import extraction
+from app.extraction import extract_document, extract_pages, ExtractionQueueFull
+from app.extractors import Extractor, get_extractor
+
+
+class HangingExtractor(Extractor):
+    """A PDF engine that never returns, like a parser stuck in a loop."""
+    name = "hang"
+    file_type = "pdf"
+
+    def extract_pages(self, file_path, first=1, last=None):
+        while True:
+            pass
+
+
+async def test_extract_pdf_document(sample_pdf):
+    """Test PDF text is extracted in the process pool, one line per page."""
+    extracted = await extract_document(sample_pdf, "pdf")
+    text = extracted.content
+
+    assert len(extracted.pages) == 2
+    assert "Jane Doe" in text
+    assert "Python developer" in text
+    assert "Skills: SQL" in text
+
+
+async def test_extract_pdf_queue_full(sample_pdf, monkeypatch):
+    """Test extraction is refused when the queue depth limit is reached."""
+    monkeypatch.setattr(extraction, "EXTRACTION_MAX_PENDING", 0)
+
+    with pytest.raises(ExtractionQueueFull):
+        await extract_document(sample_pdf, "pdf")
+
+
+async def test_extract_pdf_timeout(sample_pdf):
+    """Test a file that exceeds the timeout raises TimeoutError."""
+    with pytest.raises(asyncio.TimeoutError):
+        await extract_pages(sample_pdf, get_extractor("pdf"), timeout=0)
+
+
+async def test_extract_pdf_timeout_frees_the_worker(sample_pdf, monkeypatch):
+    """Test a file that never finishes is killed, so the pool takes new files."""
+    from app import extractors
+
+    hanging = HangingExtractor()
+    monkeypatch.setitem(extractors._registry["pdf"], hanging.name, hanging)
+    monkeypatch.setattr(extraction, "EXTRACTION_WORKERS", 1)
+    # Fork the workers after the engine is registered
+    extraction.shutdown_executor()
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await extract_pages(sample_pdf, hanging, timeout=0.5)
+
+        page_count, _ = await extract_pages(sample_pdf, get_extractor("pdf"), timeout=10)
+    finally:
+        extraction.shutdown_executor()
+
+    assert page_count == 2
+    assert extraction._pending == 0
+
+
+async def test_extract_pdf_pages_range(sample_pdf):
+    """Test a page range is extracted alone, with the document's page count."""
+    page_count, pages = await extract_pages(sample_pdf, get_extractor("pdf"), 2, 5)
+
+    assert page_count == 2
+    assert len(pages) == 1
+    assert "Skills: SQL" in pages[0]
+    assert "Jane Doe" not in pages[0]
+
+
+async def test_extract_pdf_pages_configured_engine(sample_pdf, monkeypatch):
+    """Test the process pool runs the engine selected for the deployment."""
+    pytest.importorskip("pypdf")
+    from app import extractors
+    monkeypatch.setitem(extractors._selected, "pdf", "pypdf")
+
+    page_count, pages = await extract_pages(sample_pdf, get_extractor("pdf"))
+
+    assert extractors.get_extractor("pdf").name == "pypdf"
+    assert page_count == 2
+    assert "Jane Doe" in pages[0]
@@ -0,0 +1,45 @@
+import pytest
+from app import extractors
+from app.extractors import engines, get_extractor, lookup, parse_engines
+
+
+@pytest.mark.parametrize("engine", [e.name for e in engines("pdf")])
+def test_pdf_engines_extract_page_range(engine, sample_pdf):
+    """Test every installed PDF engine returns the page count and only the requested pages."""
+    extractor = extractors._registry["pdf"][engine]
+    if not extractor.available():
+        pytest.skip(f"{extractor.requires} is not installed")
+
+    page_count, pages = extractor.extract_pages(sample_pdf, 2, 5)
+
+    assert page_count == 2
+    assert len(pages) == 1
+    assert "Skills: SQL" in pages[0]
+    assert "Jane Doe" not in pages[0]
+
+
+def test_plain_text_engine(tmp_path):
+    """Test TXT files are a single unpaged page read in a thread."""
+    path = tmp_path / "cv.txt"
+    path.write_text("Plain résumé", encoding="utf-8")
+    extractor = get_extractor("txt")
+
+    assert extractor.extract_pages(str(path)) == (1, ["Plain résumé"])
+    assert not extractor.paged
+    assert not extractor.cpu_bound
+
+
+def test_default_engines():
+    """Test PyPDF2 is the default PDF engine and unknown types have none."""
+    assert get_extractor("pdf").name == "pypdf2"
+    assert get_extractor("PDF").name == "pypdf2"
+    assert get_extractor("docx") is None
+
+
+def test_parse_engines():
+    """Test EXTRACTION_ENGINES parsing and unknown engine names."""
+    assert parse_engines("pdf=pypdf, txt=plain,") == {"pdf": "pypdf", "txt": "plain"}
+    with pytest.raises(ValueError):
+        parse_engines("pdf")
+    with pytest.raises(ValueError):
+        lookup("pdf", "no-such-engine")
@@ -0,0 +1,24 @@
+import pytest
+from app.http_cache import etag_matches, make_etag
+
+
+def test_make_etag_is_strong_and_stable():
+    """Test ETags are quoted, deterministic and depend on every part."""
+    etag = make_etag("/api/resumes/1", [1, "completed"])
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("/api/resumes/1", [1, "completed"])
+    assert etag != make_etag("/api/resumes/1", [1, "failed"])
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+])
+def test_etag_matches(header, expected):
+    """Test If-None-Match lists, wildcards and weak comparison."""
+    assert etag_matches(header, '"abc"') is expected
@@ -0,0 +1,31 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.metrics import _operation, instrument_engine
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_instrument_engine_times_statements(tmp_path):
+    """Test statements are timed by operation and pool checkouts are balanced."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine)
+    selects = sample("db_query_duration_seconds_count", operation="SELECT")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert sample("db_pool_checked_out") >= 1
+    await engine.dispose()
+
+    assert sample("db_query_duration_seconds_count", operation="SELECT") == selects + 1
+    assert sample("db_pool_checked_out") == 0
+
+
+def test_operation_labels():
+    """Test SQL statements map onto a small fixed label set."""
+    assert _operation("  select * from resumes") == "SELECT"
+    assert _operation("INSERT INTO evaluations VALUES (1)") == "INSERT"
+    assert _operation("PRAGMA foreign_keys=ON") == "OTHER"
+    assert _operation("") == "OTHER"
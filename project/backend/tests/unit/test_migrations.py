@@ -0,0 +1,51 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app.database import Base
+from app.schema import alembic_config, include_object, upgrade
+
+
+def test_migrations_match_models(tmp_path):
+    """Test the migrated schema matches the models and downgrades cleanly."""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    upgrade(url)
+    engine = create_engine(url)
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_object": include_object})
+        assert compare_metadata(context, Base.metadata) == []
+        assert "resumes_fts" in inspect(conn).get_table_names()
+
+    command.downgrade(alembic_config(url), "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+
+def test_migrations_adopt_unversioned_database(tmp_path):
+    """Test an un-stamped baseline database with data is upgraded in place."""
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    upgrade(url, "0001")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE alembic_version"))
+        conn.execute(text("CREATE INDEX idx_evaluations_resume_id ON evaluations (resume_id)"))
+        conn.execute(text(
+            "INSERT INTO resumes (id, filename, original_filename, file_type, file_path, content) "
+            "VALUES (1, 'a.txt', 'a.txt', 'txt', '/a', 'Python developer')"
+        ))
+        conn.execute(text(
+            "INSERT INTO evaluations (resume_id, rating, evaluator_name) VALUES (1, 4.5, 'HR'), (1, 2.0, 'HR')"
+        ))
+
+    upgrade(url)
+
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_object": include_object})
+        assert compare_metadata(context, Base.metadata) == []
+        assert "idx_evaluations_resume_id" not in {i["name"] for i in inspect(conn).get_indexes("evaluations")}
+        assert conn.execute(text("SELECT extraction_status FROM resumes")).scalar_one() == "completed"
+        rating = conn.execute(text("SELECT count, average, bucket_2, bucket_5 FROM resume_ratings")).one()
+        assert tuple(rating) == (2, 3.25, 1, 1)
+        assert conn.execute(text("SELECT rowid FROM resumes_fts WHERE resumes_fts MATCH 'python'")).scalar_one() == 1
+    engine.dispose()
@@ -0,0 +1,63 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.querylog import instrument_engine, record_queries
+
+
+async def test_record_queries_nested_and_per_task(tmp_path):
+    """Test nested recorders also count into their parent and tasks stay separate."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'querylog.db'}")
+    instrument_engine(engine)
+
+    async def run(statements):
+        with record_queries(keep_statements=True) as stats:
+            async with engine.connect() as conn:
+                for _ in range(statements):
+                    await conn.execute(text("SELECT 1"))
+                    await asyncio.sleep(0)
+        return stats
+
+    with record_queries() as outer:
+        one, three = await asyncio.gather(run(1), run(3))
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    assert (one.count, three.count) == (1, 3)
+    assert three.statements == ["SELECT 1"] * 3
+    assert outer.count == 4
+    assert outer.seconds >= three.seconds > 0
+
+
+async def test_failed_statement_does_not_skew_headers(tmp_path, monkeypatch):
+    """Test a failing statement is counted and leaves no start time on its connection."""
+    from sqlalchemy.exc import OperationalError
+    from app import querylog
+
+    monkeypatch.setattr(querylog, "QUERY_DEBUG", True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'querylog.db'}")
+    instrument_engine(engine)
+    leftover = []
+
+    async def app(scope, receive, send):
+        async with engine.connect() as conn:
+            try:
+                await conn.execute(text("SELECT * FROM missing_table"))
+            except OperationalError:
+                pass
+            leftover.extend(conn.sync_connection.info.get("querylog_start", []))
+            await conn.execute(text("SELECT 1"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await querylog.QueryCountMiddleware(app)({"type": "http"}, None, send)
+    await engine.dispose()
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-query-count"] == b"2"
+    assert leftover == []
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import select
+from app.models import Evaluation, Resume, ResumeRating
+from app.ratings import rating_star, rebuild_ratings
+
+
+@pytest.mark.parametrize("rating,star", [(1.0, 1), (1.49, 1), (1.5, 2), (3.4, 3), (4.5, 5), (5.0, 5)])
+def test_rating_star(rating, star):
+    """Test ratings fall into the nearest star bucket, halves rounding up."""
+    assert rating_star(rating) == star
+
+
+async def test_rebuild_ratings_matches_evaluations(db_session, session_factory):
+    """Test rebuilding aggregates from scratch uses the same buckets."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+    for rating in (1.2, 2.5, 4.5, 4.4):
+        db_session.add(Evaluation(resume_id=resume.id, rating=rating, evaluator_name="HR"))
+    db_session.commit()
+
+    async with session_factory() as db:
+        await rebuild_ratings(db)
+        await db.commit()
+        summary = (await db.execute(select(ResumeRating))).scalar_one()
+
+    assert summary.count == 4
+    assert summary.average == pytest.approx(3.15)
+    assert (summary.min_rating, summary.max_rating) == (1.2, 4.5)
+    assert summary.histogram == {1: 1, 2: 0, 3: 1, 4: 1, 5: 1}
+
+
+async def test_rebuild_ratings_replaces_stale_rows(db_session, session_factory):
+    """Test a rebuild drops aggregates that no longer match any evaluation."""
+    resume = Resume(filename="a.txt", original_filename="a.txt", file_type="txt", file_path="/a")
+    db_session.add(resume)
+    db_session.commit()
+    db_session.add(ResumeRating(resume_id=resume.id, count=7, total=21.0, average=3.0))
+    db_session.commit()
+
+    async with session_factory() as db:
+        await rebuild_ratings(db)
+        await db.commit()
+
+    assert db_session.query(ResumeRating).count() == 0
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from app.models import Resume
+from app.search import service
+from app.search.index import InvertedIndex
+from app.search.tokenizer import tokenize
+
+
+def test_tokenize():
+    """Test tokens are lowercased with stopwords and single letters dropped."""
+    assert tokenize("The Python developer, a C# and Go-lang fan") == [
+        "python", "developer", "go", "lang", "fan"
+    ]
+
+
+def test_search_ranks_by_bm25():
+    """Test denser matches in shorter documents rank first."""
+    index = InvertedIndex()
+    index.add(1, "python python django")
+    index.add(2, "python developer with many years of java spring kotlin experience")
+    index.add(3, "accountant")
+
+    results = index.search("python")
+
+    assert [resume_id for resume_id, _ in results] == [1, 2]
+    assert results[0][1] > results[1][1]
+
+
+def test_search_limit_and_offset():
+    """Test results can be paged through."""
+    index = InvertedIndex()
+    for resume_id in range(5):
+        index.add(resume_id, "golang " * (resume_id + 1))
+
+    first = index.search("golang", limit=2)
+    second = index.search("golang", limit=2, offset=2)
+
+    assert [r for r, _ in first] == [4, 3]
+    assert [r for r, _ in second] == [2, 1]
+
+
+def test_add_replaces_and_remove_deletes():
+    """Test re-indexing replaces old text and removed resumes stop matching."""
+    index = InvertedIndex()
+    index.add(1, "python")
+    index.add(2, "python")
+    index.add(1, "rust")
+
+    assert [r for r, _ in index.search("python")] == [2]
+    assert [r for r, _ in index.search("rust")] == [1]
+
+    index.remove(2)
+    assert index.search("python") == []
+    assert len(index) == 1
+
+
+def test_compaction_keeps_results():
+    """Test tombstones are compacted without changing results."""
+    index = InvertedIndex()
+    for resume_id in range(8):
+        index.add(resume_id, f"engineer term{resume_id}")
+    for resume_id in range(4):
+        index.remove(resume_id)
+
+    assert len(index._doc_ids) < 8
+    assert sorted(r for r, _ in index.search("engineer", limit=10)) == [4, 5, 6, 7]
+    assert index.search("term1") == []
+    assert [r for r, _ in index.search("term6")] == [6]
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test a loaded snapshot answers like the original and accepts updates."""
+    path = str(tmp_path / "index.bin")
+    index = InvertedIndex()
+    index.add(10, "senior python developer")
+    index.add(11, "python data engineer")
+    index.add(12, "to be removed")
+    index.remove(12)
+    index.save(path)
+
+    loaded = InvertedIndex.load(path)
+
+    assert len(loaded) == 2
+    assert loaded.search("python") == index.search("python")
+    loaded.add(13, "python intern")
+    loaded.remove(10)
+    assert sorted(r for r, _ in loaded.search("python")) == [11, 13]
+    # The snapshot itself is untouched
+    assert len(InvertedIndex.load(path)) == 2
+
+
+async def test_warm_start_replays_changes(tmp_path, db_session, session_factory, monkeypatch):
+    """Test warm start applies rows changed or deleted after the snapshot."""
+    monkeypatch.setattr(service, "resume_index", InvertedIndex())
+    path = str(tmp_path / "index.bin")
+    kept = Resume(filename="a.txt", original_filename="a.txt", file_type="txt",
+                  file_path="/a", content="python developer")
+    deleted = Resume(filename="b.txt", original_filename="b.txt", file_type="txt",
+                     file_path="/b", content="python tester")
+    db_session.add_all([kept, deleted])
+    db_session.commit()
+
+    index = InvertedIndex()
+    index.add(kept.id, "python developer")
+    index.add(deleted.id, "python tester")
+    index.save(path)
+
+    db_session.delete(deleted)
+    kept.content = "rust developer"
+    kept.updated_at = datetime.now(timezone.utc) + timedelta(seconds=1)
+    db_session.commit()
+
+    await service.warm_start(session_factory, path)
+
+    assert service.search_index("python", 10, 0) == []
+    assert [r for r, _ in service.search_index("rust", 10, 0)] == [kept.id]
@@ -0,0 +1,56 @@
+import hashlib
+import io
+import os
+import pytest
+from fastapi import UploadFile
+from app import storage
+from app.storage import save_blob, blob_path, UploadTooLarge
+
+
+async def test_save_blob_streams_in_chunks(tmp_path, monkeypatch):
+    """Test upload is copied chunk by chunk and hashed on the fly."""
+    monkeypatch.setattr(storage, "UPLOAD_CHUNK_SIZE", 4)
+    data = b"0123456789abcdef" * 3
+    upload = UploadFile(file=io.BytesIO(data), filename="resume.txt")
+
+    stored = await save_blob(upload, str(tmp_path))
+
+    with open(stored.path, "rb") as f:
+        assert f.read() == data
+    assert stored.size == len(data)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+
+
+async def test_save_blob_too_large(tmp_path):
+    """Test oversized uploads are rejected and leave no files behind."""
+    upload = UploadFile(file=io.BytesIO(b"x" * 100), filename="big.txt")
+
+    with pytest.raises(UploadTooLarge):
+        await save_blob(upload, str(tmp_path), max_size=10)
+
+    assert os.listdir(tmp_path / "blobs") == []
+
+
+async def test_save_blob_content_addressed(tmp_path):
+    """Test blobs are stored under a sharded path named by their hash."""
+    data = b"resume bytes"
+    sha256 = hashlib.sha256(data).hexdigest()
+    upload = UploadFile(file=io.BytesIO(data), filename="cv.pdf")
+
+    stored = await save_blob(upload, str(tmp_path))
+
+    assert stored.path == blob_path(str(tmp_path), sha256)
+    assert stored.path.endswith(os.path.join(sha256[:2], sha256[2:4], sha256))
+    assert stored.created is True
+    with open(stored.path, "rb") as f:
+        assert f.read() == data
+
+
+async def test_save_blob_deduplicates(tmp_path):
+    """Test storing identical bytes twice reuses the existing blob."""
+    first = await save_blob(UploadFile(file=io.BytesIO(b"same"), filename="a.txt"), str(tmp_path))
+    second = await save_blob(UploadFile(file=io.BytesIO(b"same"), filename="b.txt"), str(tmp_path))
+
+    assert second.path == first.path
+    assert second.created is False
+    assert [name for name in os.listdir(tmp_path / "blobs") if name.endswith(".part")] == []
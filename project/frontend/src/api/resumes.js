@@ -36,6 +36,15 @@ export const resumeApi = {
     return response.data
   },
 
+  // Get a resume with its rating, evaluations and latest chat messages
+  getDossier: async (id) => {
+    const response = await api.get(`/resumes/${id}/dossier`)
+    return response.data
+  },
+
+  // URL of the original uploaded file (opened directly by the browser)
+  fileUrl: (id) => `${API_BASE_URL}/resumes/${id}/file`,
+
   // Upload a new resume
   create: async (file) => {
     const formData = new FormData()
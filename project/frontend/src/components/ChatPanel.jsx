@@ -1,21 +1,51 @@
 import { useState, useEffect, useRef } from 'react'
 import './ChatPanel.css'
 
-const ChatPanel = ({ resumeId }) => {
-  const [messages, setMessages] = useState([])
+// Must match the backend's default history page size
+const PAGE_SIZE = 100
+
+// Merge message lists by id, keeping the server's (created_at, id) order
+const mergeMessages = (current, incoming) => {
+  const byId = new Map(current.map((m) => [m.id, m]))
+  incoming.forEach((m) => byId.set(m.id, m))
+  return [...byId.values()].sort(
+    (a, b) => new Date(a.created_at) - new Date(b.created_at) || a.id - b.id
+  )
+}
+
+const getApiBaseUrl = () =>
+  import.meta.env.VITE_API_URL && import.meta.env.VITE_API_URL.trim() !== ''
+    ? import.meta.env.VITE_API_URL
+    : '/api'
+
+const ChatPanel = ({ resumeId, initialMessages, initialHasOlder = false }) => {
+  const [messages, setMessages] = useState(initialMessages || [])
   const [newMessage, setNewMessage] = useState('')
   const [username, setUsername] = useState('')
   const [ws, setWs] = useState(null)
   const [connected, setConnected] = useState(false)
   const [isJoined, setIsJoined] = useState(false)
+  const [hasOlder, setHasOlder] = useState(initialMessages ? initialHasOlder : false)
   const messagesEndRef = useRef(null)
+  // Latest messages for the WebSocket handlers, which outlive renders
+  const messagesRef = useRef([])
+
+  useEffect(() => {
+    messagesRef.current = messages
+  }, [messages])
 
   // Load messages when component mounts or resumeId changes
   useEffect(() => {
     console.log('ChatPanel mounted/updated for resume:', resumeId)
+    // The page may already have loaded the latest messages with the resume
+    if (initialMessages) {
+      setMessages(initialMessages)
+      setHasOlder(initialHasOlder)
+      return
+    }
     loadMessages()
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [resumeId])
+  }, [resumeId, initialMessages])
 
   // Initialize state when component mounts or resumeId changes
   useEffect(() => {
@@ -63,11 +93,20 @@ const ChatPanel = ({ resumeId }) => {
     
     console.log('Connecting to WebSocket:', wsUrl)
     const websocket = new WebSocket(wsUrl)
+    // Whether the sync asked for the latest messages rather than those after an id
+    let syncedLatest = false
 
     websocket.onopen = () => {
       console.log('WebSocket connected')
       setConnected(true)
       setWs(websocket)
+      // Ask for anything missed since the last message we have
+      const current = messagesRef.current
+      syncedLatest = !current.length
+      websocket.send(JSON.stringify({
+        type: 'sync',
+        last_id: current.length ? current[current.length - 1].id : null,
+      }))
     }
 
     websocket.onmessage = (event) => {
@@ -76,7 +115,14 @@ const ChatPanel = ({ resumeId }) => {
         console.error('WebSocket error:', data.error)
         return
       }
-      setMessages((prev) => [...prev, data])
+      if (data.type === 'sync') {
+        setMessages((prev) => mergeMessages(prev, data.messages))
+        // Older messages precede the latest ones, or newer ones follow ours
+        if (data.has_more && syncedLatest) setHasOlder(true)
+        else if (data.has_more) loadMessages()
+        return
+      }
+      setMessages((prev) => mergeMessages(prev, [data]))
     }
 
     websocket.onerror = (error) => {
@@ -101,28 +147,39 @@ const ChatPanel = ({ resumeId }) => {
     scrollToBottom()
   }, [messages])
 
+  const fetchPage = async (params = {}) => {
+    const query = new URLSearchParams({ limit: PAGE_SIZE, ...params })
+    const url = `${getApiBaseUrl()}/chat/resume/${resumeId}?${query}`
+    const response = await fetch(url)
+    if (!response.ok) {
+      throw new Error(`${response.status} ${response.statusText}`)
+    }
+    return (await response.json()) || []
+  }
+
   const loadMessages = async () => {
     try {
       console.log('Loading messages for resume:', resumeId)
-      // Use relative path (works with Nginx proxy on Render)
-      // Or use VITE_API_URL if set (for direct backend access)
-      const apiBaseUrl = import.meta.env.VITE_API_URL && import.meta.env.VITE_API_URL.trim() !== ''
-        ? import.meta.env.VITE_API_URL
-        : '/api'
-      const url = `${apiBaseUrl}/chat/resume/${resumeId}`
-      console.log('Fetching messages from:', url)
-      const response = await fetch(url)
-      if (!response.ok) {
-        console.error('Failed to load messages:', response.status, response.statusText)
-        setMessages([])
-        return
-      }
-      const data = await response.json()
-      setMessages(data || [])
-      console.log('Loaded messages from API:', data?.length || 0, 'messages')
+      // Only the latest page; older messages load on demand
+      const data = await fetchPage()
+      setMessages(data)
+      setHasOlder(data.length === PAGE_SIZE)
+      console.log('Loaded messages from API:', data.length, 'messages')
     } catch (err) {
       console.error('Failed to load messages:', err)
       setMessages([])
+      setHasOlder(false)
+    }
+  }
+
+  const loadOlderMessages = async () => {
+    if (!messages.length) return
+    try {
+      const data = await fetchPage({ before_id: messages[0].id })
+      setMessages((prev) => mergeMessages(prev, data))
+      setHasOlder(data.length === PAGE_SIZE)
+    } catch (err) {
+      console.error('Failed to load older messages:', err)
     }
   }
 
@@ -170,6 +227,11 @@ const ChatPanel = ({ resumeId }) => {
           <h3>Chat</h3>
         </div>
         <div className="chat-messages">
+          {hasOlder && (
+            <button type="button" className="load-older" onClick={loadOlderMessages}>
+              Load earlier messages
+            </button>
+          )}
           {messages.length === 0 ? (
             <p className="empty-text">No messages yet. Join to start chatting!</p>
           ) : (
@@ -212,6 +274,11 @@ const ChatPanel = ({ resumeId }) => {
       </div>
 
       <div className="chat-messages">
+        {hasOlder && (
+          <button type="button" className="load-older" onClick={loadOlderMessages}>
+            Load earlier messages
+          </button>
+        )}
         {messages.length === 0 ? (
           <p className="empty-text">No messages yet. Start the conversation!</p>
         ) : (
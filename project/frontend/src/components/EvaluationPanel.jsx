@@ -2,9 +2,9 @@ import { useState, useEffect } from 'react'
 import { evaluationApi } from '../api/resumes'
 import './EvaluationPanel.css'
 
-const EvaluationPanel = ({ resumeId }) => {
-  const [evaluations, setEvaluations] = useState([])
-  const [loading, setLoading] = useState(true)
+const EvaluationPanel = ({ resumeId, initialEvaluations }) => {
+  const [evaluations, setEvaluations] = useState(initialEvaluations || [])
+  const [loading, setLoading] = useState(!initialEvaluations)
   const [showForm, setShowForm] = useState(false)
   const [rating, setRating] = useState(3)
   const [comment, setComment] = useState('')
@@ -12,8 +12,15 @@ const EvaluationPanel = ({ resumeId }) => {
   const [submitting, setSubmitting] = useState(false)
 
   useEffect(() => {
+    // Evaluations passed in by the page are already current
+    if (initialEvaluations) {
+      setEvaluations(initialEvaluations)
+      setLoading(false)
+      return
+    }
     loadEvaluations()
-  }, [resumeId])
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [resumeId, initialEvaluations])
 
   const loadEvaluations = async () => {
     try {
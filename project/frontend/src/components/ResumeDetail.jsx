@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
-import { resumeApi, evaluationApi } from '../api/resumes'
+import { resumeApi } from '../api/resumes'
 import ChatPanel from './ChatPanel'
 import EvaluationPanel from './EvaluationPanel'
 import './ResumeDetail.css'
@@ -9,6 +9,7 @@ const ResumeDetail = () => {
   const { id } = useParams()
   const navigate = useNavigate()
   const [resume, setResume] = useState(null)
+  const [dossier, setDossier] = useState(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const contentRef = useRef(null)
@@ -20,8 +21,10 @@ const ResumeDetail = () => {
   const loadResume = async () => {
     try {
       setLoading(true)
-      const data = await resumeApi.getById(id)
-      setResume(data)
+      // One request for everything the page shows; the panels reuse it
+      const data = await resumeApi.getDossier(id)
+      setResume(data.resume)
+      setDossier(data)
       setError(null)
     } catch (err) {
       setError('Failed to load resume')
@@ -60,6 +63,14 @@ const ResumeDetail = () => {
             <span className="resume-date">
               Uploaded: {new Date(resume.created_at).toLocaleString()}
             </span>
+            <a
+              className="original-file-link"
+              href={resumeApi.fileUrl(resume.id)}
+              target="_blank"
+              rel="noopener noreferrer"
+            >
+              Open original
+            </a>
           </div>
           <div className="resume-content" ref={contentRef}>
             {resume.content ? (
@@ -71,8 +82,15 @@ const ResumeDetail = () => {
         </div>
 
         <div className="resume-sidebar">
-          <EvaluationPanel resumeId={parseInt(id)} />
-          <ChatPanel resumeId={parseInt(id)} />
+          <EvaluationPanel
+            resumeId={parseInt(id)}
+            initialEvaluations={dossier?.evaluations}
+          />
+          <ChatPanel
+            resumeId={parseInt(id)}
+            initialMessages={dossier?.chat_messages}
+            initialHasOlder={dossier?.has_more_messages}
+          />
         </div>
       </div>
     </div>
@@ -49,6 +49,17 @@ describe('EvaluationPanel', () => {
     })
   })
 
+  it('uses evaluations passed in without fetching', async () => {
+    await act(async () => {
+      render(<EvaluationPanel resumeId={1} initialEvaluations={mockEvaluations} />)
+    })
+
+    await waitFor(() => {
+      expect(screen.getByText('HR Manager')).toBeInTheDocument()
+    })
+    expect(evaluationApi.getByResumeId).not.toHaveBeenCalled()
+  })
+
   it('shows add evaluation button', async () => {
     evaluationApi.getByResumeId.mockResolvedValue([])
 
@@ -1,18 +0,0 @@
--- Create evaluations table
--- This table stores ratings and comments for resumes
-
-CREATE TABLE IF NOT EXISTS evaluations (
-    id SERIAL PRIMARY KEY,
-    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
-    rating DECIMAL(3, 1) NOT NULL CHECK (rating >= 1.0 AND rating <= 5.0),
-    comment TEXT,
-    evaluator_name VARCHAR NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
--- Create indexes for evaluations table
-CREATE INDEX IF NOT EXISTS idx_evaluations_resume_id ON evaluations(resume_id);
-CREATE INDEX IF NOT EXISTS idx_evaluations_rating ON evaluations(rating);
-CREATE INDEX IF NOT EXISTS idx_evaluations_created_at ON evaluations(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_evaluations_resume_rating ON evaluations(resume_id, rating);
-